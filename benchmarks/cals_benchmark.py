@@ -0,0 +1,134 @@
+#!python3
+
+## Import General Tools
+import argparse
+from contextlib import contextmanager
+from copy import deepcopy
+from time import perf_counter
+import warnings
+
+import odl.kcwi
+import odl.mosfire
+import odl.nires
+from odl.block import ScienceBlock, ObservingBlockList
+from odl.instrument_config import InstrumentConfig
+from odl.offset import Stare
+
+
+##-------------------------------------------------------------------------
+## Baseline
+##-------------------------------------------------------------------------
+def deepcopy_evolve(self, name=None, suffix='', **changes):
+    '''Derive a config the way the calibration builders did before evolve:
+    deep copy the whole config, then set each changed attribute and append to
+    the name.
+    '''
+    new = deepcopy(self)
+    for key, value in changes.items():
+        setattr(new, key, value)
+    if name is None:
+        new.name += suffix
+    else:
+        new.name = name
+    return new
+
+
+@contextmanager
+def baseline(derive=deepcopy_evolve):
+    '''Run the calibration builders with the deepcopy based derivation (or
+    with evolve if derive is None).
+    '''
+    evolve = InstrumentConfig.evolve
+    if derive is not None:
+        InstrumentConfig.evolve = derive
+    try:
+        yield
+    finally:
+        InstrumentConfig.evolve = evolve
+
+
+##-------------------------------------------------------------------------
+## Benchmark
+##-------------------------------------------------------------------------
+def configs(n):
+    '''Return n distinct science configs for KCWI and MOSFIRE, and n (equal)
+    NIRES configs.
+    '''
+    output = []
+    for i in range(n):
+        output.append(odl.kcwi.KCWIConfig(slicer='Medium', bluecwave=4000+i))
+        output.append(odl.mosfire.MOSFIREConfig(filter='YJHK'[i%4],
+                                                mask=f'mask{i}'))
+        output.append(odl.nires.NIRESConfig())
+    return output
+
+
+def semester(nblocks, nconfigs):
+    '''Return an `ObservingBlockList` of nblocks science blocks which share
+    nconfigs distinct configs per instrument, roughly one semester of queue
+    programs.
+    '''
+    ics = configs(nconfigs)
+    pattern = Stare(repeat=1)
+    return ObservingBlockList([ScienceBlock(pattern=pattern,
+                                            instconfig=ics[i % len(ics)])
+                               for i in range(nblocks)])
+
+
+def best_times(function, repeats):
+    '''Return the best (deepcopy, evolve) times of function.  The two are
+    alternated so that both see the same machine load.
+    '''
+    best = [None, None]
+    for r in range(repeats):
+        for i, derive in enumerate([deepcopy_evolve, None]):
+            with baseline(derive):
+                start = perf_counter()
+                function()
+                elapsed = perf_counter() - start
+            best[i] = elapsed if best[i] is None else min(best[i], elapsed)
+    return best
+
+
+def cal_dicts(ics):
+    return [[(OB.instconfig.to_dict(), OB.pattern.to_dict())
+             for OB in ic.cals()] for ic in ics]
+
+
+def main(nblocks=2000, nconfigs=100, repeats=5):
+    ics = configs(nconfigs)
+    OBs = semester(nblocks, nconfigs)
+    # The two derivations must build identical calibrations
+    with baseline():
+        before = cal_dicts(ics)
+    if before != cal_dicts(ics):
+        raise RuntimeError('deepcopy and evolve calibrations differ')
+
+    cases = [(f'derive an arc config from {len(ics)} configs',
+              lambda: [ic.evolve(suffix=' arclamp=FEAR', arclamp='FEAR')
+                       for ic in ics], len(ics)),
+             (f'cals() for {len(ics)} configs',
+              lambda: [ic.cals() for ic in ics], len(ics)),
+             (f'block list cals() for {len(OBs)} blocks',
+              lambda: OBs.cals(), len(OBs))]
+    for label, function, n in cases:
+        old, new = best_times(function, repeats)
+        print(f'{label} (best of {repeats})')
+        print(f'    deepcopy: {old*1000:8.1f} ms ({old/n*1e6:6.1f} us each)')
+        print(f'    evolve:   {new*1000:8.1f} ms ({new/n*1e6:6.1f} us each)')
+        print(f'    speedup:  {old/new:8.2f}x')
+
+
+if __name__ == '__main__':
+    p = argparse.ArgumentParser(description='Time calibration planning with '
+                                'deepcopy and evolve derived configs')
+    p.add_argument('-n', '--nblocks', type=int, default=2000,
+                   help='Number of science blocks in the semester')
+    p.add_argument('-c', '--nconfigs', type=int, default=100,
+                   help='Number of distinct configs per instrument')
+    p.add_argument('-r', '--repeats', type=int, default=5)
+    args = p.parse_args()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        main(nblocks=args.nblocks, nconfigs=args.nconfigs,
+             repeats=args.repeats)
@@ -1,170 +1,168 @@
-import importlib
-import requests
-import yaml
 from warnings import warn
-import importlib
-from astropy import units as u
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 from .target import Target, TargetList
 from .offset import OffsetPattern, TelescopeOffset
+from .offset_array import OffsetArray
 from .instrument_config import InstrumentConfig
 from .detector_config import DetectorConfig
+from .fileio import compact, is_table, read_yaml
+from .db import (DBClient, DownloadCache, UploadSpool, UploadFailed,
+                 get_client, set_client, db_upload_url, db_download_url)
 from . import offset
+from . import aio
+from . import patterns
 
 
-db_upload_url = 'http://vm-webtools.keck.hawaii.edu:59999/'
-db_download_url = 'http://vm-devnginxsw/api/ddoi/getDefs?'
+class LoadError(Exception): pass
 
 
-class UploadFailed(UserWarning): pass
-
-
-def check_ping(address='vm-webtools.keck.hawaii.edu', wait=2):
-    '''This can be removed once the DB is available outside of keck.  It is
-    here just to prevent failures when testing.
-    '''
-    import subprocess
-    import platform
-    import os
-    try:
-        ping = subprocess.check_output(['which', 'ping'])
-        ping = ping.decode()
-        ping_cmd = [ping.strip()]
-    except subprocess.CalledProcessError as e:
-        warn("Ping command not available")
-        ping_cmd = None
-        return None
-    os = platform.system()
-    os = os.lower()
-    # Ping once, wait up to 2 seconds for a response.
-    if os == 'linux':
-        ping_cmd.extend(['-c', '1', '-w', 'wait'])
-    elif os == 'darwin':
-        ping_cmd.extend(['-c', '1', '-W', 'wait000'])
-    else:
-        # Don't understand how ping works on this platform.
-        ping_cmd = None
-        return None
-
-    ping_cmd = [x.replace('wait', f'{int(wait)}') for x in ping_cmd]
-    ping_cmd.append(address)
-    output = subprocess.run(ping_cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE)
-    if output.returncode != 0:
-        return False
-    else:
-        return True
+class LoadFailed(UserWarning): pass
 
 
 ##-------------------------------------------------------------------------
 ## upload_to_DB
 ##-------------------------------------------------------------------------
 def upload_to_DB(input_list):
-    '''Upload objects to the database at Keck
+    '''Upload objects to the database at Keck using the default `DBClient`
+    (see `odl.set_client`).
     '''
-    if check_ping() in [False, None]:
-        print('Unable to connect to Keck DB')
-        return None
-
-    output = []
-    if type(input_list) in [TargetList, Target, OffsetPattern]:
-        output.append(input_list.to_dict())
-    elif type(input_list) is list:
-        for item in input_list:
-            output.append(item.to_dict())
-
-    yaml_output = yaml.dump(output)
-    files = [('yaml_cfg', yaml_output)]
-    r = requests.post(db_upload_url, files=files)
-    if r.status_code == requests.codes.ok:
-        return True
-    else:
-        warn('Upload failed', category=UploadFailed)
-        return False
+    return get_client().upload(input_list)
 
 
 ##-------------------------------------------------------------------------
 ## download_from_DB
 ##-------------------------------------------------------------------------
 def download_from_DB(col='Target', name=None):
-    if check_ping(address='vm-devnginxsw') in [False, None]:
-        print('Unable to connect to Keck DB')
-        return None
-    query_url = f'{db_download_url}col={col}'
-    if name is not None:
-        query_url += f'&name={name}'
-    r = requests.get(query_url)
-    if r.status_code != requests.codes.ok:
-        warn('Download failed', category=UploadFailed)
-        return None
-    contents = yaml.safe_load(r.text)
-    return parse_yaml([contents])
+    '''Download objects from the database at Keck using the default
+    `DBClient` (see `odl.set_client`).
+    '''
+    return get_client().download(col=col, name=name)
+
+
+##-------------------------------------------------------------------------
+## sync_to_DB
+##-------------------------------------------------------------------------
+def sync_to_DB(input_list, delete=False, manifest='~/.odl/manifest.json'):
+    '''Upload only the objects which are new or have changed since the last
+    sync using the default `DBClient` (see `DBClient.sync`).
+    '''
+    return get_client().sync(input_list, manifest=manifest, delete=delete)
 
 
 ##-------------------------------------------------------------------------
 ## parse_yaml
 ##-------------------------------------------------------------------------
+def _entry_type(entry):
+    '''Return the table name for a bare entry, such as the documents written
+    by the `write` method of each class, from the keys it contains.
+    '''
+    if 'offsets' in entry.keys():
+        return 'OffsetPatterns'
+    if 'RA' in entry.keys() or 'Dec' in entry.keys():
+        return 'Targets'
+    if 'instrument' in entry.keys():
+        if 'exptime' in entry.keys():
+            return 'DetectorConfigs'
+        return 'InstrumentConfigs'
+    return None
+
+
 def parse_yaml(contents):
-    '''Parse YAML from a file or from the Keck database
+    '''Parse YAML from a file or from the Keck database.  Both the table
+    layout (e.g. `{'Targets': [...]}`) and the bare entries written by the
+    `write` method of each class are accepted.  The contents are not
+    modified.
     '''
     tl = TargetList([]) # Output Target List
     ops = [] # List of output OffsetPatterns
     ics = [] # List of output InstrumentConfigs
     dcs = [] # List of output DetectorConfigs
     for entry in contents:
+        if not isinstance(entry, dict):
+            raise LoadError(f'Could not parse entry of type {type(entry)}')
+        if is_table(entry) is False:
+            table = _entry_type(entry)
+            if table is None:
+                raise LoadError(f'Could not determine the type of entry '
+                                f'"{entry.get("name", entry)}"')
+            entry = {table: [entry]}
         # Read Targets
-        if 'Targets' in entry.keys():
-            for td in entry['Targets']:
-                tl.append(Target(name=td.get('name', None),
-                                 RA=td.get('RA', None),
-                                 Dec=td.get('Dec', None),
-                                 equinox=td.get('equinox', None),
-                                 rotmode=td.get('rotmode', None),
-                                 PA=td.get('PA', None),
-                                 RAOffset=td.get('RAOffset', None),
-                                 DecOffset=td.get('DecOffset', None),
-                                 objecttype=td.get('objecttype', None),
-                                 frame=td.get('frame', None),
-                                 PMRA=td.get('PMRA', 0),
-                                 PMDec=td.get('PMDec', 0),
-                                 epoch=td.get('epoch', None),
-                                 obstime=td.get('obstime', None),
-                                 mag=td.get('mag', {}),
-                                 comment=td.get('comment', None) ) )
+        for td in entry.get('Targets', []):
+            tl.append(Target.from_dict(td))
         # Read OffsetPatterns
-        if 'OffsetPatterns' in entry.keys():
-            for op in entry['OffsetPatterns']:
-                offset_list = [TelescopeOffset(dx=o.get('dx', 0*u.arcsec),
-                                               dy=o.get('dy', 0*u.arcsec),
-                                               dr=o.get('dr', 0*u.arcsec),
-                                               relative=o.get('relative', False),
-                                               frame=getattr(offset,
-                                                             o.get('frame', 'SkyFrame'))(),
-                                               posname=o.get('posname', ''),
-                                               guide=o.get('guide', True))
-                                               for o in op['offsets']]
-                ops.append(OffsetPattern(offset_list,
-                                         name=op.get('name', ''),
-                                         repeat=op.get('repeat', 1)))
-
+        for op in entry.get('OffsetPatterns', []):
+            ops.append(OffsetPattern.from_dict(op))
         # Read DetectorConfigs
-        if 'DetectorConfigs' in entry.keys():
-            for dc_dict in entry['DetectorConfigs']:
-                instname = dc_dict.pop('instrument')
-                detectorname = dc_dict.pop('detector')
-                dc = getattr(importlib.import_module(f'odl.{instname.lower()}'),
-                             f'{instname}{detectorname}DetectorConfig')(**dc_dict)
-                dcs.append(dc)
-
+        for dc_dict in entry.get('DetectorConfigs', []):
+            dcs.append(DetectorConfig.from_dict(dc_dict))
         # Read InstrumentConfigs
-        if 'InstrumentConfigs' in entry.keys():
-            for ic_dict in entry['InstrumentConfigs']:
-                instname = ic_dict.pop('instrument')
-                ic = getattr(importlib.import_module(f'odl.{instname.lower()}'),
-                             f'{instname}Config')(**ic_dict)
-                ics.append(ic)
+        for ic_dict in entry.get('InstrumentConfigs', []):
+            ics.append(InstrumentConfig.from_dict(ic_dict))
 
     return tl, ops, dcs, ics
 
 
+##-------------------------------------------------------------------------
+## load_directory
+##-------------------------------------------------------------------------
+def _load_file(file):
+    '''Read and parse a single YAML file.  Any exception is returned rather
+    than raised so that one bad file does not abort a bulk load.
+    '''
+    try:
+        return file, parse_yaml(read_yaml(file)), None
+    except Exception as e:
+        return file, None, e
+
+
+def load_directory(path, workers=None, pattern='*.y*ml'):
+    '''Parse every YAML file in a directory using a pool of worker processes
+    and merge the results.
+
+    Parameters
+    ----------
+    path : str or `pathlib.Path`
+        The directory to read.
+
+    workers : int or None
+        The number of worker processes.  None uses one per CPU.  A value of 1
+        parses the files serially in this process.
+
+    pattern : str
+        The glob pattern used to select files in the directory.
+
+    Returns
+    -------
+    A tuple of (TargetList, list of OffsetPatterns, list of DetectorConfigs,
+    list of InstrumentConfigs, dict of errors).  The errors dict maps the file
+    name to the exception raised while parsing it.  Files are merged in sorted
+    order regardless of which worker finishes first.
+    '''
+    p = Path(path).expanduser().absolute()
+    if p.is_dir() is False:
+        raise NotADirectoryError(p)
+    files = sorted([str(f) for f in p.glob(pattern) if f.is_file()])
+
+    if workers == 1 or len(files) < 2:
+        results = [_load_file(f) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_file, files))
+
+    tl = TargetList([])
+    ops = []
+    dcs = []
+    ics = []
+    errors = {}
+    for file, result, error in results:
+        if error is not None:
+            warn(f'Failed to load {file}: {error}', category=LoadFailed)
+            errors[file] = error
+            continue
+        tl.extend(result[0])
+        ops.extend(result[1])
+        dcs.extend(result[2])
+        ics.extend(result[3])
+    return tl, ops, dcs, ics, errors
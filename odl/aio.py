@@ -0,0 +1,125 @@
+#!python3
+
+## Import General Tools
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .db import get_client
+
+
+# Upper limit on the number of threads used for blocking DB calls
+max_workers = 16
+
+_executor = None
+
+
+def executor():
+    '''Return the thread pool shared by all of the asyncio DB functions.
+    '''
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max_workers,
+                                       thread_name_prefix='odl-aio')
+    return _executor
+
+
+async def _call(semaphore, timeout, function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    await semaphore.acquire()
+    try:
+        future = loop.run_in_executor(executor(),
+                                      lambda: function(*args, **kwargs))
+    except BaseException:
+        semaphore.release()
+        raise
+
+    def done(f):
+        # A timeout can not stop the worker thread, so its slot is only
+        # released when the blocking call actually returns.  This keeps the
+        # number of DB calls in flight within the concurrency limit.
+        semaphore.release()
+        if f.cancelled() is False:
+            f.exception()
+    future.add_done_callback(done)
+    return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+
+##-------------------------------------------------------------------------
+## download
+##-------------------------------------------------------------------------
+async def download(col='Target', name=None, client=None, concurrency=8,
+                   timeout=None, refresh=False):
+    '''Download objects from the database without blocking the event loop.
+    The blocking `DBClient.download` calls run in a shared thread pool, so
+    they use the same pooled connections, cache, and timeouts as
+    `odl.download_from_DB`.  For example:
+
+        results = await odl.aio.download('OffsetPatterns', ['ABBA', 'Stare'])
+
+    Parameters
+    ----------
+    col : str
+        The collection to query.
+
+    name : str or list of str or None
+        The name to download.  If a list is given, the names are fetched in
+        parallel and a list of results (in the same order) is returned.
+
+    client : a `DBClient` instance or None
+        The client to use.  Defaults to the one from `odl.get_client`.
+
+    concurrency : int
+        The maximum number of downloads in flight at once.  A download which
+        times out keeps its slot until the blocking call returns.
+
+    timeout : float or None
+        The timeout in seconds for each download.  Defaults to the client's
+        timeout times the number of attempts it may make, so the requests
+        timeout normally ends the blocking call first.
+    '''
+    client = get_client() if client is None else client
+    if timeout is None:
+        retries = client.session.get_adapter(client.download_url).max_retries
+        timeout = client.timeout * (retries.total + 1)
+    semaphore = asyncio.Semaphore(concurrency)
+    if isinstance(name, (list, tuple)):
+        return await asyncio.gather(*[_call(semaphore, timeout, client.download,
+                                            col=col, name=n, refresh=refresh)
+                                      for n in name])
+    return await _call(semaphore, timeout, client.download, col=col, name=name,
+                       refresh=refresh)
+
+
+##-------------------------------------------------------------------------
+## upload
+##-------------------------------------------------------------------------
+async def upload(input_list, client=None, concurrency=4, timeout=None):
+    '''Upload objects to the database without blocking the event loop.
+
+    Parameters
+    ----------
+    input_list : an ODL object, a list of them, or a tuple of such inputs
+        The objects to upload.  If a tuple is given, each element is uploaded
+        as a separate request in parallel and a list of results is returned.
+
+    client : a `DBClient` instance or None
+        The client to use.  Defaults to the one from `odl.get_client`.
+
+    concurrency : int
+        The maximum number of uploads in flight at once.  An upload which
+        times out keeps its slot until the blocking call returns.
+
+    timeout : float or None
+        The timeout in seconds for each upload.  Defaults to the client's
+        timeout times the number of attempts it may make, so the requests
+        timeout normally ends the blocking call first.
+    '''
+    client = get_client() if client is None else client
+    if timeout is None:
+        retries = client.session.get_adapter(client.upload_url).max_retries
+        timeout = client.timeout * (retries.total + 1)
+    semaphore = asyncio.Semaphore(concurrency)
+    if isinstance(input_list, tuple):
+        return await asyncio.gather(*[_call(semaphore, timeout, client.upload, i)
+                                      for i in input_list])
+    return await _call(semaphore, timeout, client.upload, input_list)
@@ -1,12 +1,15 @@
 #!python3
 
 ## Import General Tools
-from pathlib import Path
 import re
 from warnings import warn
 import yaml
 from astropy.io import fits
 
+from .detector_config import DetectorConfig
+from .fileio import write_yaml
+from .hashing import content_hash
+
 
 ##-------------------------------------------------------------------------
 ## Alignment
@@ -47,6 +50,40 @@ class Alignment():
         return {'name': self.name}
 
 
+    def content_hash(self):
+        '''Return the content hash of `to_dict`.
+        '''
+        return content_hash(self.to_dict())
+
+
+    @classmethod
+    def from_dict(cls, input):
+        '''Return an alignment built from the output of `to_dict`.  When called
+        on `Alignment` itself, the sub-class is inferred from the entries.
+        '''
+        if cls is Alignment:
+            if 'detconfig' in input.keys():
+                cls = MaskAlign
+            elif 'faint' in input.keys():
+                cls = GuiderAlign
+            elif input.get('name', None) == 'Blind Align':
+                cls = BlindAlign
+        if cls is MaskAlign:
+            detconfig = input.get('detconfig', None)
+            if isinstance(detconfig, dict):
+                detconfig = DetectorConfig.from_dict(detconfig)
+            align = cls(detconfig=detconfig, filter=input.get('filter', None),
+                        takesky=input.get('takesky', False))
+        elif cls is GuiderAlign:
+            align = cls(faint=input.get('faint', True))
+        elif cls is BlindAlign:
+            align = cls()
+        else:
+            align = cls(name=input.get('name', 'GenericAlignment'))
+        align.name = input.get('name', align.name)
+        return align
+
+
     def to_yaml(self):
         '''Return string corresponding to a Detector Config Description
         Language (DCDL) YAML entry.
@@ -54,12 +91,12 @@ class Alignment():
         return yaml.dump(self.to_dict())
 
 
-    def write(self, file):
+    def write(self, file, mode='w'):
+        '''Write the alignment to a yaml formatted file.  See
+        `odl.fileio.write_yaml` for the write modes ('w', 'a', or 'update').
+        '''
         self.validate()
-        p = Path(file).expanduser().absolute()
-        if p.exists(): p.unlink()
-        with open(p, 'w') as FO:
-            FO.write(yaml.dump([self.to_dict()]))
+        write_yaml(file, [self.to_dict()], mode=mode)
 
 
     def __str__(self):
@@ -2,11 +2,22 @@
 
 ## Import General Tools
 from pathlib import Path
+import json
 from astropy import units as u
 from astropy.io import fits
 from collections import UserList
 import yaml
 
+from .target import Target
+from .offset import OffsetPattern
+from .instrument_config import InstrumentConfig
+from .detector_config import DetectorConfig
+from .alignment import Alignment
+from .fileio import write_yaml
+from .hashing import InternPool, state_key
+from .overheads import (TimeEstimate, get_model, block_instrument,
+                        same_target)
+
 
 class BlockError(Exception):
     pass
@@ -126,21 +137,40 @@ class ObservingBlock():
         return yaml.dump(self.to_dict())
 
 
-    def estimate_time(self):
-        '''Estimate the wall clock time to complete this block.
+    def _time_key(self, model, previous):
+        # Everything the estimate depends on, by value, so that changing any
+        # of it in place invalidates the estimate.  The target and alignment
+        # are keyed by all of their attributes.  The pattern and configs use
+        # their cached value hashes, which are reset by setting an attribute
+        # (their to_dict values are all scalars, so there is no nested value
+        # to change without doing so).
+        key = (id(model), state_key(self.target), hash(self.pattern),
+               hash(self.instconfig), tuple([hash(dc) for dc in self.detconfig]),
+               state_key(self.align))
+        if previous is None:
+            return key
+        return key + (same_target(previous.target, self.target),
+                      hash(previous.instconfig))
+
+
+    def estimate_time(self, previous=None):
+        '''Estimate the time to complete this block using the overhead model
+        registered for its instrument (see `odl.overheads`).  If the previous
+        block is given, the slew, acquisition, and reconfiguration overheads
+        are skipped when they are not needed.  Returns a `TimeEstimate` with
+        the shutter open time, the wall clock time, and its breakdown.
+
+        The estimate is cached and only recomputed when the block, its
+        configs, or the previous block change.
         '''
-        if type(self.detconfig) in [list, tuple]:
-            t = [dc.estimate_clock_time() for dc in self.detconfig]
-            detector_time = max(t)
-            e = [dc.exptime*dc.nexp for dc in self.detconfig]
-            exposure_time = max(e)
-        else:
-            detector_time = self.detconfig.estimate_clock_time()
-            exposure_time = self.detconfig.exptime
-        return {'shutter open time': self.pattern.repeat * len(self.pattern) *\
-                                     exposure_time,
-                'wall clock time': self.pattern.repeat * len(self.pattern) *\
-                                   detector_time}
+        model = get_model(block_instrument(self))
+        key = self._time_key(model, previous)
+        cached = getattr(self, '_estimate', None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        estimate = model.estimate(self, previous=previous)
+        self._estimate = (key, estimate)
+        return estimate
 
 
     def cals(self):
@@ -226,6 +256,22 @@ class FocusBlock(ObservingBlock):
                          detconfig=detconfig, align=align, blocktype=blocktype)
 
 
+block_types = {'Science': ScienceBlock,
+               'Telluric': TelluricBlock,
+               'StandardStar': StandardStarBlock,
+               'Calibration': CalibrationBlock,
+               'Focus': FocusBlock,
+               }
+
+# The table name used for each component in the normalized form
+normalized_tables = {'target': 'Targets',
+                     'pattern': 'OffsetPatterns',
+                     'instconfig': 'InstrumentConfigs',
+                     'detconfig': 'DetectorConfigs',
+                     'align': 'Alignments',
+                     }
+
+
 ##-------------------------------------------------------------------------
 ## ObservingBlockList
 ##-------------------------------------------------------------------------
@@ -240,33 +286,255 @@ class ObservingBlockList(UserList):
             s.validate()
 
 
-    def estimate_time(self):
-        '''Estimate the wall clock time to complete the blocks.
+    # The time estimate of each block is kept in _estimates (None if it
+    # needs to be recomputed) and their sum in _total, so that changing the
+    # list only recomputes the blocks affected.  A block's estimate depends on
+    # the block before it, so a change at index i also invalidates i+1.
+    def _reset(self):
+        self._estimates = [None]*len(self.data)
+        self._total = TimeEstimate()
+
+
+    def _invalidate(self, *indices):
+        if '_estimates' not in self.__dict__:
+            return
+        for i in indices:
+            if 0 <= i < len(self._estimates) and self._estimates[i] is not None:
+                self._total -= self._estimates[i]
+                self._estimates[i] = None
+
+
+    def _index(self, i, insert=False):
+        n = len(self.data) + (1 if insert else 0)
+        i = i + n if i < 0 else i
+        return min(max(i, 0), n - 1) if insert else i
+
+
+    def append(self, item):
+        self.data.append(item)
+        if '_estimates' in self.__dict__:
+            self._estimates.append(None)
+
+
+    def insert(self, i, item):
+        i = self._index(i, insert=True)
+        self.data.insert(i, item)
+        if '_estimates' in self.__dict__:
+            self._estimates.insert(i, None)
+            self._invalidate(i+1)
+
+
+    def pop(self, i=-1):
+        i = self._index(i)
+        item = self.data.pop(i)
+        if '_estimates' in self.__dict__:
+            estimate = self._estimates.pop(i)
+            if estimate is not None:
+                self._total -= estimate
+            self._invalidate(i)
+        return item
+
+
+    def remove(self, item):
+        self.pop(self.data.index(item))
+
+
+    def extend(self, other):
+        for item in other:
+            self.append(item)
+
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+
+    def __setitem__(self, i, item):
+        self.data[i] = item
+        if isinstance(i, slice):
+            self._reset()
+        else:
+            i = self._index(i)
+            self._invalidate(i, i+1)
+
+
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            del self.data[i]
+            self._reset()
+        else:
+            self.pop(i)
+
+
+    def clear(self):
+        self.data.clear()
+        self._reset()
+
+
+    def sort(self, *args, **kwds):
+        self.data.sort(*args, **kwds)
+        self._reset()
+
+
+    def reverse(self):
+        self.data.reverse()
+        self._reset()
+
+
+    def estimate_time(self, check=True):
+        '''Estimate the time to complete the blocks in order (see
+        `ObservingBlock.estimate_time`) and return the total as a
+        `TimeEstimate`.
+
+        Running totals are kept between calls, so only blocks which were
+        added, moved, or changed are recomputed.  If check is False, blocks
+        already estimated are assumed unchanged, which skips looking for
+        changes to their configs or patterns made in place.
         '''
-        estimate = {'shutter open time': 0, 'wall clock time': 0}
-        for s in self.data:
-            estimate['shutter open time'] += s.estimate_time()['shutter open time']
-            estimate['wall clock time'] += s.estimate_time()['wall clock time']
-        print(f"Shutter Open Time: {estimate['shutter open time']} s "
-              f"({estimate['shutter open time']/3600:.1f} hrs)")
-        print(f"Wall Clock Time: {estimate['wall clock time']} s "
-              f"({estimate['wall clock time']/3600:.1f} hrs)")
+        if '_estimates' not in self.__dict__\
+           or len(self._estimates) != len(self.data):
+            self._reset()
+        previous = None
+        for i, OB in enumerate(self.data):
+            old = self._estimates[i]
+            if old is None or check is True:
+                new = OB.estimate_time(previous=previous)
+                if new is not old:
+                    if old is not None:
+                        self._total -= old
+                    self._total += new
+                    self._estimates[i] = new
+            previous = OB
+        return TimeEstimate(self._total)
 
 
     def cals(self):
-        calblocklist = ObservingBlockList()
-        ics = [OB.instconfig for OB in self.data\
-               if not isinstance(OB, CalibrationBlock)\
-               and not isinstance(OB, FocusBlock)]
-        for instconfig in set(ics):
-            calblocklist.extend( instconfig.cals() )
-        return calblocklist
+        '''Return the minimal list of calibration blocks needed by the blocks
+        (see `odl.calibration.CalibrationPlan`).
+        '''
+        from .calibration import plan_calibrations
+        return plan_calibrations(self.data).blocks
+
+
+    def intern(self, pool=None):
+        '''Replace the patterns, instrument configs, and detector configs of
+        the blocks with a single shared object per distinct value.  Returns the
+        `odl.hashing.InternPool` used, which may be passed to later calls to
+        share objects between lists.
+        '''
+        pool = InternPool() if pool is None else pool
+        for OB in self.data:
+            OB.pattern = pool.intern(OB.pattern)
+            OB.instconfig = pool.intern(OB.instconfig)
+            if type(OB.detconfig) in [list, tuple]:
+                OB.detconfig = type(OB.detconfig)([pool.intern(dc)
+                                                   for dc in OB.detconfig])
+            else:
+                OB.detconfig = pool.intern(OB.detconfig)
+        return pool
 
 
     def to_yaml(self):
         return yaml.dump([OB.to_dict() for OB in self.data])
 
 
+    def to_normalized_dict(self):
+        '''Return a dictionary in which each distinct target, pattern,
+        instrument config, detector config, and alignment appears once in a
+        table and the blocks refer to table entries by their index.  Objects
+        are considered the same if they are the same instance or if their
+        `to_dict` output is identical.
+        '''
+        tables = {table: [] for table in normalized_tables.values()}
+        by_id = {}
+        by_content = {}
+
+        def ref(obj, table):
+            if obj is None or obj == 'None':
+                return None
+            key = (table, id(obj))
+            if key not in by_id.keys():
+                entry = obj.to_dict()
+                content = (table, json.dumps(entry, sort_keys=True, default=str))
+                if content not in by_content.keys():
+                    by_content[content] = len(tables[table])
+                    tables[table].append(entry)
+                by_id[key] = by_content[content]
+            return by_id[key]
+
+        blocks = []
+        for OB in self.data:
+            blocks.append({
+                'blocktype': OB.blocktype,
+                'target': ref(OB.target, 'Targets'),
+                'pattern': ref(OB.pattern, 'OffsetPatterns'),
+                'instconfig': ref(OB.instconfig, 'InstrumentConfigs'),
+                'detconfig': [ref(d, 'DetectorConfigs') for d in OB.detconfig],
+                'align': ref(OB.align, 'Alignments'),
+                'associatedblocks': [str(b) for b in OB.associatedblocks],
+                'guidestar': OB.guidestar,
+                'drp_args': OB.drp_args,
+                'ql_args': OB.ql_args,
+                })
+        result = dict(tables)
+        result['ObservingBlocks'] = blocks
+        return result
+
+
+    def write(self, file):
+        '''Write the block list to a yaml formatted file in the normalized
+        form (see `to_normalized_dict`).
+        '''
+        write_yaml(file, [self.to_normalized_dict()])
+
+
+    def parse_yaml(self, contents):
+        '''Build an ObservingBlockList from the normalized form.  Each table
+        entry is built once and shared by every block which refers to it.
+        '''
+        entry = contents[0]
+        # Build instrument configs first so that the instrument packages (and
+        # the InstrumentFrames they define) are imported before the patterns.
+        ics = [InstrumentConfig.from_dict(d)
+               for d in entry.get('InstrumentConfigs', [])]
+        dcs = [DetectorConfig.from_dict(d)
+               for d in entry.get('DetectorConfigs', [])]
+        targets = [Target.from_dict(d) for d in entry.get('Targets', [])]
+        patterns = [OffsetPattern.from_dict(d)
+                    for d in entry.get('OffsetPatterns', [])]
+        aligns = [Alignment.from_dict(d) for d in entry.get('Alignments', [])]
+
+        def deref(table, index):
+            return None if index is None else table[index]
+
+        blocks = []
+        for bd in entry.get('ObservingBlocks', []):
+            block_class = block_types.get(bd.get('blocktype'), ObservingBlock)
+            OB = block_class(target=deref(targets, bd.get('target')),
+                             pattern=deref(patterns, bd.get('pattern')),
+                             instconfig=deref(ics, bd.get('instconfig')),
+                             detconfig=[deref(dcs, i) for i in bd.get('detconfig', [])],
+                             align=deref(aligns, bd.get('align')))
+            OB.blocktype = bd.get('blocktype', OB.blocktype)
+            OB.associatedblocks = bd.get('associatedblocks', [None])
+            OB.guidestar = bd.get('guidestar', None)
+            OB.drp_args = bd.get('drp_args', None)
+            OB.ql_args = bd.get('ql_args', None)
+            blocks.append(OB)
+        return ObservingBlockList(blocks)
+
+
+    def read(self, file):
+        '''Read a block list from a yaml formatted file in the normalized form.
+        '''
+        p = Path(file).expanduser().absolute()
+        if p.exists() is False:
+            raise FileNotFoundError
+        with open(p, 'r') as FO:
+            contents = yaml.safe_load(FO)
+        return self.parse_yaml(contents)
+
+
     def __str__(self):
         output = [(f'{"Target":15s}|{"Pattern":22s}|'
                    f'{"InstrumentConfig":45s}|{"DetectorConfig":36s}|'
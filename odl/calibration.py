@@ -0,0 +1,105 @@
+#!python3
+
+## Import General Tools
+from .block import ObservingBlockList, CalibrationBlock, FocusBlock
+from .hashing import canonical
+
+
+##-------------------------------------------------------------------------
+## Calibration Requirements
+##-------------------------------------------------------------------------
+def cal_key(instconfig):
+    '''Return a key which is the same for instrument configs which need the
+    same calibrations.  The fields compared are listed in the config's
+    cal_fields attribute (e.g. the filter and mask for MOSFIRE).  If it is
+    None, all of the `to_dict` content other than the name is compared.
+    '''
+    fields = getattr(instconfig, 'cal_fields', None)
+    if fields is None:
+        values = instconfig.to_dict()
+        values.pop('name', None)
+    else:
+        values = {f: getattr(instconfig, f, None) for f in fields}
+    return (type(instconfig), canonical(values))
+
+
+def block_key(OB):
+    '''Return a key which is the same for calibration blocks which take the
+    same data.
+    '''
+    target = None if OB.target is None else canonical(OB.target.to_dict())
+    detconfig = tuple(OB.detconfig) if type(OB.detconfig) in [list, tuple]\
+                else OB.detconfig
+    return (type(OB), target, OB.pattern, OB.instconfig, detconfig)
+
+
+##-------------------------------------------------------------------------
+## CalibrationPlan
+##-------------------------------------------------------------------------
+class CalibrationPlan():
+    '''The minimal set of calibrations needed by a list of observing blocks.
+
+    Attributes
+    ----------
+    requirements : dict
+        Maps each distinct calibration key (see `cal_key`) to the list of
+        blocks which need it.
+
+    blocks : `ObservingBlockList`
+        The calibration blocks, with duplicates removed.
+
+    duplicates : int
+        The number of calibration blocks which were dropped because an
+        identical block was already planned.
+    '''
+    def __init__(self, blocks):
+        self.requirements = {}
+        configs = {}
+        keys = {}
+        for OB in blocks:
+            if isinstance(OB, (CalibrationBlock, FocusBlock))\
+               or OB.instconfig is None:
+                continue
+            # Many blocks share a config, so only compute its key once
+            key = keys.get(id(OB.instconfig), None)
+            if key is None:
+                key = keys[id(OB.instconfig)] = cal_key(OB.instconfig)
+            if key not in self.requirements.keys():
+                self.requirements[key] = []
+                configs[key] = OB.instconfig
+            self.requirements[key].append(OB)
+
+        self.blocks = ObservingBlockList()
+        self.duplicates = 0
+        planned = set()
+        for key, instconfig in configs.items():
+            for OB in instconfig.cals():
+                bkey = block_key(OB)
+                if bkey in planned:
+                    self.duplicates += 1
+                    continue
+                planned.add(bkey)
+                self.blocks.append(OB)
+
+
+    def estimate_time(self):
+        '''Return the total time estimate for the calibration blocks.
+        '''
+        return self.blocks.estimate_time()
+
+
+    def __len__(self):
+        return len(self.blocks)
+
+
+    def __repr__(self):
+        t = self.estimate_time()
+        return (f'{len(self.blocks)} calibration blocks for '
+                f'{len(self.requirements)} distinct configs '
+                f'({t["wall clock time"]/3600:.1f} hrs)')
+
+
+def plan_calibrations(blocks):
+    '''Return the `CalibrationPlan` for a list of observing blocks.
+    '''
+    return CalibrationPlan(blocks)
@@ -0,0 +1,162 @@
+#!python3
+
+## Import General Tools
+import numpy as np
+from astropy import units as u
+
+from .offset import OffsetPattern
+from .frame_transform import to_sky, frame_angle
+
+
+class CoverageError(Exception): pass
+
+
+##-------------------------------------------------------------------------
+## CoverageMap
+##-------------------------------------------------------------------------
+class CoverageMap():
+    '''The exposure time coverage on the sky of a pattern.  The field of view
+    is rasterized at every position of the expanded pattern (including its
+    repeats) and weighted by the exposure time, so each pixel of the map holds
+    the total shutter open time (in seconds) at that point on the sky.
+
+    The map is in sky coordinates: the X axis points East and the Y axis
+    points North, with offsets in arcseconds from the base position.
+
+    Attributes
+    ----------
+    pattern : `OffsetPattern` or `OffsetArray`
+        The pattern to map.
+
+    fov_frame : `InstrumentFrame` or None
+        The frame which defines the field of view (see `InstrumentFrame.fov`).
+        Defaults to the frame of the pattern, which must then be an instrument
+        frame (e.g. a KCWI slicer or the MOSFIRE detector).
+
+    PA : float or `u.Quantity`
+        The position angle of the target (in degrees if a float).
+
+    detconfig : `DetectorConfig` or None
+        The detector configuration.  Each position is weighted by exptime *
+        nexp (times coadds if defined).
+
+    exptime : float or None
+        The weight at each position in seconds.  Overrides detconfig.
+
+    pixscale : float or `u.Quantity`
+        The size of a map pixel (in arcseconds if a float).
+
+    map : `np.ndarray`
+        The coverage map in seconds, indexed [y, x].
+
+    x, y : `np.ndarray`
+        The East and North offsets (arcseconds) of the pixel centers.
+    '''
+    def __init__(self, pattern, fov_frame=None, PA=0, detconfig=None,
+                 exptime=None, pixscale=0.5*u.arcsec):
+        self.pattern = pattern
+        self.array = pattern.to_array() if isinstance(pattern, OffsetPattern)\
+                     else pattern
+        self.fov_frame = self.array.frame if fov_frame is None else fov_frame
+        if getattr(self.fov_frame, 'fov', None) is None:
+            raise CoverageError(f'No field of view is defined for '
+                                f'"{self.fov_frame}", use fov_frame')
+        self.PA = PA
+        self.exptime = self.weight(detconfig) if exptime is None else exptime
+        self.pixscale = pixscale.to_value(u.arcsec)\
+                        if isinstance(pixscale, u.Quantity) else float(pixscale)
+        self.compute()
+
+
+    @staticmethod
+    def weight(detconfig):
+        '''Return the exposure time per position for a detector config.
+        '''
+        if detconfig is None:
+            return 1.
+        if type(detconfig) in [list, tuple]:
+            return max([CoverageMap.weight(dc) for dc in detconfig])
+        return detconfig.exptime * detconfig.nexp * getattr(detconfig, 'coadds', 1)
+
+
+    def sky_positions(self):
+        '''Return the East and North offsets (arcseconds) and the rotation
+        (degrees) of every expanded position of the pattern.
+        '''
+        array = self.array.expand()
+        x, y, r = array.positions()
+        east, north = to_sky(x, y, array.frame, PA=self.PA)
+        return east, north, r
+
+
+    def compute(self):
+        '''Rasterize the field of view at each position in to the map.
+        '''
+        east, north, rotation = self.sky_positions()
+        width, height = [f.to_value(u.arcsec) for f in self.fov_frame.fov]
+        theta = np.radians(frame_angle(self.fov_frame, PA=self.PA) + rotation)
+        cos, sin = np.cos(theta), np.sin(theta)
+        # Half size of the bounding box of each rotated field of view
+        hx = (np.abs(cos)*width + np.abs(sin)*height)/2
+        hy = (np.abs(sin)*width + np.abs(cos)*height)/2
+
+        s = self.pixscale
+        if len(east) == 0:
+            raise CoverageError('The pattern has no positions')
+        self.npositions = len(east)
+        x0 = np.floor((east - hx).min()/s)*s
+        y0 = np.floor((north - hy).min()/s)*s
+        nx = int(np.ceil(((east + hx).max() - x0)/s))
+        ny = int(np.ceil(((north + hy).max() - y0)/s))
+        self.x = x0 + (np.arange(nx) + 0.5)*s
+        self.y = y0 + (np.arange(ny) + 0.5)*s
+        self.map = np.zeros((ny, nx))
+
+        # Pixel index range of each bounding box
+        i0 = np.clip(np.floor((east - hx - x0)/s).astype(int), 0, nx)
+        i1 = np.clip(np.ceil((east + hx - x0)/s).astype(int), 0, nx)
+        j0 = np.clip(np.floor((north - hy - y0)/s).astype(int), 0, ny)
+        j1 = np.clip(np.ceil((north + hy - y0)/s).astype(int), 0, ny)
+        for k in range(len(east)):
+            dx = self.x[i0[k]:i1[k]] - east[k]
+            dy = self.y[j0[k]:j1[k], np.newaxis] - north[k]
+            # Inside the field when within all four half planes of its edges
+            along = dx*cos[k] + dy*sin[k]
+            across = -dx*sin[k] + dy*cos[k]
+            inside = (np.abs(along) <= width/2) & (np.abs(across) <= height/2)
+            self.map[j0[k]:j1[k], i0[k]:i1[k]] += inside*self.exptime
+        return self.map
+
+
+    def area(self, depth=0):
+        '''Return the area (in square arcseconds) with a total exposure time
+        of at least depth seconds.  A depth of 0 gives the area covered at all.
+        '''
+        if depth <= 0:
+            return float(np.count_nonzero(self.map > 0))*self.pixscale**2
+        return float(np.count_nonzero(self.map >= depth))*self.pixscale**2
+
+
+    def stats(self, depths=[]):
+        '''Return summary statistics of the map.  The area at each of the
+        given depths is included as "area >= <depth>".
+        '''
+        covered = self.map[self.map > 0]
+        output = {'positions': self.npositions,
+                  'area': self.area(),
+                  'max depth': float(covered.max()) if covered.size > 0 else 0.,
+                  'mean depth': float(covered.mean()) if covered.size > 0 else 0.,
+                  'median depth': float(np.median(covered)) if covered.size > 0 else 0.,
+                  }
+        for depth in depths:
+            output[f'area >= {depth}'] = self.area(depth)
+        return output
+
+
+    def extent(self):
+        '''Return the (left, right, bottom, top) extent of the map in
+        arcseconds, e.g. for `matplotlib.pyplot.imshow`.
+        '''
+        s = self.pixscale
+        return (self.x[0] - s/2, self.x[-1] + s/2,
+                self.y[0] - s/2, self.y[-1] + s/2)
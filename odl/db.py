@@ -0,0 +1,824 @@
+#!python3
+
+## Import General Tools
+import os
+import socket
+import time
+import atexit
+import weakref
+import json
+import hashlib
+import pickle
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from warnings import warn
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import yaml
+
+from .target import Target, TargetList
+from .offset import OffsetPattern
+from .fileio import is_table, atomic_write
+from .hashing import content_hash
+
+
+db_upload_url = 'http://vm-webtools.keck.hawaii.edu:59999/'
+db_download_url = 'http://vm-devnginxsw/api/ddoi/getDefs?'
+
+
+class UploadFailed(UserWarning): pass
+
+
+##-------------------------------------------------------------------------
+## DownloadCache
+##-------------------------------------------------------------------------
+class DownloadCache():
+    '''An on disk cache of objects downloaded from the database, keyed by
+    collection and name.  The parsed objects are stored (pickled) along with
+    the ETag and Last-Modified headers of the response so that stale entries
+    can be revalidated cheaply.  The least recently used entries are evicted
+    when the cache holds more than max_entries.
+
+    Attributes
+    ----------
+    directory : str or `pathlib.Path`
+        The directory in which to store the cache.  It is created on first use.
+
+    ttl : float
+        The number of seconds after download for which an entry is served
+        without asking the DB whether it has changed.
+
+    max_entries : int
+        The maximum number of entries to keep.
+
+    save_interval : float
+        Access times (which set the eviction order) are saved at most once in
+        this many seconds so that a cache hit does not rewrite the index.
+        Pending access times are saved by `flush`, by any change to the cache,
+        and at exit.
+    '''
+    def __init__(self, directory='~/.odl/cache', ttl=3600, max_entries=500,
+                 save_interval=30):
+        self.directory = Path(directory).expanduser().absolute()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._index = None
+        self._dirty = False
+        self._saved = time.monotonic()
+        ref = weakref.ref(self)
+        atexit.register(lambda: ref() is not None and ref().flush())
+
+
+    @property
+    def index_file(self):
+        return self.directory / 'index.json'
+
+
+    def index(self):
+        if self._index is None:
+            if self.index_file.exists():
+                with open(self.index_file, 'r') as FO:
+                    self._index = json.load(FO)
+            else:
+                self._index = {}
+        return self._index
+
+
+    def save_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.index_file, json.dumps(self._index))
+        self._dirty = False
+        self._saved = time.monotonic()
+
+
+    def flush(self):
+        '''Save any access times which have not been written yet.
+        '''
+        with self._lock:
+            if self._dirty is True:
+                self.save_index()
+
+
+    def key(self, col, name):
+        return f'{col}/{name}'
+
+
+    def get(self, col, name):
+        '''Return a tuple of (entry, objects) for a cached download or None.
+        The entry is a dict with the download time and response headers.  The
+        objects are a fresh copy on each call.
+        '''
+        key = self.key(col, name)
+        with self._lock:
+            entry = self.index().get(key, None)
+            if entry is None:
+                return None
+            file = self.directory / entry['file']
+            if file.exists() is False:
+                self.index().pop(key)
+                self.save_index()
+                return None
+            with open(file, 'rb') as FO:
+                objects = pickle.load(FO)
+            # The access time is saved lazily, see save_interval
+            entry['accessed'] = time.time()
+            self._dirty = True
+            if time.monotonic() - self._saved > self.save_interval:
+                self.save_index()
+            return dict(entry), objects
+
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched'] < self.ttl
+
+
+    def put(self, col, name, objects, etag=None, last_modified=None):
+        '''Store the parsed objects for a download.
+        '''
+        key = self.key(col, name)
+        file = f'{hashlib.sha1(key.encode()).hexdigest()}.pickle'
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f'.{file}.tmp'
+            with open(tmp, 'wb') as FO:
+                pickle.dump(objects, FO)
+            tmp.replace(self.directory / file)
+            now = time.time()
+            self.index()[key] = {'file': file, 'fetched': now, 'accessed': now,
+                                 'etag': etag, 'last_modified': last_modified}
+            self.evict()
+            self.save_index()
+
+
+    def touch(self, col, name):
+        '''Mark a cached entry as revalidated by the DB.
+        '''
+        with self._lock:
+            entry = self.index().get(self.key(col, name), None)
+            if entry is not None:
+                entry['fetched'] = time.time()
+                self.save_index()
+
+
+    def evict(self):
+        '''Remove the least recently used entries beyond max_entries.
+        '''
+        index = self.index()
+        by_access = sorted(index.keys(), key=lambda k: index[k]['accessed'])
+        for key in by_access[:max(0, len(index) - self.max_entries)]:
+            file = self.directory / index.pop(key)['file']
+            if file.exists(): file.unlink()
+
+
+    def clear(self):
+        with self._lock:
+            for entry in self.index().values():
+                file = self.directory / entry['file']
+                if file.exists(): file.unlink()
+            self._index = {}
+            self.save_index()
+
+
+##-------------------------------------------------------------------------
+## UploadSpool
+##-------------------------------------------------------------------------
+class UploadSpool():
+    '''A durable spool of uploads which could not be delivered.  Each upload
+    is written to the spool directory as a yaml file named by the SHA-256
+    hash of its contents, so identical payloads are only stored (and later
+    sent) once.  The spool is flushed in the order the uploads were last
+    added, either explicitly with `flush` or by a background thread started
+    with `start`.  Uploads which the DB rejects (a 4xx response) are moved to
+    the rejected sub-directory so they do not block the rest of the spool.
+
+    Attributes
+    ----------
+    directory : str or `pathlib.Path`
+        The directory in which to store the spooled uploads.  It is created on
+        first use.
+    '''
+    def __init__(self, directory='~/.odl/spool'):
+        self.directory = Path(directory).expanduser().absolute()
+        self.flushed = 0
+        self.rejected = 0
+        self.last_flush = None
+        self._last_ns = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+
+    def add(self, yaml_output):
+        '''Add an upload to the spool.  Returns the content hash.
+        '''
+        digest = hashlib.sha256(yaml_output.encode()).hexdigest()
+        file = self.directory / f'{digest}.yaml'
+        with self._lock:
+            if file.exists() is False:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                atomic_write(file, yaml_output)
+            # The modification time orders the spool.  Set it even when the
+            # payload was already spooled so that re-adding an earlier payload
+            # (e.g. a reverted edit) moves it after everything added since.
+            ns = max(time.time_ns(), self._last_ns + 1)
+            self._last_ns = ns
+            os.utime(file, ns=(ns, ns))
+        return digest
+
+
+    @property
+    def rejected_directory(self):
+        return self.directory / 'rejected'
+
+
+    def pending(self):
+        '''Return the spooled files, oldest first.
+        '''
+        if self.directory.exists() is False:
+            return []
+        return sorted(self.directory.glob('*.yaml'),
+                      key=lambda f: f.stat().st_mtime_ns)
+
+
+    def flush(self, client):
+        '''Send the spooled uploads using the given `DBClient`, removing each
+        one which is acknowledged.  An upload which the DB rejects with a 4xx
+        response is moved to the rejected directory and the flush continues.
+        Any other failure stops the flush so that the order of uploads is
+        kept.  Returns the number of uploads sent.
+        '''
+        with self._lock:
+            files = self.pending()
+            if len(files) == 0 or client.is_reachable(client.upload_url) is False:
+                return 0
+            start = time.monotonic()
+            sent = 0
+            for file in files:
+                with open(file, 'r') as FO:
+                    yaml_output = FO.read()
+                try:
+                    r = client.post(yaml_output)
+                except requests.exceptions.RequestException:
+                    break
+                if 400 <= r.status_code < 500:
+                    self.rejected_directory.mkdir(parents=True, exist_ok=True)
+                    file.replace(self.rejected_directory / file.name)
+                    self.rejected += 1
+                    warn(f'Spooled upload {file.stem[:12]} was rejected '
+                         f'(status {r.status_code}), moved to '
+                         f'{self.rejected_directory}', category=UploadFailed)
+                    continue
+                if r.status_code != requests.codes.ok:
+                    break
+                file.unlink()
+                sent += 1
+            duration = time.monotonic() - start
+            self.flushed += sent
+            self.last_flush = {'time': time.time(), 'sent': sent,
+                               'duration': duration}
+            return sent
+
+
+    def start(self, client, interval=60):
+        '''Start a background thread which flushes the spool every interval
+        seconds while there is anything in it.
+        '''
+        if self.running is True:
+            return
+        self._stop.clear()
+        def run():
+            while self._stop.wait(interval) is False:
+                if len(self.pending()) > 0:
+                    client.forget_reachability()
+                    self.flush(client)
+        self._thread = threading.Thread(target=run, name='odl-upload-spool',
+                                        daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+    def status(self):
+        '''Return a dict describing the spool: the number of spooled uploads
+        (depth), their total size in bytes, the age in seconds of the oldest,
+        the total number flushed and rejected, the result of the last flush,
+        the flush throughput in uploads per second, and whether the background
+        flush is running.
+        '''
+        files = self.pending()
+        now = time.time()
+        throughput = None
+        if self.last_flush is not None and self.last_flush['duration'] > 0:
+            throughput = self.last_flush['sent']/self.last_flush['duration']
+        return {'depth': len(files),
+                'bytes': sum([f.stat().st_size for f in files]),
+                'oldest age': now - files[0].stat().st_mtime\
+                              if len(files) > 0 else 0,
+                'flushed': self.flushed,
+                'rejected': self.rejected,
+                'last flush': self.last_flush,
+                'throughput': throughput,
+                'running': self.running,
+                }
+
+
+##-------------------------------------------------------------------------
+## DBClient
+##-------------------------------------------------------------------------
+class DBClient():
+    '''A client for the Keck observing database.  The client holds a pooled
+    `requests.Session` so that connections are kept alive between calls and
+    failed requests are retried with an exponential backoff.  Reachability of
+    the DB host is checked by opening a TCP connection and the result is
+    cached for a short time.
+
+    Attributes
+    ----------
+    upload_url : str
+        The URL to which uploads are posted.  Point this (and download_url) at
+        a local stand-in server for testing.
+
+    download_url : str
+        The URL of the query endpoint for downloads.
+
+    timeout : float
+        The timeout in seconds for each HTTP request.
+
+    retries : int
+        The number of times to retry a request which fails to connect.
+        Downloads (GET) are also retried on a 502, 503, or 504 response.
+        Uploads (POST) are not, because the DB may have committed the write
+        before the gateway error; use a spool to resend failed uploads.
+
+    backoff : float
+        The backoff factor in seconds between retries (see
+        `urllib3.util.retry.Retry`).
+
+    pool_size : int
+        The maximum number of connections kept open per host.
+
+    reachability_ttl : float
+        The number of seconds for which the result of a reachability check is
+        reused.
+
+    probe_timeout : float
+        The timeout in seconds for the TCP connection used to check
+        reachability.
+
+    cache : a `DownloadCache` instance or None
+        If given, downloads are read through this cache, so a download may
+        return data up to the cache's ttl old.
+
+    delete_url : str or None
+        The URL to which deletions are posted by `sync`.  Deletions are not
+        supported if this is None.
+
+    offline : boolean
+        If True, downloads are only served from the cache and the DB is never
+        contacted.
+
+    spool : an `UploadSpool` instance or None
+        If given, uploads which fail or can not reach the DB are spooled and
+        sent by a background thread once the DB is reachable.
+    '''
+    def __init__(self, upload_url=db_upload_url, download_url=db_download_url,
+                 timeout=10, retries=3, backoff=0.5, pool_size=10,
+                 reachability_ttl=30, probe_timeout=2, cache=None,
+                 offline=False, spool=None, delete_url=None):
+        self.upload_url = upload_url
+        self.download_url = download_url
+        self.delete_url = delete_url
+        self.cache = cache
+        self.offline = offline
+        self.spool = spool
+        self.timeout = timeout
+        self.reachability_ttl = reachability_ttl
+        self.probe_timeout = probe_timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=backoff,
+                      status_forcelist=[502, 503, 504],
+                      allowed_methods=['GET'],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._reachable = {}
+        self._lock = threading.Lock()
+
+
+    def is_reachable(self, url):
+        '''Return True if a TCP connection can be opened to the host and port
+        of the given URL.  Results are cached for reachability_ttl seconds.
+        '''
+        parsed = urlparse(url)
+        port = parsed.port if parsed.port is not None\
+               else {'https': 443}.get(parsed.scheme, 80)
+        key = (parsed.hostname, port)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._reachable.keys():
+                checked, result = self._reachable[key]
+                if now - checked < self.reachability_ttl:
+                    return result
+        try:
+            with socket.create_connection(key, timeout=self.probe_timeout):
+                result = True
+        except OSError:
+            result = False
+        with self._lock:
+            self._reachable[key] = (now, result)
+        return result
+
+
+    def forget_reachability(self):
+        '''Clear the cached reachability results.
+        '''
+        with self._lock:
+            self._reachable = {}
+
+
+    def to_yaml(self, input_list):
+        '''Return the yaml string to upload for a `Target`, `TargetList`,
+        `OffsetPattern`, or a list of ODL objects.
+        '''
+        output = []
+        if type(input_list) in [TargetList, Target, OffsetPattern]:
+            output.append(input_list.to_dict())
+        elif type(input_list) is list:
+            for item in input_list:
+                output.append(item.to_dict())
+        return yaml.dump(output)
+
+
+    def post(self, yaml_output):
+        '''Post a yaml string to the upload URL.  Returns the response.
+        '''
+        files = [('yaml_cfg', yaml_output)]
+        return self.session.post(self.upload_url, files=files,
+                                 timeout=self.timeout)
+
+
+    def upload(self, input_list):
+        '''Upload objects to the database.  Returns True on success, False if
+        the upload was rejected, and None if the DB could not be reached.
+        Failed uploads are added to the spool if the client has one.
+        '''
+        yaml_output = self.to_yaml(input_list)
+        if self.is_reachable(self.upload_url) is False:
+            print('Unable to connect to Keck DB')
+            self.to_spool(yaml_output)
+            return None
+        try:
+            r = self.post(yaml_output)
+        except requests.exceptions.RequestException as e:
+            warn(f'Upload failed: {e}', category=UploadFailed)
+            self.to_spool(yaml_output)
+            return False
+        if r.status_code == requests.codes.ok:
+            return True
+        else:
+            warn('Upload failed', category=UploadFailed)
+            self.to_spool(yaml_output)
+            return False
+
+
+    def to_spool(self, yaml_output):
+        '''Add an upload to the spool (if any) and make sure the background
+        flush is running.
+        '''
+        if self.spool is None:
+            return
+        digest = self.spool.add(yaml_output)
+        print(f'Upload spooled as {digest[:12]}')
+        self.spool.start(self)
+
+
+    def chunks(self, input_list, max_bytes=256*1024):
+        '''Split the `to_dict` output of the input into a list of yaml strings
+        in the upload format, each no larger than max_bytes (unless a single
+        entry is larger).  Table documents such as the output of
+        `TargetList.to_dict` are split between entries.
+        '''
+        if type(input_list) in [TargetList, Target, OffsetPattern]:
+            input_list = [input_list]
+        documents = []
+        for item in input_list:
+            d = item.to_dict()
+            if is_table(d):
+                for table, entries in d.items():
+                    documents.extend([(table, e) for e in entries])
+            else:
+                documents.append((None, d))
+
+        def dump(chunk):
+            output = []
+            for table, entry in chunk:
+                if table is None:
+                    output.append(entry)
+                elif len(output) > 0 and table in output[-1].keys()\
+                     and is_table(output[-1]):
+                    output[-1][table].append(entry)
+                else:
+                    output.append({table: [entry]})
+            return yaml.dump(output)
+
+        chunks = []
+        chunk = []
+        size = 0
+        for document in documents:
+            document_size = len(dump([document]))
+            if len(chunk) > 0 and size + document_size > max_bytes:
+                chunks.append(dump(chunk))
+                chunk = []
+                size = 0
+            chunk.append(document)
+            size += document_size
+        if len(chunk) > 0:
+            chunks.append(dump(chunk))
+        return chunks
+
+
+    def bulk_upload(self, input_list, max_bytes=256*1024, workers=4,
+                    state_file=None):
+        '''Upload a large input in size bounded chunks (see `chunks`) posted
+        concurrently by a pool of worker threads sharing this client's session.
+
+        If a state_file is given, the digest of each acknowledged chunk is
+        recorded there as it completes.  Calling `bulk_upload` again with the
+        same input and state_file skips the chunks already acknowledged, so an
+        interrupted upload resumes where it left off.
+
+        Returns a list with a dict for each chunk giving its index, digest,
+        size in bytes, and status ('uploaded', 'skipped', 'failed', or
+        'unreachable') along with the HTTP status code or error if any.
+        '''
+        chunks = self.chunks(input_list, max_bytes=max_bytes)
+        digests = [hashlib.sha1(c.encode()).hexdigest() for c in chunks]
+        acknowledged = set()
+        if state_file is not None:
+            state_file = Path(state_file).expanduser().absolute()
+            if state_file.exists():
+                with open(state_file, 'r') as FO:
+                    acknowledged = set(json.load(FO).get('acknowledged', []))
+        results = [{'chunk': i, 'digest': digest, 'bytes': len(chunk),
+                    'status': 'skipped' if digest in acknowledged else None,
+                    'code': None, 'error': None}
+                   for i, (chunk, digest) in enumerate(zip(chunks, digests))]
+        pending = [r for r in results if r['status'] is None]
+        if len(pending) == 0:
+            return results
+        if self.is_reachable(self.upload_url) is False:
+            print('Unable to connect to Keck DB')
+            for r in pending:
+                r['status'] = 'unreachable'
+            return results
+
+        lock = threading.Lock()
+        def send(result):
+            try:
+                r = self.post(chunks[result['chunk']])
+                result['code'] = r.status_code
+                ok = r.status_code == requests.codes.ok
+                result['status'] = 'uploaded' if ok else 'failed'
+            except requests.exceptions.RequestException as e:
+                result['status'] = 'failed'
+                result['error'] = str(e)
+            if result['status'] == 'uploaded' and state_file is not None:
+                with lock:
+                    acknowledged.add(result['digest'])
+                    atomic_write(state_file, json.dumps(
+                        {'acknowledged': sorted(acknowledged)}))
+            return result
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(send, pending))
+        failed = [r for r in results if r['status'] != 'uploaded'
+                  and r['status'] != 'skipped']
+        if len(failed) > 0:
+            warn(f'{len(failed)} of {len(chunks)} chunks failed to upload',
+                 category=UploadFailed)
+        return results
+
+
+    def sync(self, input_list, manifest='~/.odl/manifest.json', delete=False):
+        '''Upload only the objects which are new or have changed since the
+        last sync.
+
+        Each object is identified by its table (e.g. "Targets") and name and
+        its content hash (see `odl.hashing`) is recorded in the manifest file
+        once the DB acknowledges it.  The manifest is kept separately for each
+        upload URL.  If delete is True, objects in the manifest for the tables
+        being synced which are no longer in the input are deleted from the DB
+        (this requires a delete_url).
+
+        Returns a dict with the number of objects sent, unchanged, and deleted
+        and whether all requests succeeded (None if the DB was not reachable).
+        '''
+        if type(input_list) in [TargetList, Target, OffsetPattern]:
+            input_list = [input_list]
+        current = {}
+        for item in input_list:
+            d = item.to_DB() if hasattr(item, 'to_DB') else item.to_dict()
+            if is_table(d) is False:
+                d = {'Targets': [d]} if isinstance(item, Target)\
+                    else {'OffsetPatterns': [d]}
+            for table, entries in d.items():
+                for entry in entries:
+                    h = content_hash(entry)
+                    name = entry.get('name', None)
+                    key = f'{table}/{name if name is not None else h}'
+                    current[key] = (table, entry, h)
+
+        manifest = Path(manifest).expanduser().absolute()
+        manifests = {}
+        if manifest.exists():
+            with open(manifest, 'r') as FO:
+                manifests = json.load(FO)
+        synced = manifests.get(self.upload_url, {})
+
+        changed = {k: v for k,v in current.items() if synced.get(k) != v[2]}
+        deleted = []
+        if delete is True:
+            tables = set([table for table, entry, h in current.values()])
+            deleted = [k for k in synced.keys()
+                       if k.split('/')[0] in tables and k not in current.keys()]
+        result = {'sent': len(changed), 'unchanged': len(current)-len(changed),
+                  'deleted': 0, 'success': True}
+        if len(changed) == 0 and len(deleted) == 0:
+            return result
+        if self.is_reachable(self.upload_url) is False:
+            print('Unable to connect to Keck DB')
+            result['sent'] = 0
+            result['success'] = None
+            return result
+
+        if len(changed) > 0:
+            output = {}
+            for table, entry, h in changed.values():
+                output.setdefault(table, []).append(entry)
+            try:
+                r = self.post(yaml.dump([output]))
+                ok = r.status_code == requests.codes.ok
+            except requests.exceptions.RequestException as e:
+                warn(f'Upload failed: {e}', category=UploadFailed)
+                ok = False
+            if ok is True:
+                for key, (table, entry, h) in changed.items():
+                    synced[key] = h
+            else:
+                warn('Upload failed', category=UploadFailed)
+                result['sent'] = 0
+                result['success'] = False
+
+        if len(deleted) > 0:
+            if self.delete_url is None:
+                warn('No delete_url configured, deletions were not sent',
+                     category=UploadFailed)
+                result['success'] = False
+            else:
+                output = {}
+                for key in deleted:
+                    table, name = key.split('/', 1)
+                    output.setdefault(table, []).append(name)
+                try:
+                    r = self.session.post(self.delete_url,
+                                          files=[('yaml_cfg', yaml.dump(output))],
+                                          timeout=self.timeout)
+                    ok = r.status_code == requests.codes.ok
+                    reason = f'status {r.status_code}'
+                except requests.exceptions.RequestException as e:
+                    ok = False
+                    reason = e
+                if ok is True:
+                    for key in deleted:
+                        synced.pop(key)
+                    result['deleted'] = len(deleted)
+                else:
+                    warn(f'Delete failed: {reason}', category=UploadFailed)
+                    result['success'] = False
+
+        manifests[self.upload_url] = synced
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(manifest, json.dumps(manifests, indent=1, sort_keys=True))
+        return result
+
+
+    def query_url(self, col='Target', name=None):
+        query_url = f'{self.download_url}col={col}'
+        if name is not None:
+            query_url += f'&name={name}'
+        return query_url
+
+
+    def download(self, col='Target', name=None, refresh=False):
+        '''Download objects from the database.  Returns the output of
+        `odl.parse_yaml` or None if the download failed.
+
+        If the client has a cache, a fresh cached copy is returned without
+        contacting the DB unless refresh is True.  A stale copy is revalidated
+        using its ETag or Last-Modified time.  If the DB can not be reached
+        (or the client is offline), any cached copy is returned instead.
+        '''
+        from . import parse_yaml
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(col, name)
+            if cached is not None:
+                entry, objects = cached
+                if self.offline is True\
+                   or (refresh is False and self.cache.is_fresh(entry)):
+                    return objects
+        if self.offline is True:
+            print(f'No cached copy of {col} {name} available offline')
+            return None
+        if self.is_reachable(self.download_url) is False:
+            if cached is not None:
+                warn(f'Unable to connect to Keck DB, using cached {col} {name}',
+                     category=UploadFailed)
+                return cached[1]
+            print('Unable to connect to Keck DB')
+            return None
+
+        headers = {}
+        if cached is not None:
+            if cached[0].get('etag', None) is not None:
+                headers['If-None-Match'] = cached[0]['etag']
+            if cached[0].get('last_modified', None) is not None:
+                headers['If-Modified-Since'] = cached[0]['last_modified']
+        try:
+            r = self.session.get(self.query_url(col=col, name=name),
+                                 headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            if cached is not None:
+                warn(f'Download failed ({e}), using cached {col} {name}',
+                     category=UploadFailed)
+                return cached[1]
+            warn(f'Download failed: {e}', category=UploadFailed)
+            return None
+        if r.status_code == requests.codes.not_modified and cached is not None:
+            self.cache.touch(col, name)
+            return cached[1]
+        if r.status_code != requests.codes.ok:
+            warn('Download failed', category=UploadFailed)
+            return None
+        contents = yaml.safe_load(r.text)
+        objects = parse_yaml([contents])
+        if self.cache is not None:
+            self.cache.put(col, name, objects,
+                           etag=r.headers.get('ETag', None),
+                           last_modified=r.headers.get('Last-Modified', None))
+        return objects
+
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.flush()
+        self.session.close()
+
+
+##-------------------------------------------------------------------------
+## Default Client
+##-------------------------------------------------------------------------
+_client = None
+
+
+def get_client():
+    '''Return the DBClient used by `odl.upload_to_DB` and
+    `odl.download_from_DB`, creating it on first use.  The default client
+    does not cache downloads, so every download asks the DB.  To serve
+    downloads from a cache (up to the cache's ttl old), install a client
+    which has one:
+
+        odl.set_client(odl.DBClient(cache=odl.DownloadCache()))
+
+    Likewise failed uploads are only spooled for later delivery by a client
+    created with an `UploadSpool`.
+    '''
+    global _client
+    if _client is None:
+        _client = DBClient()
+    return _client
+
+
+def set_client(client):
+    '''Replace the DBClient used by `odl.upload_to_DB` and
+    `odl.download_from_DB` (for example with one pointed at a test server).
+    '''
+    global _client
+    _client = client
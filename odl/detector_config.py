@@ -1,12 +1,17 @@
 #!python3
 
 ## Import General Tools
-from pathlib import Path
 import re
+import importlib
+import inspect
 from warnings import warn
 import yaml
+import numpy as np
 from astropy.io import fits
 
+from .fileio import write_yaml
+from .hashing import content_hash, canonical
+
 
 class DetectorConfigError(Exception): pass
 
@@ -68,6 +73,30 @@ class DetectorConfig():
                 'readoutmode': self.readoutmode}
 
 
+    def content_hash(self):
+        '''Return the content hash of `to_dict` (see `odl.hashing`).
+        '''
+        return content_hash(self.to_dict())
+
+
+    @classmethod
+    def from_dict(cls, input):
+        '''Return a detector config built from the output of `to_dict`.  When
+        called on `DetectorConfig` itself, the sub-class is found from the
+        instrument and detector names (e.g. instrument "KCWI" and detector
+        "blue" give `odl.kcwi.KCWIblueDetectorConfig`).
+        '''
+        if cls is DetectorConfig:
+            cls = find_detector_config_class(input.get('instrument'),
+                                             input.get('detector', ''))
+        params = inspect.signature(cls.__init__).parameters
+        dc = cls(**{k: v for k,v in input.items() if k in params})
+        # Restore values (such as the name) which the constructor derives
+        for key, value in input.items():
+            setattr(dc, key, value)
+        return dc
+
+
     def to_yaml(self):
         '''Return string corresponding to a Detector Config Description
         Language (DCDL) yaml entry.
@@ -79,12 +108,36 @@ class DetectorConfig():
         return {'DetectorConfigs': [self.to_dict()]}
 
 
-    def write(self, file):
+    def write(self, file, mode='w'):
+        '''Write the config to a yaml formatted file.  See `odl.fileio.write_yaml`
+        for the write modes ('w', 'a', or 'update').
+        '''
         self.validate()
-        p = Path(file).expanduser().absolute()
-        if p.exists(): p.unlink()
-        with open(p, 'w') as FO:
-            FO.write(yaml.dump([self.to_dict()]))
+        write_yaml(file, [self.to_dict()], mode=mode)
+
+
+    def __setattr__(self, name, value):
+        # Any change invalidates the cached canonical form
+        self.__dict__.pop('_canonical', None)
+        object.__setattr__(self, name, value)
+
+
+    def _value(self):
+        if '_canonical' not in self.__dict__:
+            self.__dict__['_canonical'] = canonical(self.to_dict())
+        return self.__dict__['_canonical']
+
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._value() == other._value()
+
+
+    def __hash__(self):
+        return hash(self._value())
 
 
     def estimate_clock_time(self):
@@ -99,19 +152,60 @@ class DetectorConfig():
         return self.name
 
 
+def find_detector_config_class(instrument, detector=''):
+    '''Return the `DetectorConfig` sub-class for the given instrument and
+    detector names.  The class is looked up in the `odl.[instrument]` package
+    and the match on the class name is case insensitive.
+    '''
+    if instrument is None:
+        raise DetectorConfigError('No instrument given for detector config')
+    package = importlib.import_module(f'odl.{instrument.split()[0].lower()}')
+    classname = f'{instrument}{detector}DetectorConfig'.replace(' ', '').lower()
+    for name, value in vars(package).items():
+        if name.lower() == classname and isinstance(value, type)\
+           and issubclass(value, DetectorConfig):
+            return value
+    raise DetectorConfigError(f'No detector config found for "{instrument}" '
+                              f'detector "{detector}"')
+
+
 ##-------------------------------------------------------------------------
 ## IRDetectorConfig
 ##-------------------------------------------------------------------------
+def ir_readout_table(read_time, max_reads):
+    '''Return the readout time (in seconds per coadd) of each readout mode of
+    an IR detector which takes read_time seconds to read the array once.  CDS
+    reads the array once at the start and once at the end of the integration
+    and MCDSn reads it n times at each end.  The exposure time is measured
+    between the middle of the two groups of reads, so half of the reads add to
+    the clock time at each end.
+    '''
+    table = {'CDS': read_time}
+    for n in range(1, max_reads+1):
+        table[f'MCDS{n}'] = n*read_time
+    return table
+
+
 class IRDetectorConfig(DetectorConfig):
     '''An object to hold information about an IR detector configuration.  This
     is an abstract class which we expect to be subclassed to a particular
     instrument/detector.
 
+    The clock time is modeled by class attributes which subclasses override:
+    readout_table (see `ir_readout_table`) maps each readout mode to its
+    readout time per coadd, reset_time is the time to reset the array before
+    each coadd, and exposure_overhead is the time to write out each
+    exposure.
+
     Attributes
     ----------
     coadds : int
         The number of coadds (if applicable)
     '''
+    readout_table = ir_readout_table(0, 32)
+    reset_time = 0
+    exposure_overhead = 0
+
     def __init__(self, name=None, instrument='GenericIR', detector='',
                  exptime=None, nexp=1, readoutmode='CDS', coadds=1):
         super().__init__(name=name, instrument=instrument, detector=detector,
@@ -135,6 +229,53 @@ class IRDetectorConfig(DetectorConfig):
         return output
 
 
+    def validate(self):
+        '''Check values and verify that they meet assumptions.
+
+        Check:
+        - readoutmode is one of the modes in readout_table (CDS or MCDSn).
+        '''
+        if self.readoutmode not in self.readout_table.keys():
+            raise DetectorConfigError(f'Readout Mode "{self.readoutmode}" is '
+                                      f'not CDS or MCDSn (n=1-'
+                                      f'{len(self.readout_table)-1})')
+
+
+    def erase_time(self):
+        return self.reset_time*self.coadds
+
+
+    def readout_time(self):
+        try:
+            return self.readout_table[self.readoutmode]*self.coadds
+        except KeyError:
+            raise DetectorConfigError(f'No readout time for readout mode '
+                                      f'"{self.readoutmode}"')
+
+
+    def other_overhead(self):
+        return self.exposure_overhead
+
+
+    def estimate_clock_time(self):
+        total_time = self.erase_time()\
+                   + self.exptime*self.coadds\
+                   + self.readout_time()\
+                   + self.other_overhead()
+        return total_time*self.nexp
+
+
+    def match_time(self, target):
+        '''Set the exposure time per coadd so that the clock time of all the
+        exposures matches the target time (in seconds).
+        '''
+        overhead_per_exp = self.other_overhead()\
+                         + self.readout_time()\
+                         + self.erase_time()
+        self.exptime = (target/self.nexp - overhead_per_exp)/self.coadds
+        self.set_name()
+
+
 ##-------------------------------------------------------------------------
 ## VisibleDetectorConfig
 ##-------------------------------------------------------------------------
@@ -157,7 +298,14 @@ class VisibleDetectorConfig(DetectorConfig):
 
     window : str
         The window, parsed as x1:x2,y1:y2
+
+    The readout time is looked up in the readout_table class attribute (an
+    `odl.readout.ReadoutTable`), which subclasses set for their detector.
+    Without a table the readout time is 0 and a DetectorConfigWarning is
+    issued.
     '''
+    readout_table = None
+
     def __init__(self, name=None, instrument='GenericVis', detector='',
                  exptime=None, nexp=1, readoutmode=None, ampmode=None,
                  dark=False, binning='1x1', window=None):
@@ -194,7 +342,12 @@ class VisibleDetectorConfig(DetectorConfig):
 
 
     def readout_time(self):
-        return 0
+        if self.readout_table is None:
+            warn(f'{type(self).__name__} has no readout time table, the '
+                 f'readout time is taken as 0', category=DetectorConfigWarning)
+            return 0
+        return self.readout_table.readout_time(self.readoutmode, self.ampmode,
+                                               self.binning, self.window)
 
 
     def other_overhead(self):
@@ -209,6 +362,24 @@ class VisibleDetectorConfig(DetectorConfig):
         return total_time*self.nexp
 
 
+    @classmethod
+    def estimate_clock_times(cls, detconfigs):
+        '''Return an array of the clock times of a list of detector configs of
+        this class, looking up all of the readout times in one operation.
+        '''
+        if cls.readout_table is None or len(detconfigs) == 0:
+            return np.array([dc.estimate_clock_time() for dc in detconfigs],
+                            dtype=float)
+        columns = ['exptime', 'nexp', 'readoutmode', 'ampmode', 'binning']
+        values = {c: [getattr(dc, c) for dc in detconfigs] for c in columns}
+        return cls.readout_table.clock_time(
+                        window=np.array([dc.window for dc in detconfigs],
+                                        dtype=object),
+                        erase=[dc.erase_time() for dc in detconfigs],
+                        overhead=[dc.other_overhead() for dc in detconfigs],
+                        **values)
+
+
     def match_time(self, target):
         overhead_per_exp = self.other_overhead()\
                          + self.readout_time()\
@@ -0,0 +1,343 @@
+#!python3
+
+## Import General Tools
+import time
+from math import hypot
+
+from .offset import keyword
+from .frame_transform import to_keywords
+
+
+class ExecutorError(Exception): pass
+
+
+##-------------------------------------------------------------------------
+## Backends
+##-------------------------------------------------------------------------
+class Backend():
+    '''The interface between a `PatternExecutor` and the telescope and
+    instrument.  This class is abstract and is meant to be subclassed.  The
+    move and start_exposure methods start an action and return immediately,
+    and the wait methods block until the action has reached the given state.
+    '''
+    def time(self):
+        '''Return the current time in seconds on the backend's clock.
+        '''
+        return time.monotonic()
+
+
+    def move(self, offset):
+        raise NotImplementedError
+
+
+    def wait_move(self):
+        raise NotImplementedError
+
+
+    def set_pmfm(self, value):
+        raise NotImplementedError
+
+
+    def start_exposure(self, exptime):
+        raise NotImplementedError
+
+
+    def wait_shutter_closed(self):
+        raise NotImplementedError
+
+
+    def wait_readout(self):
+        raise NotImplementedError
+
+
+class SimulatedBackend(Backend):
+    '''A backend which models the time taken by each action, for testing and
+    for estimating the time saved by pipelining.  Each action sets a deadline
+    on a simulated clock and the wait methods advance the clock to that
+    deadline.
+
+    Attributes
+    ----------
+    move_overhead : float
+        The time (in seconds) taken by any telescope move.
+
+    move_rate : float
+        The additional time taken by a move in seconds per arcsecond moved.
+
+    pmfm_time : float
+        The time (in seconds) taken to apply a pmfm value.
+
+    readout_time : float
+        The detector readout time in seconds.
+
+    timescale : float
+        If nonzero, the wait methods also sleep for the simulated time
+        multiplied by this factor so the simulation runs in (scaled) real time.
+    '''
+    def __init__(self, move_overhead=5, move_rate=0.1, pmfm_time=2,
+                 readout_time=10, timescale=0):
+        self.move_overhead = move_overhead
+        self.move_rate = move_rate
+        self.pmfm_time = pmfm_time
+        self.readout_time = readout_time
+        self.timescale = timescale
+        self.now = 0
+        self.position = (0, 0)
+        self.move_done = 0
+        self.shutter_closed = 0
+        self.readout_done = 0
+        self.log = []
+
+
+    def time(self):
+        return self.now
+
+
+    def _wait(self, deadline):
+        if deadline > self.now:
+            if self.timescale > 0:
+                time.sleep((deadline - self.now)*self.timescale)
+            self.now = deadline
+
+
+    def move(self, offset):
+        if self.now < self.shutter_closed:
+            raise ExecutorError('Telescope moved while the shutter was open')
+        if offset.relative is True:
+            position = (self.position[0] + offset.dx_arcsec,
+                        self.position[1] + offset.dy_arcsec)
+        else:
+            position = (offset.dx_arcsec, offset.dy_arcsec)
+        distance = hypot(position[0] - self.position[0],
+                         position[1] - self.position[1])
+        self.position = position
+        self.move_done = max(self.now, self.move_done)\
+                         + self.move_overhead + distance*self.move_rate
+        self.log.append((self.now, 'move', position))
+
+
+    def wait_move(self):
+        self._wait(self.move_done)
+
+
+    def set_pmfm(self, value):
+        self.move_done = max(self.now, self.move_done) + self.pmfm_time
+        self.log.append((self.now, 'pmfm', value))
+
+
+    def start_exposure(self, exptime):
+        if self.now < self.move_done:
+            raise ExecutorError('Exposure started while the telescope moved')
+        if self.now < self.readout_done:
+            raise ExecutorError('Exposure started during readout')
+        self.shutter_closed = self.now + exptime
+        self.readout_done = self.shutter_closed + self.readout_time
+        self.log.append((self.now, 'expose', exptime))
+
+
+    def wait_shutter_closed(self):
+        self._wait(self.shutter_closed)
+
+
+    def wait_readout(self):
+        self._wait(self.readout_done)
+
+
+class KTLBackend(Backend):
+    '''A backend which uses ktl keywords.  Offsets are written to the frame's
+    X and Y keywords (see `odl.offset.keyword`) and the move is triggered by
+    the rel2curr or rel2base keyword.  The keyword names and the expressions
+    used to wait on them are parameters so that the backend can be adapted to
+    each instrument.
+
+    Attributes
+    ----------
+    instrument : str
+        The ktl service of the instrument.
+
+    dcs : str
+        The ktl service of the telescope.
+
+    exptime_keyword, start_keyword : str
+        The instrument keywords used to set the exposure time and start an
+        exposure.
+
+    shutter_keyword, shutter_closed : str
+        The instrument keyword and waitFor expression which indicate that the
+        shutter has closed.
+
+    readout_keyword, readout_done : str
+        The instrument keyword and waitFor expression which indicate that the
+        readout has finished.
+
+    move_keyword, move_done : str
+        The telescope keyword and waitFor expression which indicate that a
+        move has finished.
+
+    timeout : float
+        The timeout in seconds for each wait.
+    '''
+    def __init__(self, instrument, dcs='DCS', exptime_keyword='TTIME',
+                 start_keyword='GO', shutter_keyword='EXPOSIP',
+                 shutter_closed='== 0', readout_keyword='RDOUTIP',
+                 readout_done='== 0', move_keyword='AXESTAT',
+                 move_done='== tracking', pmfm_keyword='PMFM', timeout=300):
+        self.instrument = instrument
+        self.dcs = dcs
+        self.exptime_keyword = exptime_keyword
+        self.start_keyword = start_keyword
+        self.shutter_keyword = shutter_keyword
+        self.shutter_closed = shutter_closed
+        self.readout_keyword = readout_keyword
+        self.readout_done = readout_done
+        self.move_keyword = move_keyword
+        self.move_done = move_done
+        self.pmfm_keyword = pmfm_keyword
+        self.timeout = timeout
+
+
+    def _wait(self, service, name, expression):
+        kw = keyword(service, name)
+        if isinstance(kw, str):
+            raise ExecutorError('ktl is not available (see odl.offset.use_ktl)')
+        if kw.waitFor(expression, timeout=self.timeout) is False:
+            raise ExecutorError(f'Timed out waiting for {name} {expression}')
+
+
+    def move(self, offset):
+        x, y = to_keywords(offset.dx_arcsec, offset.dy_arcsec, offset.frame)
+        frame = offset.frame
+        if isinstance(frame.xkw, str):
+            raise ExecutorError('ktl is not available (see odl.offset.use_ktl)')
+        frame.xkw.write(x)
+        frame.ykw.write(y)
+        trigger = 'REL2CURR' if offset.relative is True else 'REL2BASE'
+        keyword(frame.service, trigger).write('t')
+
+
+    def wait_move(self):
+        self._wait(self.dcs, self.move_keyword, self.move_done)
+
+
+    def set_pmfm(self, value):
+        keyword(self.dcs, self.pmfm_keyword).write(value)
+
+
+    def start_exposure(self, exptime):
+        keyword(self.instrument, self.exptime_keyword).write(exptime)
+        keyword(self.instrument, self.start_keyword).write(1)
+
+
+    def wait_shutter_closed(self):
+        self._wait(self.instrument, self.shutter_keyword, self.shutter_closed)
+
+
+    def wait_readout(self):
+        self._wait(self.instrument, self.readout_keyword, self.readout_done)
+
+
+##-------------------------------------------------------------------------
+## PatternExecutor
+##-------------------------------------------------------------------------
+class PatternExecutor():
+    '''Run the exposures of an `OffsetPattern`.
+
+    When pipelined, the move to the next position (and its pmfm value) is
+    issued as soon as the shutter closes, so the telescope moves while the
+    detector reads out.  Otherwise each move waits for the readout to finish.
+
+    Attributes
+    ----------
+    pattern : `OffsetPattern`
+        The pattern to execute, including its repeats.
+
+    backend : a `Backend` instance
+        The interface to the telescope and instrument.
+
+    exptime : float
+        The exposure time in seconds.
+
+    nexp : int
+        The number of exposures at each position.
+
+    pipelined : bool
+        Whether to overlap telescope moves with the readout.
+
+    steps : list of dict
+        The record of each exposure, filled in by `run`.
+    '''
+    def __init__(self, pattern, backend, exptime=0, nexp=1, pipelined=True):
+        self.pattern = pattern
+        self.backend = backend
+        self.exptime = exptime
+        self.nexp = nexp
+        self.pipelined = pipelined
+        self.steps = []
+
+
+    def _sequence(self):
+        for iteration in range(self.pattern.repeat):
+            for offset in self.pattern.data:
+                for i in range(self.nexp):
+                    # Only the first exposure at a position needs a move
+                    yield iteration, offset, i == 0
+
+
+    def _move(self, offset):
+        self.backend.move(offset)
+        if offset.pmfm is not None:
+            self.backend.set_pmfm(offset.pmfm)
+
+
+    def run(self):
+        '''Execute the pattern and return the list of step records.  Each
+        record is a dict with the position name, iteration, the times at which
+        the move was issued and finished, the exposure started, the shutter
+        closed and the readout finished, and the dead time since the previous
+        shutter close.
+        '''
+        self.pattern.validate()
+        b = self.backend
+        sequence = list(self._sequence())
+        if len(sequence) == 0:
+            raise ExecutorError('The pattern has no positions')
+        self.steps = []
+        start = b.time()
+        move_issued = start
+        self._move(sequence[0][1])
+        last_closed = start
+        for n, (iteration, offset, moved) in enumerate(sequence):
+            step = {'posname': offset.posname,
+                    'iteration': iteration,
+                    'move issued': move_issued if moved else None}
+            if moved:
+                b.wait_move()
+            step['move done'] = b.time()
+            step['exposure start'] = b.time()
+            step['dead time'] = step['exposure start'] - last_closed
+            b.start_exposure(self.exptime)
+            b.wait_shutter_closed()
+            step['shutter closed'] = last_closed = b.time()
+
+            following = sequence[n+1] if n+1 < len(sequence) else None
+            if following is not None and following[2] is True:
+                if self.pipelined is False:
+                    b.wait_readout()
+                move_issued = b.time()
+                self._move(following[1])
+            b.wait_readout()
+            step['readout done'] = b.time()
+            self.steps.append(step)
+        return self.steps
+
+
+    def summary(self):
+        '''Return the total, shutter open, and dead time of the last run.
+        '''
+        if len(self.steps) == 0:
+            raise ExecutorError('The pattern has not been run')
+        total = self.steps[-1]['readout done'] - self.steps[0]['move issued']
+        return {'wall clock time': total,
+                'shutter open time': self.exptime*len(self.steps),
+                'dead time': sum([s['dead time'] for s in self.steps]),
+                'exposures': len(self.steps)}
@@ -0,0 +1,175 @@
+#!python3
+
+## Import General Tools
+import os
+import stat
+import tempfile
+from pathlib import Path
+import yaml
+
+
+# Keys which mark a document as a table of named entries
+tables = ['Targets', 'OffsetPatterns', 'DetectorConfigs', 'InstrumentConfigs']
+
+write_modes = ['w', 'a', 'update']
+
+
+##-------------------------------------------------------------------------
+## Reading
+##-------------------------------------------------------------------------
+def read_yaml(file):
+    '''Return the list of documents in a yaml formatted ODL file.  A missing
+    or empty file gives an empty list.
+    '''
+    p = Path(file).expanduser().absolute()
+    if p.exists() is False:
+        return []
+    with open(p, 'r') as FO:
+        contents = yaml.safe_load(FO)
+    if contents is None:
+        return []
+    if isinstance(contents, dict):
+        contents = [contents]
+    return contents
+
+
+def is_table(document):
+    '''Return True if every key in the document is one of the known tables.
+    '''
+    return isinstance(document, dict) and len(document) > 0\
+           and all([key in tables for key in document.keys()])
+
+
+def is_entry(document):
+    '''Return True if the document is a single named entry (for example the
+    output of `InstrumentConfig.to_dict`).
+    '''
+    return isinstance(document, dict) and 'name' in document.keys()\
+           and is_table(document) is False
+
+
+def merge(contents):
+    '''Merge the documents in a file into a single document per table.  Each
+    entry is identified by its table and name and later entries replace
+    earlier ones, keeping the position of the first.  Documents which are
+    neither tables nor named entries are kept unchanged.
+    '''
+    merged = {}
+    others = []
+    for document in contents:
+        if is_table(document):
+            for table, entries in document.items():
+                for entry in entries:
+                    name = entry.get('name', None)
+                    key = (table, name) if name is not None\
+                          else (table, len(merged))
+                    merged[key] = entry
+        elif is_entry(document):
+            merged[(None, document['name'])] = document
+        else:
+            others.append(document)
+
+    output = []
+    table_documents = {}
+    for (table, name), entry in merged.items():
+        if table is None:
+            output.append(entry)
+        else:
+            if table not in table_documents.keys():
+                table_documents[table] = {table: []}
+                output.append(table_documents[table])
+            table_documents[table][table].append(entry)
+    return output + others
+
+
+def changed(contents, existing):
+    '''Return only the documents (and table entries) in contents which are
+    not already present with identical values in the existing file contents.
+    '''
+    current = {}
+    for document in merge(existing):
+        if is_table(document):
+            for table, entries in document.items():
+                for entry in entries:
+                    current[(table, entry.get('name', None))] = entry
+        elif is_entry(document):
+            current[(None, document['name'])] = document
+
+    output = []
+    for document in contents:
+        if is_table(document):
+            new = {}
+            for table, entries in document.items():
+                entries = [e for e in entries
+                           if current.get((table, e.get('name', None))) != e]
+                if len(entries) > 0:
+                    new[table] = entries
+            if len(new) > 0:
+                output.append(new)
+        elif is_entry(document):
+            if current.get((None, document['name'])) != document:
+                output.append(document)
+        else:
+            output.append(document)
+    return output
+
+
+##-------------------------------------------------------------------------
+## Writing
+##-------------------------------------------------------------------------
+def atomic_write(file, text):
+    '''Write text to a temporary file in the same directory and rename it over
+    the destination so that a crash never leaves a partial file.
+    '''
+    p = Path(file).expanduser().absolute()
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f'.{p.name}.', suffix='.tmp')
+    try:
+        os.chmod(tmp, stat.S_IMODE(p.stat().st_mode) if p.exists() else 0o644)
+        with os.fdopen(fd, 'w') as FO:
+            FO.write(text)
+            FO.flush()
+            os.fsync(FO.fileno())
+        os.replace(tmp, p)
+    except BaseException:
+        if Path(tmp).exists(): Path(tmp).unlink()
+        raise
+
+
+def write_yaml(file, contents, mode='w'):
+    '''Write a list of documents to a yaml formatted file.
+
+    Parameters
+    ----------
+    file : str or `pathlib.Path`
+        The file to write.
+
+    contents : list
+        The documents to write (e.g. `[TargetList.to_dict()]`).
+
+    mode : str
+        'w' replaces the file.  'a' appends the documents as a new segment at
+        the end of the file.  'update' appends only the documents and table
+        entries which are new or have changed since the file was last written.
+        Use `compact` to merge the appended segments.  In every mode the
+        existing contents are read and the whole file is rewritten atomically,
+        so any file which `read_yaml` accepts can be appended to.
+    '''
+    if mode not in write_modes:
+        raise ValueError(f'Write mode "{mode}" is not one of {write_modes}')
+    p = Path(file).expanduser().absolute()
+    existing = [] if mode == 'w' else read_yaml(p)
+    if mode == 'update':
+        contents = changed(contents, existing)
+        if len(contents) == 0 and p.exists():
+            return
+    atomic_write(p, yaml.dump(existing + list(contents)))
+
+
+def compact(file):
+    '''Merge the segments appended to a file into a single document per table
+    (see `merge`) and atomically rewrite the file.
+    '''
+    p = Path(file).expanduser().absolute()
+    if p.exists() is False:
+        raise FileNotFoundError(p)
+    atomic_write(p, yaml.dump(merge(read_yaml(p))))
@@ -0,0 +1,142 @@
+#!python3
+
+## Import General Tools
+from functools import lru_cache
+import numpy as np
+from astropy import units as u
+
+from .offset import (OffsetError, OffsetPattern, SkyFrame, InstrumentFrame,
+                     get_frame)
+
+sky = get_frame('SkyFrame')
+
+
+# Offsets in every frame are in arcseconds along the frame's X and Y axes (or
+# in pixels when pixels=True, using the frame's scale).  Sky offsets are East
+# (RAOFF) and North (DECOFF).  An InstrumentFrame is rotated counterclockwise
+# (from East towards North) relative to the sky by the target position angle
+# (PA) plus the frame's offsetangle.  The 2x2 matrices are cached per frame
+# angle and scale, so converting a whole OffsetArray is one matrix product.
+
+
+def _degrees(angle):
+    if isinstance(angle, u.Quantity):
+        return float(angle.to_value(u.degree))
+    return float(angle)
+
+
+def frame_angle(frame, PA=0):
+    '''Return the angle (in degrees) of the frame's X axis counterclockwise
+    from East for a target at the given position angle.
+    '''
+    if isinstance(frame, InstrumentFrame):
+        return _degrees(PA) + _degrees(frame.offsetangle)
+    if isinstance(frame, SkyFrame):
+        return 0.
+    raise OffsetError(f'No transform is defined for frame "{frame}"')
+
+
+def pixel_scale(frame):
+    '''Return the frame scale in arcseconds per pixel.
+    '''
+    try:
+        return float(frame.scale.to_value(u.arcsec/u.pixel))
+    except (AttributeError, u.UnitConversionError):
+        raise OffsetError(f'Frame "{frame.name}" has no pixel scale')
+
+
+@lru_cache(maxsize=1024)
+def _rotation_matrix(angle, scale):
+    theta = np.radians(angle)
+    matrix = scale * np.array([[np.cos(theta), -np.sin(theta)],
+                               [np.sin(theta), np.cos(theta)]])
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=1024)
+def _conversion_matrix(from_key, to_key):
+    matrix = np.linalg.inv(_rotation_matrix(*to_key))\
+             @ _rotation_matrix(*from_key)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _key(frame, PA, pixels):
+    scale = pixel_scale(frame) if pixels is True else 1.
+    return (frame_angle(frame, PA), scale)
+
+
+def to_sky_matrix(frame, PA=0, pixels=False):
+    '''Return the (cached, read only) 2x2 matrix which takes (dx, dy) in the
+    frame to (East, North) offsets in arcseconds.
+    '''
+    return _rotation_matrix(*_key(frame, PA, pixels))
+
+
+def conversion_matrix(from_frame, to_frame, PA=0, from_pixels=False,
+                      to_pixels=False):
+    '''Return the (cached, read only) 2x2 matrix which takes (dx, dy) in
+    from_frame to (dx, dy) in to_frame.
+    '''
+    return _conversion_matrix(_key(from_frame, PA, from_pixels),
+                              _key(to_frame, PA, to_pixels))
+
+
+def clear_cache():
+    '''Clear the cached matrices.
+    '''
+    _rotation_matrix.cache_clear()
+    _conversion_matrix.cache_clear()
+
+
+##-------------------------------------------------------------------------
+## Transforms
+##-------------------------------------------------------------------------
+def transform(dx, dy, from_frame, to_frame, PA=0, from_pixels=False,
+              to_pixels=False):
+    '''Convert offsets (scalars or arrays) from one frame to another.
+    Returns a tuple of (dx, dy) numpy arrays.
+    '''
+    matrix = conversion_matrix(from_frame, to_frame, PA=PA,
+                               from_pixels=from_pixels, to_pixels=to_pixels)
+    dx, dy = matrix @ np.vstack([np.ravel(dx), np.ravel(dy)]).astype(float)
+    return dx, dy
+
+
+def to_sky(dx, dy, frame, PA=0, pixels=False):
+    '''Convert offsets in the given frame to East and North offsets in
+    arcseconds.
+    '''
+    return transform(dx, dy, frame, sky, PA=PA, from_pixels=pixels)
+
+
+def from_sky(east, north, frame, PA=0, pixels=False):
+    '''Convert East and North offsets in arcseconds to offsets in the given
+    frame.
+    '''
+    return transform(east, north, sky, frame, PA=PA, to_pixels=pixels)
+
+
+def convert(offsets, frame, PA=0):
+    '''Return a copy of an `OffsetArray` or `OffsetPattern` with its offsets
+    expressed in a different frame.  Rotations (dr) and the other columns are
+    unchanged.
+    '''
+    if isinstance(offsets, OffsetPattern):
+        return convert(offsets.to_array(), frame, PA=PA).to_pattern()
+    dx, dy = transform(offsets.dx, offsets.dy, offsets.frame, frame, PA=PA)
+    return offsets._new(dx=dx, dy=dy, frame=frame)
+
+
+def to_keywords(dx, dy, frame):
+    '''Return the values to write to the frame's X and Y keywords for an
+    offset of (dx, dy) in the frame.  For an `InstrumentFrame` the keywords
+    are in the INSTANGL system, so the offsetangle is applied here and the PA
+    is applied by DCS.
+    '''
+    if isinstance(frame, InstrumentFrame) is False:
+        return dx, dy
+    theta = np.radians(_degrees(frame.offsetangle))
+    return (float(np.cos(theta)*dx - np.sin(theta)*dy),
+            float(np.sin(theta)*dx + np.cos(theta)*dy))
@@ -0,0 +1,73 @@
+#!python3
+
+## Import General Tools
+import json
+import hashlib
+
+
+##-------------------------------------------------------------------------
+## Content Hashes
+##-------------------------------------------------------------------------
+def canonical(d):
+    '''Return a canonical string for a dict such as the output of `to_dict`:
+    JSON with sorted keys and no whitespace.  Values which JSON can not encode
+    are converted with `str`.
+    '''
+    return json.dumps(d, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def content_hash(d):
+    '''Return the SHA-256 hex digest of the canonical form of a dict.  This is
+    stable between sessions and machines, unlike the built in `hash`.
+    '''
+    return hashlib.sha256(canonical(d).encode()).hexdigest()
+
+
+def _encode(value):
+    to_dict = getattr(value, 'to_dict', None)
+    return to_dict() if callable(to_dict) else str(value)
+
+
+def state_key(obj):
+    '''Return a canonical string of the attributes of an object for use as a
+    cache key.  Nothing is converted or validated (unlike `to_dict`), so it is
+    cheap, and it follows every in-place change including those to nested
+    lists and dicts.  Attributes which are objects are encoded by their
+    `to_dict` (or `str`).  Private attributes and those listed in the
+    object's _state_exclude (values derived from the others) are skipped.
+    '''
+    if obj is None:
+        return None
+    exclude = getattr(obj, '_state_exclude', ())
+    return json.dumps({k: v for k, v in vars(obj).items()
+                       if k[0] != '_' and k not in exclude},
+                      sort_keys=True, separators=(',', ':'), default=_encode)
+
+
+##-------------------------------------------------------------------------
+## InternPool
+##-------------------------------------------------------------------------
+class InternPool():
+    '''A pool which holds one object per distinct value.  Objects which
+    compare equal (for example two configs with the same `to_dict` content)
+    are replaced by the first such object added, so large collections share a
+    single instance of each value.
+
+    Interned objects should be treated as immutable, since changing one
+    changes it everywhere it is shared.
+    '''
+    def __init__(self):
+        self.pool = {}
+
+
+    def intern(self, obj):
+        '''Return the pooled object equal to obj, adding obj if it is new.
+        None is returned unchanged.
+        '''
+        if obj is None:
+            return None
+        return self.pool.setdefault(obj, obj)
+
+
+    def __len__(self):
+        return len(self.pool)
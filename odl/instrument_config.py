@@ -2,11 +2,16 @@
 
 ## Import General Tools
 import re
-from pathlib import Path
+import copy
+import importlib
+import inspect
 from astropy import units as u
 from astropy.io import fits
 import yaml
 
+from .fileio import write_yaml
+from .hashing import content_hash, canonical
+
 
 class InstrumentConfigError(Exception): pass
 
@@ -34,7 +39,13 @@ class InstrumentConfig():
     `[Instrument]` is the name of the instrument (in the instrument's chosen
     case).  For example: `odl.kcwi.KCWIConfig` or
     `odl.mosfire.MOSFIREConfig`.
+
+    Sub-classes may set cal_fields to the names of the attributes which
+    determine the calibrations a configuration needs (see
+    `odl.calibration.cal_key`).
     '''
+    cal_fields = None
+
     def __init__(self, name='GenericInstrumentConfig'):
         self.name = name
         # Determine instrument from class name.  This is needed so the class
@@ -66,6 +77,32 @@ class InstrumentConfig():
                 }
 
 
+    def content_hash(self):
+        '''Return the content hash of `to_dict` (see `odl.hashing`).
+        '''
+        return content_hash(self.to_dict())
+
+
+    @classmethod
+    def from_dict(cls, input):
+        '''Return an instrument config built from the output of `to_dict`.
+        When called on `InstrumentConfig` itself, the sub-class is found from
+        the instrument name using the naming convention described above.
+        '''
+        if cls is InstrumentConfig:
+            instrument = input.get('instrument')
+            if instrument is None:
+                raise InstrumentConfigError('No instrument given for config')
+            package = importlib.import_module(f'odl.{instrument.lower()}')
+            cls = getattr(package, f'{instrument}Config')
+        params = inspect.signature(cls.__init__).parameters
+        ic = cls(**{k: v for k,v in input.items() if k in params})
+        # Restore values (such as the name) which the constructor derives
+        for key, value in input.items():
+            setattr(ic, key, value)
+        return ic
+
+
     def to_yaml(self):
         '''Return string corresponding to a Detector Config Description
         Language (DCDL) yaml entry.
@@ -77,12 +114,51 @@ class InstrumentConfig():
         return {'InstrumentConfigs': [self.to_dict()]}
 
 
-    def write(self, file):
+    def write(self, file, mode='w'):
+        '''Write the config to a yaml formatted file.  See `odl.fileio.write_yaml`
+        for the write modes ('w', 'a', or 'update').
+        '''
         self.validate()
-        p = Path(file).expanduser().absolute()
-        if p.exists(): p.unlink()
-        with open(p, 'w') as FO:
-            FO.write(yaml.dump([self.to_dict()]))
+        write_yaml(file, [self.to_dict()], mode=mode)
+
+
+    def evolve(self, name=None, suffix='', **changes):
+        '''Return a new config with the given attributes changed.  This is a
+        shallow copy, so the unchanged values are shared with this config
+        rather than copied.  The name is set once, either to the given name or
+        to this config's name plus the suffix.  For example:
+
+            ic.evolve(suffix=' arclamp=FEAR', arclamp='FEAR')
+        '''
+        new = copy.copy(self)
+        new.__dict__.pop('_canonical', None)
+        new.__dict__.update(changes)
+        new.__dict__['name'] = self.name + suffix if name is None else name
+        return new
+
+
+    def __setattr__(self, name, value):
+        # Any change invalidates the cached canonical form
+        self.__dict__.pop('_canonical', None)
+        object.__setattr__(self, name, value)
+
+
+    def _value(self):
+        if '_canonical' not in self.__dict__:
+            self.__dict__['_canonical'] = canonical(self.to_dict())
+        return self.__dict__['_canonical']
+
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._value() == other._value()
+
+
+    def __hash__(self):
+        return hash(self._value())
 
 
     def arcs(self, lampname):
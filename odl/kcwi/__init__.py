@@ -1,7 +1,9 @@
 from astropy import units as u
 
 from ..block import FocusBlock
-from ..offset import InstrumentFrame, pmfm
+from ..offset import InstrumentFrame, OffsetError, pmfm
+from ..patterns import mosaic
+from ..overheads import OverheadModel, register
 
 from .config import KCWIConfig
 from .detector import (KCWIblueDetectorConfig, KCWIredDetectorConfig,
@@ -14,11 +16,39 @@ from .detector import (KCWIblueDetectorConfig, KCWIredDetectorConfig,
 bluedetector = InstrumentFrame(name='Blue Detector',
                                scale=0.147*u.arcsec/u.pixel)
 smallslicer = InstrumentFrame(name='SmallSlicer',
-                              scale=0.35*u.arcsec/u.pixel)
+                              scale=0.35*u.arcsec/u.pixel,
+                              fov=(8.4*u.arcsec, 20.4*u.arcsec))
 mediumslicer = InstrumentFrame(name='MediumSlicer',
-                               scale=0.70*u.arcsec/u.pixel)
+                               scale=0.70*u.arcsec/u.pixel,
+                               fov=(16.5*u.arcsec, 20.4*u.arcsec))
 largeslicer = InstrumentFrame(name='LargeSlicer',
-                              scale=1.35*u.arcsec/u.pixel)
+                              scale=1.35*u.arcsec/u.pixel,
+                              fov=(33*u.arcsec, 20.4*u.arcsec))
+slicers = {'Small': smallslicer, 'Medium': mediumslicer, 'Large': largeslicer}
+
+
+##-------------------------------------------------------------------------
+## KCWI Overheads
+##-------------------------------------------------------------------------
+register(OverheadModel(instrument='KCWI', slew=180, acquisition=240,
+                       reconfiguration=120, settle=15, offset_rate=0.05,
+                       alignment={'GuiderAlign': 60,
+                                  'GuiderAlign faint': 240}))
+
+
+##-------------------------------------------------------------------------
+## Pre-Defined Patterns
+##-------------------------------------------------------------------------
+def slicer_mosaic(slicer='Large', nx=2, ny=2, overlap=0.1, guide=True,
+                  repeat=1):
+    '''Return an nx by ny mosaic of the field of view of the given slicer
+    (Small, Medium, or Large) with the given fractional overlap.  This is an
+    `OffsetArray`; use `to_pattern` to get an `OffsetPattern`.
+    '''
+    if slicer not in slicers.keys():
+        raise OffsetError(f'Slicer "{slicer}" is not one of {list(slicers.keys())}')
+    return mosaic(nx=nx, ny=ny, frame=slicers[slicer], overlap=overlap,
+                  guide=guide, repeat=repeat)
 
 
 ##-------------------------------------------------------------------------
@@ -4,7 +4,6 @@
 from pathlib import Path
 import re
 from warnings import warn
-from copy import deepcopy
 import yaml
 from astropy import units as u
 
@@ -27,6 +26,12 @@ lamp_exptimes = {'FEAR': 30, 'THAR': 45, 'CONT': 6}
 class KCWIConfig(InstrumentConfig):
     '''An object to hold information about KCWI Blue+Red configuration.
     '''
+    cal_fields = ('slicer', 'polarizer',
+                  'bluegrating', 'bluefilter', 'bluecwave', 'bluepwave',
+                  'bluenandsmask', 'bluefocus',
+                  'redgrating', 'redfilter', 'redcwave', 'redpwave',
+                  'rednandsmask', 'redfocus')
+
     def __init__(self, name=None, slicer='medium', 
                  bluegrating='BH3', bluefilter='KBlue',
                  bluecwave=4800, bluepwave=None,
@@ -117,11 +122,8 @@ class KCWIConfig(InstrumentConfig):
     def contbars(self):
         '''
         '''
-        ic_for_contbars = deepcopy(self)
-        ic_for_contbars.calobj = 'MedBarsA'
-        ic_for_contbars.arclamp = 'CONT'
-        ic_for_contbars.name += f' arclamp={ic_for_contbars.arclamp}'
-        ic_for_contbars.name += f' calobj={ic_for_contbars.calobj}'
+        ic_for_contbars = self.evolve(suffix=' arclamp=CONT calobj=MedBarsA',
+                                      calobj='MedBarsA', arclamp='CONT')
         exptime = lamp_exptimes[ic_for_contbars.arclamp]
         dc_for_contbars = KCWIblueDetectorConfig(exptime=exptime)
         contbars = CalibrationBlock(target=None,
@@ -135,11 +137,8 @@ class KCWIConfig(InstrumentConfig):
     def arcs(self, lampname):
         '''
         '''
-        ic_for_arcs = deepcopy(self)
-        ic_for_arcs.arclamp = lampname
-        ic_for_arcs.calobj = 'FlatA'
-        ic_for_arcs.name += f' arclamp={ic_for_arcs.arclamp}'
-        ic_for_arcs.name += f' calobj={ic_for_arcs.calobj}'
+        ic_for_arcs = self.evolve(suffix=f' arclamp={lampname} calobj=FlatA',
+                                  arclamp=lampname, calobj='FlatA')
         dc_for_arcs = KCWIblueDetectorConfig(exptime=lamp_exptimes[lampname])
         arcs = CalibrationBlock(target=None,
                               pattern=Stare(repeat=1),
@@ -152,9 +151,8 @@ class KCWIConfig(InstrumentConfig):
     def domeflats(self, off=False):
         '''
         '''
-        ic_for_domeflats = deepcopy(self)
-        ic_for_domeflats.domeflatlamp = not off
-        ic_for_domeflats.name += f' domeflatlamp={not off}'
+        ic_for_domeflats = self.evolve(suffix=f' domeflatlamp={not off}',
+                                       domeflatlamp=not off)
         dc_for_domeflats = KCWIblueDetectorConfig(exptime=100)
         domeflats = CalibrationBlock(target=DomeFlats(),
                                    pattern=Stare(repeat=3),
@@ -167,8 +165,7 @@ class KCWIConfig(InstrumentConfig):
     def bias(self):
         '''
         '''
-        ic_for_bias = deepcopy(self)
-        ic_for_bias.name += f' bias'
+        ic_for_bias = self.evolve(suffix=' bias')
         dc_for_bias = KCWIblueDetectorConfig(exptime=0, dark=True)
         bias = CalibrationBlock(target=None,
                               pattern=Stare(repeat=7),
@@ -6,6 +6,36 @@ from warnings import warn
 from copy import deepcopy
 
 from ..detector_config import VisibleDetectorConfig
+from ..readout import ReadoutTable
+
+
+##-------------------------------------------------------------------------
+## Readout Times
+##-------------------------------------------------------------------------
+# ampmode values (kbds AMPMODE) and the amplifier configuration they use
+ampmodes = {0: 'quad', 1: 'single', 2: 'single', 3: 'single', 4: 'single',
+            5: 'single', 6: 'single', 7: 'single', 8: 'single', 9: 'dual',
+            10: 'dual'}
+
+# Full frame readout times in seconds by CCDMODE (0 slow/1 fast), amplifier
+# configuration, and binning.
+# Single amp slow read, 1x1 [2x2] 337 [106] s
+# Dual amp slow read, 1x1 [2x2]   170 [53] s
+# Quad amp slow read, 1x1 [2x2]   85 [27] s  DO NOT USE!
+# Single amp fast read, 1x1 [2x2] 75 [25] s
+# Dual amp fast read,1x1 [2x2]    38 [13] s
+# Quad amp fast read, 1x1 [2x2]   19 [7] s   NOT RECOMMENDED
+blue_times = {0: {'single': {'1x1': 337, '2x2': 106},
+                  'dual': {'1x1': 170, '2x2': 53},
+                  'quad': {'1x1': 85, '2x2': 27}},
+              1: {'single': {'1x1': 75, '2x2': 25},
+                  'dual': {'1x1': 38, '2x2': 13},
+                  'quad': {'1x1': 19, '2x2': 7}}}
+blue_readout = ReadoutTable(blue_times, ampmodes=ampmodes, nrows=4096)
+
+# There are no measured readout times for the red detector or the FPC yet, so
+# their classes have no readout table and their readout time is taken as 0
+# with a DetectorConfigWarning (see `VisibleDetectorConfig.readout_time`).
 
 
 ##-------------------------------------------------------------------------
@@ -19,8 +49,10 @@ class KCWIblueDetectorConfig(VisibleDetectorConfig):
     kbds keywords:
     CCDMODE      CCD mode (0 slow/1 fast)
 
-    For ampmode
+    For ampmode see the ampmodes table above.
     '''
+    readout_table = blue_readout
+
     def __init__(self, name=None, exptime=None, nexp=1, readoutmode=0,
                  ampmode=9, dark=False, binning='1x1', window=None, gain=10):
         super().__init__(name=name, instrument='KCWI', detector='blue', 
@@ -53,30 +85,6 @@ class KCWIblueDetectorConfig(VisibleDetectorConfig):
         return 0
 
 
-    def readout_time(self):
-        '''
-        Single amp slow read, 1x1 [2x2] 337 [106] s
-        Dual amp slow read, 1x1 [2x2]   170 [53] s
-        Quad amp slow read, 1x1 [2x2]   85 [27] s  DO NOT USE!
-        Single amp fast read, 1x1 [2x2] 75 [25] s
-        Dual amp fast read,1x1 [2x2]    38 [13] s
-        Quad amp fast read, 1x1 [2x2]   19 [7] s   NOT RECOMMENDED
-        '''
-        rspeed = {0: 'slow', 1: 'fast'}[self.readoutmode]
-        namps_full = {0 : 'quad (ALL)', 1 : 'single C', 2 : 'single E',
-                      3 : 'single D', 4 : 'single F', 5 : 'single B',
-                      6 : 'single G', 7 : 'single A', 8 : 'single H',
-                      9 : 'dual (A&B)', 10 : 'dual (C&D)'}[self.ampmode]
-        namps_str = namps_full.split()[0]
-        read_times = {'slow':{'single': {'1x1': 337, '2x2': 106},
-                              'dual': {'1x1': 170, '2x2': 53},
-                              'quad': {'1x1': 85, '2x2': 27} },
-                      'fast':{'single': {'1x1': 75, '2x2': 25},
-                              'dual': {'1x1': 38, '2x2': 13},
-                              'quad': {'1x1': 19, '2x2': 7} } }
-        return read_times[rspeed][namps_str][self.binning]
-
-
     def other_overhead(self):
         return 0
 
@@ -89,6 +97,8 @@ class KCWIredDetectorConfig(VisibleDetectorConfig):
     
     readoutmode corresponds to the KCWI config keyword ccdmoder
     '''
+    readout_table = None
+
     def __init__(self, name=None, exptime=None, nexp=1, readoutmode=0,
                  ampmode=9, dark=False, binning='1x1', window=None, gain=10):
         super().__init__(name=name, instrument='KCWI', detector='red', 
@@ -125,6 +135,8 @@ class KCWIFPCDetectorConfig(VisibleDetectorConfig):
     
     readoutmode corresponds to the KCWI config keyword ccdmoder
     '''
+    readout_table = None
+
     def __init__(self, name=None, exptime=None, nexp=1, readoutmode=0,
                  ampmode=9, dark=False, binning='1x1', window=None, gain=10):
         super().__init__(name=name, instrument='KCWI', detector='FPC', 
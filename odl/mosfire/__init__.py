@@ -3,6 +3,7 @@ from astropy import units as u
 from ..block import FocusBlock
 from ..offset import InstrumentFrame, TelescopeOffset, OffsetPattern, pmfm
 from ..alignment import MaskAlign
+from ..overheads import OverheadModel, register
 
 from .config import MOSFIREConfig
 from .detector import MOSFIREDetectorConfig, default_acq, bright_acq
@@ -12,12 +13,23 @@ from .detector import MOSFIREDetectorConfig, default_acq, bright_acq
 ## MOSFIRE Frames
 ##-------------------------------------------------------------------------
 detector = InstrumentFrame(name='MOSFIRE Detector',
-                           scale=0.1798*u.arcsec/u.pixel)
+                           scale=0.1798*u.arcsec/u.pixel,
+                           fov=(6.12*u.arcmin, 6.12*u.arcmin))
 slit = InstrumentFrame(name='MOSFIRE Slit',
                        scale=0.1798*u.arcsec/u.pixel,
                        offsetangle=0*u.deg) # Note this offset angle is wrong
 
 
+##-------------------------------------------------------------------------
+## MOSFIRE Overheads
+##-------------------------------------------------------------------------
+register(OverheadModel(instrument='MOSFIRE', slew=180, acquisition=180,
+                       reconfiguration=180, settle=10, offset_rate=0.05,
+                       alignment={'MaskAlign': 420, 'MaskAlign takesky': 600},
+                       alignment_exposures={'MaskAlign': 3,
+                                            'MaskAlign takesky': 6}))
+
+
 ##-------------------------------------------------------------------------
 ## Pre-Defined Patterns
 ##-------------------------------------------------------------------------
@@ -4,7 +4,6 @@
 from pathlib import Path
 import re
 from warnings import warn
-from copy import deepcopy
 from astropy import units as u
 
 
@@ -27,6 +26,8 @@ exptime_for_domeflats = {'Y': 17, 'J': 11, 'H': 11, 'K': 11}
 class MOSFIREConfig(InstrumentConfig):
     '''An object to hold information about MOSFIRE configuration.
     '''
+    cal_fields = ('mode', 'filter', 'mask')
+
     def __init__(self, mode='spectroscopy', filter='Y',
                  mask=None, alignmask=False, miramask=False):
         super().__init__()
@@ -75,9 +76,8 @@ class MOSFIREConfig(InstrumentConfig):
     def arcs(self, lampname):
         '''
         '''
-        ic_for_arcs = deepcopy(self)
-        ic_for_arcs.arclamp = lampname
-        ic_for_arcs.name += f' arclamp={ic_for_arcs.arclamp}'
+        ic_for_arcs = self.evolve(suffix=f' arclamp={lampname}',
+                                  arclamp=lampname)
         dc_for_arcs = MOSFIREDetectorConfig(exptime=1, readoutmode='CDS')
         arcs = CalibrationBlock(target=None,
                               pattern=Stare(repeat=2),
@@ -90,10 +90,9 @@ class MOSFIREConfig(InstrumentConfig):
     def domeflats(self, off=False):
         '''
         '''
-        ic_for_domeflats = deepcopy(self)
-        ic_for_domeflats.domeflatlamp = not off
         lamp_str = {False: 'on', True: 'off'}[off]
-        ic_for_domeflats.name += f' domelamp={lamp_str}'
+        ic_for_domeflats = self.evolve(suffix=f' domelamp={lamp_str}',
+                                       domeflatlamp=not off)
         exptime = exptime_for_domeflats[self.filter]
         dc_for_domeflats = MOSFIREDetectorConfig(exptime=exptime,
                                                  readoutmode='CDS')
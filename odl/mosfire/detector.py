@@ -1,11 +1,10 @@
 #!python3
 
 ## Import General Tools
-import re
 from warnings import warn
 from copy import deepcopy
 
-from ..detector_config import IRDetectorConfig
+from ..detector_config import IRDetectorConfig, ir_readout_table
 
 
 ##-------------------------------------------------------------------------
@@ -13,31 +12,15 @@ from ..detector_config import IRDetectorConfig
 ##-------------------------------------------------------------------------
 class MOSFIREDetectorConfig(IRDetectorConfig):
     '''An object to hold information about MOSFIRE detector configuration.
+    The readout modes are CDS and MCDSn where n is 1-16.
     '''
-    def __init__(self, exptime=None, readoutmode='CDS', coadds=1):
-        super().__init__(instrument='MOSFIRE', exptime=exptime,
-                         readoutmode=readoutmode, coadds=coadds)
-
+    readout_table = ir_readout_table(1.45, 16)
+    reset_time = 1.45
+    exposure_overhead = 4
 
-    ##-------------------------------------------------------------------------
-    ## Validate
-    def validate(self):
-        '''Check values and verify that they meet assumptions.
-        
-        Check:
-        - readoutmode is either CDS or MCDSn where n is 1-16.
-        
-        Warn:
-        '''
-        parse_readoutmode = re.match('(M?)CDS(\d*)', self.readoutmode)
-        if parse_readoutmode is None:
-            raise DetectorConfigError(f'Readout Mode "{self.readoutmode}" '
-                                      f'is not CDS or MCDSn')
-        else:
-            nreads = int(parse_readoutmode.group(2))
-            if nreads > 16:
-                raise DetectorConfigError(f'MCDS{nreads} not supported '
-                                          f'(only 1-16 are supported)')
+    def __init__(self, exptime=None, readoutmode='CDS', coadds=1, nexp=1):
+        super().__init__(instrument='MOSFIRE', exptime=exptime, nexp=nexp,
+                         readoutmode=readoutmode, coadds=coadds)
 
 
 ##-------------------------------------------------------------------------
@@ -2,6 +2,7 @@ from astropy import units as u
 
 from ..block import FocusBlock
 from ..offset import InstrumentFrame, TelescopeOffset, OffsetPattern, pmfm
+from ..overheads import OverheadModel, register
 
 from .config import NIRESConfig
 from .detector import NIRESScamDetectorConfig, NIRESSpecDetectorConfig
@@ -17,6 +18,15 @@ slit = InstrumentFrame(name='NIRES Slit',
                        offsetangle=0*u.deg) # Note this offset angle is wrong
 
 
+##-------------------------------------------------------------------------
+## NIRES Overheads
+##-------------------------------------------------------------------------
+register(OverheadModel(instrument='NIRES', slew=180, acquisition=180,
+                       reconfiguration=0, settle=10, offset_rate=0.05,
+                       alignment={'GuiderAlign': 120,
+                                  'GuiderAlign faint': 300}))
+
+
 ##-------------------------------------------------------------------------
 ## Pre-Defined Patterns
 ##-------------------------------------------------------------------------
@@ -4,7 +4,6 @@
 from pathlib import Path
 import re
 from warnings import warn
-from copy import deepcopy
 from astropy import units as u
 
 
@@ -27,6 +26,8 @@ lamp_exptimes = {'arcs': 120, 'domeflats': 100}
 class NIRESConfig(InstrumentConfig):
     '''An object to hold information about NIRES configuration.
     '''
+    cal_fields = ()
+
     def __init__(self, detconfig=None):
         super().__init__()
         self.name = 'NIRES Instrument Config'
@@ -46,9 +47,7 @@ class NIRESConfig(InstrumentConfig):
     def arcs(self):
         '''
         '''
-        ic_for_arcs = deepcopy(self)
-        ic_for_arcs.domeflatlamp = 'niresarcs'
-        ic_for_arcs.name += f' arclamp'
+        ic_for_arcs = self.evolve(suffix=' arclamp', domeflatlamp='niresarcs')
         exptime = lamp_exptimes['arcs']
         dc_for_arcs = NIRESSpecDetectorConfig(exptime=exptime,
                                               readoutmode='CDS')
@@ -63,10 +62,9 @@ class NIRESConfig(InstrumentConfig):
     def domeflats(self, off=False):
         '''
         '''
-        ic_for_domeflats = deepcopy(self)
-        ic_for_domeflats.domeflatlamp = not off
         lamp_str = {False: 'on', True: 'off'}[off]
-        ic_for_domeflats.name += f' domelamp={lamp_str}'
+        ic_for_domeflats = self.evolve(suffix=f' domelamp={lamp_str}',
+                                       domeflatlamp=not off)
         dc_for_domeflats = NIRESSpecDetectorConfig(exptime=100, 
                                            readoutmode='CDS')
         domeflats = CalibrationBlock(target=DomeFlats(),
@@ -1,11 +1,10 @@
 #!python3
 
 ## Import General Tools
-import re
 from warnings import warn
 from copy import deepcopy
 
-from ..detector_config import IRDetectorConfig
+from ..detector_config import IRDetectorConfig, ir_readout_table
 
 
 ##-------------------------------------------------------------------------
@@ -13,7 +12,12 @@ from ..detector_config import IRDetectorConfig
 ##-------------------------------------------------------------------------
 class NIRESSpecDetectorConfig(IRDetectorConfig):
     '''An object to hold information about NIRES detector configuration.
+    The readout modes are CDS and MCDSn where n is 1-32.
     '''
+    readout_table = ir_readout_table(1.47, 32)
+    reset_time = 1.47
+    exposure_overhead = 3
+
     def __init__(self, exptime=None, readoutmode='CDS', coadds=1, nexp=1):
         super().__init__(exptime=exptime, nexp=nexp, readoutmode=readoutmode,
                          coadds=coadds)
@@ -21,56 +25,16 @@ class NIRESSpecDetectorConfig(IRDetectorConfig):
         self.set_name()
 
 
-    ##-------------------------------------------------------------------------
-    ## Validate
-    def validate(self):
-        '''Check values and verify that they meet assumptions.
-        
-        Check:
-        - readoutmode is either CDS or MCDSn where n is 1-32.
-        
-        Warn:
-        '''
-        parse_readmode = re.match('(M?)CDS(\d*)', self.readoutmode)
-        if parse_readmode is None:
-            raise DetectorConfigError(f'Readout Mode "{self.readoutmode}" '
-                                      f'is not CDS or MCDSn')
-        else:
-            nreads = int(parse_readmode.group(2))
-            if nreads > 32:
-                raise DetectorConfigError(f'MCDS{nreads} not supported '
-                                          f'(only 1-32 are supported)')
-
-
 class NIRESScamDetectorConfig(IRDetectorConfig):
     '''An object to hold information about NIRES detector configuration.
+    The readout modes are CDS and MCDSn where n is 1-32.
     '''
+    readout_table = ir_readout_table(0.37, 32)
+    reset_time = 0.37
+    exposure_overhead = 2
+
     def __init__(self, exptime=None, readoutmode='CDS', coadds=1, nexp=1):
         super().__init__(exptime=exptime, nexp=nexp, readoutmode=readoutmode,
                          coadds=coadds)
         self.instrument = 'NIRES SCAM'
         self.set_name()
-
-
-    ##-------------------------------------------------------------------------
-    ## Validate
-    def validate(self):
-        '''Check values and verify that they meet assumptions.
-        
-        Check:
-        - readoutmode is either CDS or MCDSn where n is 1-32.
-        
-        Warn:
-        '''
-        parse_readmode = re.match('(M?)CDS(\d*)', self.readoutmode)
-        if parse_readmode is None:
-            raise DetectorConfigError(f'Readout Mode "{self.readoutmode}" '
-                                      f'is not CDS or MCDSn')
-        if parse_readmode.group(1) == '' and parse_readmode.group(2) == '':
-            pass
-        else:
-            nreads = int(parse_readmode.group(2))
-            if nreads > 32:
-                raise DetectorConfigError(f'MCDS{nreads} not supported '
-                                          f'(only 1-32 are supported)')
-
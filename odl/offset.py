@@ -5,10 +5,15 @@ import sys
 from pathlib import Path
 from astropy import units as u
 from astropy.io import fits
-from collections import UserList
+from collections import UserList, namedtuple
+from math import hypot
+import numpy as np
 from warnings import warn
 import yaml
 
+from .fileio import write_yaml, merge
+from .hashing import content_hash, canonical
+
 try:
     import ktl
 except ModuleNotFoundError:
@@ -21,6 +26,40 @@ class OffsetError(Exception): pass
 class OffsetWarning(UserWarning): pass
 
 
+# Shared frame instances by name.  InstrumentFrames are added as the
+# instrument packages are imported and generic frames on first use.
+frames = {}
+
+# Keyword handles by (service, keyword), acquired on first use
+keywords = {}
+
+# An absolute position yielded by OffsetPattern.expand
+Position = namedtuple('Position', ['dx', 'dy', 'dr', 'guide', 'posname',
+                                   'iteration'])
+
+
+def use_ktl(module):
+    '''Set the module used to acquire keyword handles (for example
+    `odl.simktl` for testing, or None to use plain keyword names) and discard
+    any handles acquired so far.
+    '''
+    global ktl
+    ktl = module
+    keywords.clear()
+
+
+def keyword(service, name):
+    '''Return the keyword handle for service and name.  The handle is
+    acquired from ktl once and reused by every frame.  If ktl is not available
+    the keyword name is returned.
+    '''
+    key = (service, name)
+    if key not in keywords.keys():
+        if ktl is None or service is None:
+            return name
+        keywords[key] = ktl.cache(keyword=name, service=service)
+    return keywords[key]
+
 
 ##-------------------------------------------------------------------------
 ## OffsetFrame
@@ -29,7 +68,11 @@ class OffsetFrame():
     '''An OffsetFrame is the coordinate frame in which the offset is done.  It
     usually corresponds to a focal plane.  This class is abstract and is meant
     to be subclassed.
-    
+
+    Frames are immutable once created and are shared by all of the offsets
+    which use them (see `get_frame`).  A frame pickles as a reference to the
+    shared instance of the same name.
+
     Attributes
     ----------
     xkw : str or ktl.Keyword instance
@@ -40,16 +83,63 @@ class OffsetFrame():
     '''
     def __init__(self, name='GenericFrame'):
         self.name = name
-        self.xkw = '?'
-        self.ykw = '?'
+        self.service = None
+        self.xkw_name = '?'
+        self.ykw_name = '?'
+
+
+    def connect(self, service, xkw, ykw):
+        '''Set the service and X and Y keyword names for this frame.  The
+        keyword handles are acquired when first used.
+        '''
+        self.service = service
+        self.xkw_name = xkw
+        self.ykw_name = ykw
+
+
+    def freeze(self):
+        object.__setattr__(self, '_frozen', True)
+
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False) is True:
+            raise OffsetError(f'{self.name} is immutable')
+        object.__setattr__(self, name, value)
+
+
+    @property
+    def xkw(self):
+        return keyword(self.service, self.xkw_name)
+
+
+    @property
+    def ykw(self):
+        return keyword(self.service, self.ykw_name)
+
+
+    def __reduce__(self):
+        return (_restore_frame, (type(self), self.name, self.__dict__.copy()))
 
 
     def __str__(self):
-        return f'{self.name} ({self.xkw} {self.ykw})'
+        return f'{self.name} ({self.xkw_name} {self.ykw_name})'
 
 
     def __repr__(self):
-        return f'{self.name} ({self.xkw} {self.ykw})'
+        return f'{self.name} ({self.xkw_name} {self.ykw_name})'
+
+
+def _restore_frame(cls, name, state):
+    '''Return the shared frame with this name when unpickling, rebuilding it
+    from the pickled state if it is not known in this process.
+    '''
+    frame = frames.get(name, None)
+    if frame is None and name == cls.__name__:
+        frame = get_frame(name)
+    if isinstance(frame, cls) is False:
+        frame = object.__new__(cls)
+        frame.__dict__.update(state)
+    return frame
 
 
 class SkyFrame(OffsetFrame):
@@ -64,12 +154,8 @@ class SkyFrame(OffsetFrame):
     def __init__(self, name='SkyFrame', scale=1.3751*u.arcsec/u.mm):
         super().__init__(name=name)
         self.scale = scale
-        if ktl is not None:
-            self.xkw = ktl.cache(keyword='RAOFF', service='DCS')
-            self.ykw = ktl.cache(keyword='DECOFF', service='DCS')
-        else:
-            self.xkw = 'RAOFF'
-            self.ykw = 'DECOFF'
+        self.connect('DCS', 'RAOFF', 'DECOFF')
+        self.freeze()
 
 
 
@@ -90,24 +176,43 @@ class InstrumentFrame(OffsetFrame):
         spectrograph slit which is not aligned to the pixels of the detector
         (assuming the INST(XY)OFF keywords move in pixel space) would need to
         define the offsetangle.
+
+    fov : tuple of astropy.units.Quantity or None
+        The (X, Y) size of the field of view in this frame, if it is useful to
+        define it (e.g. for tiling mosaics or coverage maps).
     '''
     def __init__(self, name='InstrumentFrame', scale=1*u.arcsec/u.pixel,
-                 offsetangle=0*u.deg):
+                 offsetangle=0*u.deg, fov=None):
         super().__init__(name=name)
         self.scale = scale
+        self.fov = None if fov is None else tuple([f.to(u.arcsec) for f in fov])
+        if isinstance(offsetangle, u.Quantity) is False:
+            offsetangle = offsetangle*u.deg
         self.offsetangle = offsetangle
-        if ktl is not None:
-            self.xkw = ktl.cache(keyword='INSTXOFF', service='DCS')
-            self.ykw = ktl.cache(keyword='INSTYOFF', service='DCS')
-        else:
-            self.xkw = 'INSTXOFF'
-            self.ykw = 'INSTYOFF'
+        self.connect('DCS', 'INSTXOFF', 'INSTYOFF')
         self.validate()
+        self.freeze()
+        frames[self.name] = self
 
 
     def validate(self):
-        if self.offsetangle != 0*u.deg:
-            raise NotImplementedError('offsetangle is not yet supported')
+        if self.offsetangle.unit.is_equivalent(u.deg) is False:
+            raise OffsetError(f'offsetangle for {self.name} must be an angle')
+
+
+def get_frame(name):
+    '''Return the shared frame with the given name.  The name is either that
+    of an `InstrumentFrame` defined by an instrument package (which must have
+    been imported) or that of an `OffsetFrame` subclass such as "SkyFrame", in
+    which case one instance with the default arguments is created and shared.
+    '''
+    if name in frames.keys():
+        return frames[name]
+    frame_class = getattr(sys.modules[__name__], name, None)
+    if isinstance(frame_class, type) and issubclass(frame_class, OffsetFrame):
+        frames[name] = frame_class()
+        return frames[name]
+    raise OffsetError(f'"{name}" is not a known OffsetFrame')
 
 
 ##-------------------------------------------------------------------------
@@ -135,7 +240,8 @@ class TelescopeOffset():
         units of degrees are assumed.
 
     frame : a subclass of `OffsetFrame`
-        The frame in which the offset is made.
+        The frame in which the offset is made.  Defaults to the shared
+        `SkyFrame`.
 
     relative : boolean
         A boolean value indicating whether the offset is to be made relative to
@@ -150,30 +256,87 @@ class TelescopeOffset():
 
     pmfm : int
         The pmfm value to be used.  Defaults to None which does not set it.
+
+    The offsets are stored internally as floats in arcseconds (dx, dy) and
+    degrees (dr), so the unit conversion happens only once, when the value is
+    set.  The dx, dy, and dr attributes return `u.Quantity` views of those
+    values and the dx_arcsec, dy_arcsec, and dr_deg attributes return the
+    floats themselves.
     '''
-    def __init__(self, dx=0, dy=0, dr=0, relative=False, frame=SkyFrame(),
+    __slots__ = ('_dx', '_dy', '_dr', 'frame', 'relative', 'posname', 'guide',
+                 'pmfm', '_canonical')
+
+    def __init__(self, dx=0, dy=0, dr=0, relative=False, frame=None,
                  posname='', guide=True, pmfm=None):
         self.dx = dx
         self.dy = dy
         self.dr = dr
-        self.frame = frame
+        self.frame = get_frame('SkyFrame') if frame is None else frame
         self.relative = relative
         self.posname = posname
         self.guide = guide
         self.pmfm = pmfm
-        self.standardize_units()
         self.validate()
 
 
+    @staticmethod
+    def _to_float(value, unit, name, threshold):
+        if isinstance(value, u.Quantity):
+            return float(value.to_value(unit))
+        if abs(value) > threshold:
+            warn(f'No offset unit given for {name}, assuming {unit.long_names[0]}s',
+                 category=OffsetWarning)
+        return float(value)
+
+
+    @property
+    def dx(self):
+        return self._dx * u.arcsec
+
+    @dx.setter
+    def dx(self, value):
+        self._dx = self._to_float(value, u.arcsec, 'dx', 1e-6)
+
+    @property
+    def dy(self):
+        return self._dy * u.arcsec
+
+    @dy.setter
+    def dy(self, value):
+        self._dy = self._to_float(value, u.arcsec, 'dy', 1e-6)
+
+    @property
+    def dr(self):
+        return self._dr * u.degree
+
+    @dr.setter
+    def dr(self, value):
+        self._dr = self._to_float(value, u.degree, 'dr', 1e-1)
+
+    @property
+    def dx_arcsec(self):
+        return self._dx
+
+    @property
+    def dy_arcsec(self):
+        return self._dy
+
+    @property
+    def dr_deg(self):
+        return self._dr
+
+
     def execute(self):
         '''This is a dummy method for now to print actions to screen.
-        
-        This does not handle the offsetangle value for InstrumentFrame yet.
+
+        For an InstrumentFrame, the offsetangle is applied to convert the
+        offset to the INSTXOFF and INSTYOFF keyword values.
         '''
-        self.standardize_units()
+        from .frame_transform import to_keywords
+        x, y = to_keywords(self._dx, self._dy, self.frame)
         rel2what = {True: 'rel2curr=t', False: 'rel2base=t'}[self.relative]
-        print(f'{repr(self.frame.xkw)}.write({self.dx.value}, {rel2what})')
-        print(f'{repr(self.frame.ykw)}.write({self.dy.value}, {rel2what})')
+        print(f'{repr(self.frame.xkw)}.write({x}, {rel2what})')
+        print(f'{repr(self.frame.ykw)}.write({y}, {rel2what})')
         # set pmfm
         if self.pmfm is not None:
             print(f'Set pmfm value to {self.pmfm}')
@@ -190,57 +353,81 @@ class TelescopeOffset():
 
 
     def standardize_units(self):
-        if type(self.dx) in [float, int]:
-            if abs(self.dx) > 1e-6:
-                warn('No offset unit given for dx, assuming arcseconds',
-                              category=OffsetWarning)
-            self.dx *= u.arcsec
-        if type(self.dy) in [float, int]:
-            if abs(self.dy) > 1e-6:
-                warn('No offset unit given for dy, assuming arcseconds',
-                              category=OffsetWarning)
-            self.dy *= u.arcsec
-        if type(self.dr) in [float, int]:
-            if abs(self.dr) > 1e-1:
-                warn('No offset unit given for dr, assuming degrees',
-                              category=OffsetWarning)
-            self.dr *= u.degree
-        self.dx = self.dx.to(u.arcsec)
-        self.dy = self.dy.to(u.arcsec)
-        self.dr = self.dr.to(u.degree)
+        '''Kept for backwards compatibility.  The values are converted to
+        arcseconds and degrees when they are set, so there is nothing to do.
+        '''
+        pass
 
 
     def to_dict(self):
-        self.standardize_units()
         self.validate()
-        return {'dx': float(self.dx.value),
-                'dy': float(self.dy.value),
-                'dr': float(self.dr.value),
+        return {'dx': self._dx,
+                'dy': self._dy,
+                'dr': self._dr,
                 'frame': str(self.frame.name),
                 'relative': self.relative,
                 'posname': self.posname,
                 'guide': self.guide,
+                'pmfm': self.pmfm,
                 }
 
 
+    def content_hash(self):
+        '''Return the content hash of `to_dict` (see `odl.hashing`).
+        '''
+        return content_hash(self.to_dict())
+
+
+    @classmethod
+    def from_dict(cls, input):
+        '''Return a TelescopeOffset built from the output of `to_dict`.
+        '''
+        offset = cls(relative=input.get('relative', False),
+                     frame=get_frame(input.get('frame', 'SkyFrame')),
+                     posname=input.get('posname', ''),
+                     guide=input.get('guide', True),
+                     pmfm=input.get('pmfm', None))
+        # Stored values are already in arcseconds and degrees
+        offset._dx = float(input.get('dx', 0))
+        offset._dy = float(input.get('dy', 0))
+        offset._dr = float(input.get('dr', 0))
+        return offset
+
+
+    def __setattr__(self, name, value):
+        # Any change invalidates the cached canonical form
+        object.__setattr__(self, '_canonical', None)
+        object.__setattr__(self, name, value)
+
+
+    def _value(self):
+        value = getattr(self, '_canonical', None)
+        if value is None:
+            value = canonical(self.to_dict())
+            object.__setattr__(self, '_canonical', value)
+        return value
+
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, TelescopeOffset) is False:
+            return NotImplemented
+        return self._value() == other._value()
+
+
+    def __hash__(self):
+        return hash(self._value())
+
+
     def __str__(self):
-        dx = self.dx if isinstance(self.dx, u.Quantity) is False\
-             else self.dx.to(u.arcsec).value
-        dy = self.dy if isinstance(self.dy, u.Quantity) is False\
-             else self.dy.to(u.arcsec).value
-        dr = self.dr if isinstance(self.dr, u.Quantity) is False\
-             else self.dr.to(u.degree).value
-        return (f'{dx:+6.1f}|{dy:+6.1f}|{dr:+8.1f}|{self.posname:>8s}|'
-                f'{str(self.guide):>6s}')
+        return (f'{self._dx:+6.1f}|{self._dy:+6.1f}|{self._dr:+8.1f}|'
+                f'{self.posname:>8s}|{str(self.guide):>6s}')
 
 
     def __repr__(self):
-        dx = self.dx if isinstance(self.dx, u.Quantity) is False\
-             else self.dx.to(u.arcsec).value
-        dy = self.dy if isinstance(self.dy, u.Quantity) is False\
-             else self.dy.to(u.arcsec).value
-        return (f'{dx:+6.1f}|{dy:+6.1f}|{self.dr:+8.1f}|{self.posname:>8s}|'
-                f'{str(self.guide):>6s}')
+        return (f'{self._dx:+6.1f}|{self._dy:+6.1f}|{self._dr:+8.1f}|'
+                f'{self.posname:>8s}|{str(self.guide):>6s}')
 
 
 ##-------------------------------------------------------------------------
@@ -280,6 +467,233 @@ class OffsetPattern(UserList):
                 'offsets': [x.to_dict() for x in self.data]}
 
 
+    @classmethod
+    def from_dict(cls, input):
+        '''Return an OffsetPattern built from the output of `to_dict`.
+        '''
+        offsets = [TelescopeOffset.from_dict(o) for o in input.get('offsets', [])]
+        op = cls(offsets, repeat=input.get('repeat', 1))
+        # The stored name already includes the repeat suffix
+        op.name = input.get('name', op.name)
+        return op
+
+
+    def content_hash(self):
+        '''Return the content hash of `to_dict`, which covers the name,
+        repeat, and every offset in the pattern.
+        '''
+        return content_hash(self.to_dict())
+
+
+    def expand(self):
+        '''Yield the absolute position (a `Position` with dx, dy, dr, guide,
+        posname, and iteration) at each step of the repeated pattern.  Starting
+        from the base position, relative (rel2curr) offsets are added to the
+        current position, including across repeats, and absolute (rel2base)
+        offsets replace it.  The positions are generated lazily.
+        '''
+        x, y, r = 0., 0., 0.
+        for iteration in range(self.repeat):
+            for o in self.data:
+                if o.relative is True:
+                    x, y, r = x + o._dx, y + o._dy, r + o._dr
+                else:
+                    x, y, r = o._dx, o._dy, o._dr
+                yield Position(x, y, r, o.guide, o.posname, iteration)
+
+
+    def summary(self):
+        '''Return the number of positions, the total travel and the maximum
+        excursion from the base position (in arcseconds), and the number of
+        steps at each position name.  Computed in a single pass of `expand`.
+        '''
+        n = 0
+        travel = 0.
+        excursion = 0.
+        dwell = {}
+        last = (0., 0.)
+        for p in self.expand():
+            n += 1
+            travel += hypot(p.dx - last[0], p.dy - last[1])
+            excursion = max(excursion, hypot(p.dx, p.dy))
+            dwell[p.posname] = dwell.get(p.posname, 0) + 1
+            last = (p.dx, p.dy)
+        return {'positions': n,
+                'total travel': travel,
+                'max excursion': excursion,
+                'dwell': dwell}
+
+
+    def _categories(self):
+        names = [o.posname for o in self.data]
+        if len(set(names)) < len(names):
+            # Repeated names (e.g. star, sky, star or A, B, B, A) define the
+            # sequence which must be kept
+            return names
+        return ['sky' if o.guide is False or o.posname.lower().startswith('sky')
+                else 'star' for o in self.data]
+
+
+    def optimized(self, order='min_travel', fixed_first=True, passes=20):
+        '''Return a copy of the pattern with the positions reordered to
+        minimize the telescope travel (including the moves from the base
+        position and, if the pattern repeats, back to the start).  The offsets
+        are converted to absolute (rel2base) positions using the first
+        iteration of `expand`, so a pattern with relative (rel2curr) offsets
+        which repeats must return to the same positions on every iteration,
+        otherwise an `OffsetError` is raised.  Offsets are in arcseconds in
+        every frame and a rotation does not change distances, so the travel is
+        a true angular distance.
+
+        Constraints
+        -----------
+        If fixed_first is True, the first position (e.g. "base" or "star")
+        stays first.  The sequence of position categories is kept: if position
+        names repeat (star, sky, star or A, B, B, A) each slot keeps its name,
+        otherwise each slot keeps its star or sky (unguided) category.
+
+        The ordering is built with a nearest neighbor heuristic and improved
+        with 2-opt segment reversals (single category) or pairwise swaps within
+        a category.  The returned pattern has an optimization attribute with
+        the travel before and after (in arcseconds) and the travel saved.
+        '''
+        if order != 'min_travel':
+            raise OffsetError(f'Unknown order "{order}"')
+        self.validate()
+        n = len(self.data)
+        expanded = list(self.expand())
+        positions = expanded[:n]
+        for k in range(n, len(expanded)):
+            if expanded[k][:3] != positions[k % n][:3]:
+                raise OffsetError('Can not optimize a repeated pattern with '
+                                  'relative offsets which visits different '
+                                  'positions on each iteration')
+        xy = np.array([[p.dx, p.dy] for p in positions]).reshape(n, 2)
+        categories = self._categories()
+        # Moves within the pattern happen on every iteration and the move
+        # back to the start between iterations repeat - 1 times
+        internal = self.repeat
+        closing = self.repeat - 1
+        start = np.zeros(2)
+
+        def cost(tour):
+            path = xy[tour]
+            total = np.hypot(*(path[0] - start))
+            total += internal*np.hypot(*np.diff(path, axis=0).T).sum()
+            if len(tour) > 1:
+                total += closing*np.hypot(*(path[-1] - path[0]))
+            return total
+
+        # Nearest neighbor construction which respects the categories
+        tour = [0] if fixed_first is True and n > 0 else []
+        remaining = set(range(n)) - set(tour)
+        current = xy[0] if len(tour) > 0 else start
+        for slot in range(len(tour), n):
+            candidates = [i for i in remaining
+                          if categories[i] == categories[slot]]
+            d = np.hypot(*(xy[candidates] - current).T)
+            best = candidates[int(np.argmin(d))]
+            tour.append(best)
+            remaining.remove(best)
+            current = xy[best]
+        tour = np.array(tour, dtype=int)
+
+        first = 1 if fixed_first is True else 0
+        if len(set(categories[first:])) <= 1:
+            # 2-opt: reverse tour[i:j+1] when it shortens the path
+            D = np.hypot(*(xy[:, None, :] - xy[None, :, :]).T)
+            d0 = np.hypot(*xy.T)
+            for p in range(passes):
+                improved = False
+                for i in range(first, n-1):
+                    j = np.arange(i+1, n)
+                    c = tour[j]
+                    last = j == n-1
+                    nxt = tour[np.where(last, 0, np.minimum(j+1, n-1))]
+                    weight = np.where(last, closing, internal)
+                    if i == 0:
+                        edge_before = d0[tour[0]]
+                        edge_after = d0[c]
+                    else:
+                        edge_before = internal*D[tour[i-1], tour[i]]
+                        edge_after = internal*D[tour[i-1], c]
+                    delta = edge_after - edge_before\
+                            + weight*(D[tour[i], nxt] - D[c, nxt])
+                    if i == 0:
+                        # Reversing from the start also moves the end of the
+                        # closing edge, unless the whole tour is reversed
+                        delta = np.where(last, edge_after - edge_before,
+                                         delta + closing*(D[tour[-1], c]
+                                                          - D[tour[-1], tour[0]]))
+                    k = int(np.argmin(delta))
+                    if delta[k] < -1e-9:
+                        tour[i:j[k]+1] = tour[i:j[k]+1][::-1].copy()
+                        improved = True
+                if improved is False:
+                    break
+        else:
+            # Swap pairs of positions within a category
+            for p in range(passes):
+                improved = False
+                for i in range(first, n-1):
+                    for j in range(i+1, n):
+                        if categories[i] != categories[j]:
+                            continue
+                        trial = tour.copy()
+                        trial[i], trial[j] = tour[j], tour[i]
+                        if cost(trial) < cost(tour) - 1e-9:
+                            tour = trial
+                            improved = True
+                if improved is False:
+                    break
+        if cost(tour) >= cost(np.arange(n)) - 1e-9:
+            tour = np.arange(n)
+
+        offsets = []
+        for i in tour:
+            o = self.data[i]
+            offsets.append(TelescopeOffset(relative=False, frame=o.frame,
+                                           posname=o.posname, guide=o.guide,
+                                           pmfm=o.pmfm))
+            offsets[-1]._dx = positions[i].dx
+            offsets[-1]._dy = positions[i].dy
+            offsets[-1]._dr = positions[i].dr
+        op = OffsetPattern(offsets, repeat=self.repeat)
+        op.name = self.name
+        if set(op.expand()) != set(expanded):
+            raise OffsetError('The optimized pattern does not visit the same '
+                              'positions as the original')
+        before = self.summary()['total travel']
+        after = op.summary()['total travel']
+        op.optimization = {'order': order,
+                           'travel before': before,
+                           'travel after': after,
+                           'travel saved': before - after}
+        return op
+
+
+    def to_array(self):
+        '''Return the equivalent `odl.offset_array.OffsetArray`.
+        '''
+        from .offset_array import OffsetArray
+        return OffsetArray.from_pattern(self)
+
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, OffsetPattern) is False:
+            return NotImplemented
+        return self.name == other.name and self.repeat == other.repeat\
+               and self.data == other.data
+
+
+    def __hash__(self):
+        # The offsets cache their own hashes, so this stays cheap and follows
+        # any change to the list
+        return hash((self.name, self.repeat, tuple(self.data)))
+
+
     def to_header(self):
         h = fits.Header()
         h['OPNAME'] = (self.name, 'Offset Pattern Name')
@@ -287,8 +701,8 @@ class OffsetPattern(UserList):
         h['OPLENGTH'] = (len(self.data), 'Number of Offset Positions')
         for i, patt in enumerate(self.data):
             h[f'OP{i+1:02d}NAME'] = (patt.posname, f'Position {i+1:02d} Name')
-            h[f'OP{i+1:02d}DX'] = (patt.dx.value, f'Position {i+1:02d} dX (arcsec)')
-            h[f'OP{i+1:02d}DY'] = (patt.dy.value, f'Position {i+1:02d} dY (arcsec)')
+            h[f'OP{i+1:02d}DX'] = (patt.dx_arcsec, f'Position {i+1:02d} dX (arcsec)')
+            h[f'OP{i+1:02d}DY'] = (patt.dy_arcsec, f'Position {i+1:02d} dY (arcsec)')
             h[f'OP{i+1:02d}REL'] = (patt.relative, f'Position {i+1:02d} Relative?')
             h[f'OP{i+1:02d}FRM'] = (patt.frame.name, f'Position {i+1:02d} Frame')
             h[f'OP{i+1:02d}GUID'] = (patt.guide, f'Position {i+1:02d} Guide?')
@@ -303,39 +717,29 @@ class OffsetPattern(UserList):
         return {'OffsetPatterns': [self.to_dict()]}
 
 
-    def write(self, file):
-        '''Write the offset pattern to a yaml formatted file.
+    def write(self, file, mode='w'):
+        '''Write the offset pattern to a yaml formatted file.  See
+        `odl.fileio.write_yaml` for the write modes ('w', 'a', or 'update').
         '''
         self.validate()
-        p = Path(file).expanduser().absolute()
-        if p.exists(): p.unlink()
-        with open(p, 'w') as FO:
-            FO.write(yaml.dump([self.to_dict()]))
+        write_yaml(file, [self.to_dict()], mode=mode)
 
 
     def parse_yaml(self, contents):
-        list_of_dicts = contents[0]['OffsetPatterns']
-
-        for d in list_of_dicts:
-            for offset in d['offsets']:
-                print(offset)
-                frame_name = offset.get('frame', 'SkyFrame')
-                print(frame_name)
-                frame_class = getattr(sys.modules[__name__], offset.get('frame', 'SkyFrame'))
-                print(frame_class)
-                frame_object = frame_class()
-                print(frame_object)
-                print()
-
-            offsets = [TelescopeOffset(dx=d.get('dx', 0),
-                                       dy=d.get('dy', 0),
-                                       dr=d.get('dr', 0),
-                                       relative=d.get('relative', False),
-                                       frame=getattr(sys.modules[__name__], d.get('frame', 'SkyFrame'))(),
-                                       posname=d.get('posname', ''),
-                                       guide=d.get('guide', True))
-                       for d['offsets'] in list_of_dicts]
-        return OffsetPattern(offsets)
+        '''Build an OffsetPattern from the contents of a yaml file.  Both the
+        output of `write` and of `to_DB` are accepted.  If the file has
+        appended segments, later entries for a pattern replace earlier ones and
+        the first pattern in the file is returned.
+        '''
+        patterns = []
+        for document in merge(contents):
+            if 'offsets' in document.keys():
+                patterns.append(OffsetPattern.from_dict(document))
+            for d in document.get('OffsetPatterns', []):
+                patterns.append(OffsetPattern.from_dict(d))
+        if len(patterns) == 0:
+            raise OffsetError('No OffsetPatterns found')
+        return patterns[0]
 
 
     def read(self, file):
@@ -374,7 +778,7 @@ def Stare(repeat=1):
     repeat : int
         The number of times to repeat this pattern.
     '''
-    offset1 = TelescopeOffset(dx=0, dy=0, posname='base', frame=SkyFrame())
+    offset1 = TelescopeOffset(dx=0, dy=0, posname='base', frame=get_frame('SkyFrame'))
     return OffsetPattern([offset1], name='Stare', repeat=repeat)
 
 
@@ -402,9 +806,9 @@ def StarSky(dx=10*u.arcsec, dy=10*u.arcsec, repeat=1):
     dy = dy.to(u.arcsec)
 
     o1 = TelescopeOffset(dx=0, dy=0, posname='star',
-                         frame=SkyFrame(), guide=True)
+                         frame=get_frame('SkyFrame'), guide=True)
     o2 = TelescopeOffset(dx=dx, dy=dy, posname='sky',
-                         frame=SkyFrame(), guide=False)
+                         frame=get_frame('SkyFrame'), guide=False)
     return OffsetPattern([o1, o2], repeat=repeat,
                          name=f'StarSky ({dx.value:.0f} {dy.value:.0f})')
 
@@ -433,9 +837,9 @@ def SkyStar(dx=10*u.arcsec, dy=10*u.arcsec, repeat=1):
     dy = dy.to(u.arcsec)
 
     o1 = TelescopeOffset(dx=0, dy=0, posname='star',
-                         frame=SkyFrame(), guide=True)
+                         frame=get_frame('SkyFrame'), guide=True)
     o2 = TelescopeOffset(dx=dx, dy=dy, posname='sky',
-                         frame=SkyFrame(), guide=False)
+                         frame=get_frame('SkyFrame'), guide=False)
     return OffsetPattern([o2, o1], repeat=repeat,
                          name=f'SkyStar ({dx.value:.0f} {dy.value:.0f})')
 
@@ -465,11 +869,11 @@ def StarSkyStar(dx=10*u.arcsec, dy=10*u.arcsec, repeat=1):
     dy = dy.to(u.arcsec)
 
     o1 = TelescopeOffset(dx=0, dy=0, posname='star',
-                         frame=SkyFrame(), guide=True)
+                         frame=get_frame('SkyFrame'), guide=True)
     o2 = TelescopeOffset(dx=dx, dy=dy, posname='sky',
-                         frame=SkyFrame(), guide=False)
+                         frame=get_frame('SkyFrame'), guide=False)
     o3 = TelescopeOffset(dx=0, dy=0, posname='star',
-                         frame=SkyFrame(), guide=True)
+                         frame=get_frame('SkyFrame'), guide=True)
     return OffsetPattern([o1, o2, o3], repeat=repeat,
                          name=f'StarSkyStar ({dx.value:.0f} {dy.value:.0f})')
 
@@ -0,0 +1,294 @@
+#!python3
+
+## Import General Tools
+import numpy as np
+from astropy import units as u
+
+from .offset import (OffsetError, OffsetFrame, TelescopeOffset, OffsetPattern,
+                     get_frame)
+from .frame_transform import convert, sky
+
+
+##-------------------------------------------------------------------------
+## OffsetArray
+##-------------------------------------------------------------------------
+class OffsetArray():
+    '''An array backed equivalent of an `OffsetPattern`.  Each property of the
+    offsets is held as a column in a numpy array so that operations on the
+    whole pattern (rotating, scaling, concatenating, expanding the repeats)
+    are vectorized.  Use `OffsetPattern.to_array` and `OffsetArray.to_pattern`
+    to convert between the two forms.
+
+    Attributes
+    ----------
+    dx : `np.ndarray` of float
+        The offsets in the X direction in arcseconds.
+
+    dy : `np.ndarray` of float
+        The offsets in the Y direction in arcseconds.
+
+    dr : `np.ndarray` of float
+        The offsets in rotation in degrees.
+
+    guide : `np.ndarray` of bool
+        Whether to guide at each position.
+
+    relative : `np.ndarray` of bool
+        Whether each offset is relative to the current position (True) or to
+        the original target position (False).
+
+    posname : `np.ndarray` of str
+        The name of each position.
+
+    pmfm : `np.ndarray` of float
+        The pmfm value at each position.  NaN indicates that pmfm is not set.
+
+    frame : a subclass of `OffsetFrame`
+        The frame in which all of the offsets are made.
+
+    name : str
+        A human readable name for the pattern.
+
+    repeat : int
+        The number of times to repeat this pattern.
+    '''
+    def __init__(self, dx=[], dy=None, dr=None, guide=None, relative=None,
+                 posname=None, pmfm=None, frame=None, name='', repeat=1):
+        self.dx = self._to_array(dx, u.arcsec)
+        n = len(self.dx)
+        self.dy = self._to_array(dy, u.arcsec, n)
+        self.dr = self._to_array(dr, u.degree, n)
+        self.guide = np.ones(n, dtype=bool) if guide is None\
+                     else np.broadcast_to(np.asarray(guide, dtype=bool), n).copy()
+        self.relative = np.zeros(n, dtype=bool) if relative is None\
+                        else np.broadcast_to(np.asarray(relative, dtype=bool), n).copy()
+        self.posname = np.full(n, '', dtype=object) if posname is None\
+                       else np.broadcast_to(np.asarray(posname, dtype=object), n).copy()
+        self.pmfm = np.full(n, np.nan) if pmfm is None\
+                    else np.array([np.nan if p is None else p
+                                   for p in np.broadcast_to(np.asarray(pmfm, dtype=object), n)],
+                                  dtype=float)
+        self.frame = get_frame('SkyFrame') if frame is None else frame
+        self.name = name
+        self.repeat = repeat
+        self.validate()
+
+
+    @staticmethod
+    def _to_array(values, unit, n=None):
+        if values is None:
+            return np.zeros(n)
+        if isinstance(values, u.Quantity):
+            values = values.to_value(unit)
+        values = np.array(values, dtype=float, ndmin=1)
+        if n is not None:
+            values = np.broadcast_to(values, n).copy()
+        return values
+
+
+    def validate(self):
+        if isinstance(self.frame, OffsetFrame) is False:
+            raise OffsetError(f'"{self.frame}" is not a known OffsetFrame')
+        n = len(self.dx)
+        for column in [self.dy, self.dr, self.guide, self.relative,
+                       self.posname, self.pmfm]:
+            if len(column) != n:
+                raise OffsetError('All columns must have the same length')
+
+
+    def _new(self, dx=None, dy=None, dr=None, index=slice(None), **kwargs):
+        '''Return a new OffsetArray with the columns of this one (selected by
+        index) and any replacements given as keywords.
+        '''
+        new = object.__new__(OffsetArray)
+        new.dx = self.dx[index] if dx is None else dx
+        new.dy = self.dy[index] if dy is None else dy
+        new.dr = self.dr[index] if dr is None else dr
+        for column in ['guide', 'relative', 'posname', 'pmfm']:
+            setattr(new, column, kwargs.get(column, getattr(self, column)[index]))
+        new.frame = kwargs.get('frame', self.frame)
+        new.name = kwargs.get('name', self.name)
+        new.repeat = kwargs.get('repeat', self.repeat)
+        return new
+
+
+    ##-------------------------------------------------------------------------
+    ## Vectorized Operations
+    ##-------------------------------------------------------------------------
+    def rotate(self, angle):
+        '''Return a copy with the (dx, dy) offsets rotated counterclockwise
+        (from +X towards +Y) by the given angle.  A float angle is assumed to
+        be in degrees.
+        '''
+        if isinstance(angle, u.Quantity):
+            angle = angle.to_value(u.degree)
+        theta = np.radians(angle)
+        c, s = np.cos(theta), np.sin(theta)
+        return self._new(dx=c*self.dx - s*self.dy,
+                         dy=s*self.dx + c*self.dy)
+
+
+    def scale(self, factor):
+        '''Return a copy with the (dx, dy) offsets multiplied by factor, which
+        may be a single value or an (x, y) pair.
+        '''
+        fx, fy = np.broadcast_to(np.asarray(factor, dtype=float), 2)
+        return self._new(dx=self.dx*fx, dy=self.dy*fy)
+
+
+    def shift(self, dx=0, dy=0):
+        '''Return a copy with the absolute (non-relative) offsets moved by
+        (dx, dy) arcseconds.  Relative offsets are unchanged, so the whole
+        pattern moves together.
+        '''
+        absolute = ~self.relative
+        return self._new(dx=self.dx + dx*absolute, dy=self.dy + dy*absolute)
+
+
+    def reverse(self):
+        '''Return a copy with the order of the positions reversed.
+        '''
+        return self._new(index=slice(None, None, -1))
+
+
+    def tile(self, n):
+        '''Return a pattern with the positions repeated n times in sequence
+        and a repeat value of 1.
+        '''
+        index = np.tile(np.arange(len(self)), n)
+        return self._new(index=index, repeat=1)
+
+
+    def expand(self):
+        '''Return a pattern in which the repeats are written out explicitly
+        (see `tile`).
+        '''
+        return self.tile(self.repeat)
+
+
+    @classmethod
+    def concatenate(cls, arrays, name=None):
+        '''Join several OffsetArrays (each expanded by its repeat value) into
+        a single pattern.  All of them must be in the same frame.
+        '''
+        arrays = [a.expand() for a in arrays]
+        if len(arrays) == 0:
+            return cls(name='' if name is None else name)
+        frame = arrays[0].frame
+        for a in arrays[1:]:
+            if isinstance(a.frame, type(frame)) is False\
+               or a.frame.name != frame.name:
+                raise OffsetError('All offsets must have the same frame')
+        new = arrays[0]._new(index=slice(None), repeat=1,
+                             name=' + '.join([a.name for a in arrays])\
+                                  if name is None else name)
+        for column in ['dx', 'dy', 'dr', 'guide', 'relative', 'posname', 'pmfm']:
+            setattr(new, column, np.concatenate([getattr(a, column)
+                                                 for a in arrays]))
+        return new
+
+
+    def to_frame(self, frame, PA=0):
+        '''Return a copy with the offsets converted to another frame for a
+        target at the given position angle (see `odl.frame_transform`).
+        '''
+        return convert(self, frame, PA=PA)
+
+
+    def to_sky(self, PA=0):
+        '''Return a copy with the offsets converted to East and North offsets
+        in the `SkyFrame`.
+        '''
+        return convert(self, sky, PA=PA)
+
+
+    def __add__(self, other):
+        return OffsetArray.concatenate([self, other])
+
+
+    def positions(self):
+        '''Return the absolute (x, y, r) position at each step of the pattern
+        relative to the original target position, taking in to account the
+        relative offsets.  The pattern starts at the base position.
+        '''
+        n = len(self)
+        index = np.arange(n)
+        # Index of the most recent absolute offset at each step (-1 if none)
+        last = np.maximum.accumulate(np.where(self.relative, -1, index))
+        has_base = last >= 0
+        output = []
+        for column in [self.dx, self.dy, self.dr]:
+            steps = np.where(self.relative, column, 0)
+            total = np.cumsum(steps)
+            base = np.where(has_base, column[last], 0)
+            since = total - np.where(has_base, total[last], 0)
+            output.append(base + since)
+        return tuple(output)
+
+
+    ##-------------------------------------------------------------------------
+    ## Conversions
+    ##-------------------------------------------------------------------------
+    @classmethod
+    def from_pattern(cls, pattern):
+        '''Build an OffsetArray from an `OffsetPattern`.
+        '''
+        pattern.validate()
+        offsets = pattern.data
+        new = cls(dx=[o.dx_arcsec for o in offsets],
+                  dy=[o.dy_arcsec for o in offsets],
+                  dr=[o.dr_deg for o in offsets],
+                  guide=[o.guide for o in offsets],
+                  relative=[o.relative for o in offsets],
+                  posname=[o.posname for o in offsets],
+                  pmfm=[o.pmfm for o in offsets],
+                  frame=offsets[0].frame if len(offsets) > 0 else None,
+                  repeat=pattern.repeat)
+        new.name = pattern.name
+        return new
+
+
+    def _offset(self, i):
+        pmfm = None if np.isnan(self.pmfm[i]) else int(self.pmfm[i])
+        offset = TelescopeOffset(relative=bool(self.relative[i]),
+                                 frame=self.frame,
+                                 posname=str(self.posname[i]),
+                                 guide=bool(self.guide[i]),
+                                 pmfm=pmfm)
+        offset._dx = float(self.dx[i])
+        offset._dy = float(self.dy[i])
+        offset._dr = float(self.dr[i])
+        return offset
+
+
+    def to_pattern(self):
+        '''Return the equivalent `OffsetPattern`.
+        '''
+        self.validate()
+        offsets = [self._offset(i) for i in range(len(self))]
+        pattern = OffsetPattern(offsets, repeat=self.repeat)
+        pattern.name = self.name
+        return pattern
+
+
+    def to_dict(self):
+        return self.to_pattern().to_dict()
+
+
+    def __len__(self):
+        return len(self.dx)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._offset(index)
+        return self._new(index=index)
+
+
+    def __str__(self):
+        return self.name
+
+
+    def __repr__(self):
+        return f'OffsetArray({self.name!r}, {len(self)} positions, '\
+               f'repeat={self.repeat}, frame={self.frame.name})'
@@ -0,0 +1,232 @@
+#!python3
+
+## Import General Tools
+from math import hypot
+
+from .hashing import state_key
+
+
+class OverheadError(Exception): pass
+
+
+# The parts of a TimeEstimate which add up to the wall clock time
+components = ['slew', 'acquisition', 'alignment', 'reconfiguration', 'settle',
+              'exposure']
+
+
+def same_target(a, b):
+    '''Return True if a and b are the same target: the same object, or two
+    targets with the same attributes.
+    '''
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    return state_key(a) == state_key(b)
+
+
+##-------------------------------------------------------------------------
+## TimeEstimate
+##-------------------------------------------------------------------------
+class TimeEstimate(dict):
+    '''A breakdown of the time (in seconds) needed for one or more observing
+    blocks.  It is a dict with the keys "shutter open time" and "wall clock
+    time" (as returned by earlier versions of `estimate_time`) plus one key for
+    each of the overhead components: slew, acquisition, alignment,
+    reconfiguration, settle, and exposure (the detector clock time).
+    Estimates can be added and subtracted.
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__({key: 0 for key in ['shutter open time',
+                                             'wall clock time'] + components})
+        self.update(*args, **kwargs)
+
+
+    def total(self):
+        '''Set the wall clock time to the sum of the components.
+        '''
+        self['wall clock time'] = sum([self[key] for key in components])
+        return self
+
+
+    def __add__(self, other):
+        return TimeEstimate({key: self.get(key, 0) + other.get(key, 0)
+                             for key in set(self.keys()) | set(other.keys())})
+
+
+    def __sub__(self, other):
+        return TimeEstimate({key: self.get(key, 0) - other.get(key, 0)
+                             for key in set(self.keys()) | set(other.keys())})
+
+
+    def __str__(self):
+        return (f"Shutter Open Time: {self['shutter open time']:.0f} s "
+                f"({self['shutter open time']/3600:.1f} hrs)\n"
+                f"Wall Clock Time: {self['wall clock time']:.0f} s "
+                f"({self['wall clock time']/3600:.1f} hrs)")
+
+
+##-------------------------------------------------------------------------
+## OverheadModel
+##-------------------------------------------------------------------------
+class OverheadModel():
+    '''Table driven overheads for an instrument.  All times are in seconds.
+
+    Attributes
+    ----------
+    instrument : str
+        The instrument name (as in `InstrumentConfig.instrument`).
+
+    slew : float
+        The time to slew to a new target.
+
+    acquisition : float
+        The time to acquire a new target once the slew is done.
+
+    reconfiguration : float
+        The time to change the instrument configuration.
+
+    settle : float
+        The time for each telescope offset to settle.
+
+    offset_rate : float
+        The additional offset time per arcsecond moved.
+
+    alignment : dict
+        The time for each alignment type.  The keys are the alignment class
+        names, with " faint" or " takesky" appended for `GuiderAlign` with
+        faint=True and `MaskAlign` with takesky=True.
+
+    alignment_exposures : dict
+        The number of alignment exposures (using the alignment's detconfig)
+        for each alignment type.  Their clock time is added to the alignment
+        time.
+    '''
+    def __init__(self, instrument='Generic', slew=120, acquisition=120,
+                 reconfiguration=60, settle=10, offset_rate=0.05,
+                 alignment={}, alignment_exposures={}):
+        self.instrument = instrument
+        self.slew = slew
+        self.acquisition = acquisition
+        self.reconfiguration = reconfiguration
+        self.settle = settle
+        self.offset_rate = offset_rate
+        self.alignment = {'BlindAlign': 0,
+                          'GuiderAlign': 60,
+                          'GuiderAlign faint': 180,
+                          'MaskAlign': 300,
+                          'MaskAlign takesky': 420}
+        self.alignment.update(alignment)
+        self.alignment_exposures = {'MaskAlign': 3, 'MaskAlign takesky': 6}
+        self.alignment_exposures.update(alignment_exposures)
+
+
+    @staticmethod
+    def alignment_key(align):
+        key = type(align).__name__
+        if getattr(align, 'faint', False) is True:
+            key += ' faint'
+        if getattr(align, 'takesky', False) is True:
+            key += ' takesky'
+        return key
+
+
+    def alignment_time(self, align):
+        '''Return the time taken by an alignment.
+        '''
+        if align is None:
+            return 0
+        key = self.alignment_key(align)
+        if key not in self.alignment.keys():
+            raise OverheadError(f'No {self.instrument} overhead for "{key}"')
+        t = self.alignment[key]
+        n = self.alignment_exposures.get(key, 0)
+        detconfig = getattr(align, 'detconfig', None)
+        if n > 0 and detconfig is not None:
+            t += n * detconfig.estimate_clock_time()
+        return t
+
+
+    def offset_time(self, pattern):
+        '''Return the time taken by the telescope offsets of a pattern: a
+        settle time for every move plus a time proportional to the distance.
+        '''
+        if pattern is None:
+            return 0
+        t = 0
+        last = (0., 0.)
+        for p in pattern.expand():
+            distance = hypot(p.dx - last[0], p.dy - last[1])
+            if distance > 0:
+                t += self.settle + self.offset_rate*distance
+            last = (p.dx, p.dy)
+        return t
+
+
+    def exposure_time(self, block):
+        '''Return the (shutter open, clock) time for each position of the
+        block's pattern.  Multiple detectors read out in parallel, so the
+        longest of each is used.
+        '''
+        detconfigs = [dc for dc in block.detconfig if dc is not None]
+        if len(detconfigs) == 0:
+            return 0, 0
+        shutter = max([dc.exptime*dc.nexp*getattr(dc, 'coadds', 1)
+                       for dc in detconfigs])
+        clock = max([dc.estimate_clock_time() for dc in detconfigs])
+        return shutter, clock
+
+
+    def estimate(self, block, previous=None):
+        '''Return the `TimeEstimate` for a block.  If the previous block is
+        given, the slew and acquisition are skipped when it had the same target
+        and the reconfiguration is skipped when it had the same instrument
+        config.
+        '''
+        t = TimeEstimate()
+        if block.target is not None:
+            if previous is None\
+               or same_target(previous.target, block.target) is False:
+                t['slew'] = self.slew
+                t['acquisition'] = self.acquisition
+        if block.instconfig is not None:
+            if previous is None or previous.instconfig != block.instconfig:
+                t['reconfiguration'] = self.reconfiguration
+        t['alignment'] = self.alignment_time(block.align)
+        t['settle'] = self.offset_time(block.pattern)
+        npositions = 1 if block.pattern is None\
+                     else block.pattern.repeat * len(block.pattern)
+        shutter, clock = self.exposure_time(block)
+        t['shutter open time'] = npositions * shutter
+        t['exposure'] = npositions * clock
+        return t.total()
+
+
+##-------------------------------------------------------------------------
+## Registry
+##-------------------------------------------------------------------------
+models = {'Generic': OverheadModel()}
+
+
+def register(model):
+    '''Add an `OverheadModel` to the registry under its instrument name.
+    '''
+    models[model.instrument] = model
+
+
+def get_model(instrument):
+    '''Return the `OverheadModel` for an instrument, or the generic model if
+    the instrument does not register one.
+    '''
+    return models.get(instrument, models['Generic'])
+
+
+def block_instrument(block):
+    '''Return the instrument name of a block from its configs.
+    '''
+    if block.instconfig is not None:
+        return block.instconfig.instrument
+    for dc in block.detconfig:
+        if dc is not None:
+            return dc.instrument
+    return 'Generic'
@@ -0,0 +1,125 @@
+#!python3
+
+## Import General Tools
+import numpy as np
+from astropy import units as u
+
+from .offset import OffsetError, get_frame
+from .offset_array import OffsetArray
+
+
+# Dither and mosaic pattern generators.  Each returns an OffsetArray of
+# absolute (rel2base) offsets in arcseconds, built with numpy so that patterns
+# with thousands of positions are cheap.  Convert with `to_pattern` to get an
+# OffsetPattern.
+
+
+def _arcsec(value):
+    if isinstance(value, u.Quantity):
+        return float(value.to_value(u.arcsec))
+    return float(value)
+
+
+def _posnames(prefix, n):
+    return np.char.add(prefix, (np.arange(n) + 1).astype(str)).astype(object)
+
+
+def _snake(nx, ny):
+    '''Return the (column, row) indices of an nx by ny grid in boustrophedon
+    order (alternate rows reversed) so that consecutive positions are
+    adjacent.
+    '''
+    col, row = np.meshgrid(np.arange(nx), np.arange(ny))
+    col[1::2] = col[1::2, ::-1]
+    return col.ravel(), row.ravel()
+
+
+##-------------------------------------------------------------------------
+## Generators
+##-------------------------------------------------------------------------
+def box(width=10*u.arcsec, height=None, center=False, frame=None,
+        guide=True, repeat=1):
+    '''Return a box pattern at the four corners of a width by height
+    rectangle centered on the base position.  If center is True, the base
+    position is added as the first position.
+    '''
+    w = _arcsec(width)
+    h = w if height is None else _arcsec(height)
+    dx = np.array([-w, +w, +w, -w])/2
+    dy = np.array([-h, -h, +h, +h])/2
+    if center is True:
+        dx = np.concatenate([[0.], dx])
+        dy = np.concatenate([[0.], dy])
+    return OffsetArray(dx=dx, dy=dy, guide=guide, frame=frame,
+                       posname=_posnames('box', len(dx)), repeat=repeat,
+                       name=f'Box{len(dx)} ({w:.1f} {h:.1f})')
+
+
+def grid(nx=3, ny=3, dx=10*u.arcsec, dy=None, frame=None, guide=True,
+         repeat=1):
+    '''Return an nx by ny grid of positions with spacing dx and dy, centered
+    on the base position and ordered row by row with alternate rows reversed.
+    '''
+    sx = _arcsec(dx)
+    sy = sx if dy is None else _arcsec(dy)
+    col, row = _snake(nx, ny)
+    return OffsetArray(dx=(col - (nx-1)/2)*sx, dy=(row - (ny-1)/2)*sy,
+                       guide=guide, frame=frame,
+                       posname=_posnames('grid', nx*ny), repeat=repeat,
+                       name=f'Grid {nx}x{ny} ({sx:.1f} {sy:.1f})')
+
+
+def random(n=10, radius=5*u.arcsec, seed=None, frame=None, guide=True,
+           repeat=1):
+    '''Return n positions drawn uniformly from within a circle of the given
+    radius around the base position.  Use seed to make the pattern
+    reproducible.
+    '''
+    r = _arcsec(radius)
+    rng = np.random.default_rng(seed)
+    rho = r*np.sqrt(rng.random(n))
+    theta = 2*np.pi*rng.random(n)
+    return OffsetArray(dx=rho*np.cos(theta), dy=rho*np.sin(theta),
+                       guide=guide, frame=frame,
+                       posname=_posnames('rand', n), repeat=repeat,
+                       name=f'Random{n} ({r:.1f}, seed={seed})')
+
+
+def spiral(n=9, step=5*u.arcsec, frame=None, guide=True, repeat=1):
+    '''Return the first n positions of a square spiral on a grid of the given
+    step, starting at the base position and working outward.
+    '''
+    s = _arcsec(step)
+    k = np.arange(n)
+    # Ring number, and position within the ring of 8m positions which starts
+    # at (m, 1-m) and runs counterclockwise
+    m = np.floor((np.sqrt(k) + 1)/2).astype(int)
+    t = k - (2*m - 1)**2
+    side_length = np.maximum(2*m, 1)
+    side = t // side_length
+    pos = t % side_length
+    x = np.select([side == 0, side == 1, side == 2], [m, m - 1 - pos, -m],
+                  -m + 1 + pos)
+    y = np.select([side == 0, side == 1, side == 2], [1 - m + pos, m, m - 1 - pos],
+                  -m)
+    x[0], y[0] = 0, 0
+    return OffsetArray(dx=x*s, dy=y*s, guide=guide, frame=frame,
+                       posname=_posnames('spiral', n), repeat=repeat,
+                       name=f'Spiral{n} ({s:.1f})')
+
+
+def mosaic(nx=2, ny=2, frame=None, overlap=0.1, guide=True, repeat=1):
+    '''Return an nx by ny mosaic which tiles the field of view of an
+    `InstrumentFrame` (see `InstrumentFrame.fov`) with the given fractional
+    overlap between adjacent tiles.  The offsets are in that frame so the
+    tiles stay aligned to the field of view at any PA.
+    '''
+    frame = get_frame(frame) if isinstance(frame, str) else frame
+    if getattr(frame, 'fov', None) is None:
+        raise OffsetError(f'Frame "{frame}" does not define a field of view')
+    width, height = [_arcsec(f) for f in frame.fov]
+    new = grid(nx=nx, ny=ny, dx=width*(1-overlap), dy=height*(1-overlap),
+               frame=frame, guide=guide, repeat=repeat)
+    new.posname = _posnames('tile', nx*ny)
+    new.name = f'Mosaic {nx}x{ny} {frame.name}'
+    return new
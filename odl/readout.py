@@ -0,0 +1,141 @@
+#!python3
+
+## Import General Tools
+import re
+from functools import lru_cache
+import numpy as np
+
+
+class ReadoutError(Exception): pass
+
+
+# Readout time tables for CCD style detectors.  The readout time depends on the
+# readout speed, the amplifier configuration, the binning, and the window.  The
+# first three are precomputed in to a numpy array when the detector config
+# class is defined, so a lookup (or a whole array of lookups) is just an index
+# operation.  A window reads out a fraction of the rows, and the readout time is
+# scaled by that fraction.
+
+
+@lru_cache(maxsize=256)
+def row_fraction(window, nrows):
+    '''Return the fraction of the nrows rows of a detector which are read out
+    in a window given as "x1:x2,y1:y2" (in unbinned pixels).  A window of None
+    reads the full detector.
+    '''
+    if window is None:
+        return 1.
+    match = re.match(r'\s*(\d+):(\d+)\s*,\s*(\d+):(\d+)\s*$', str(window))
+    if match is None:
+        raise ReadoutError(f'Could not parse window "{window}" as x1:x2,y1:y2')
+    y1, y2 = int(match.group(3)), int(match.group(4))
+    return min((abs(y2 - y1) + 1)/nrows, 1.)
+
+
+##-------------------------------------------------------------------------
+## ReadoutTable
+##-------------------------------------------------------------------------
+class ReadoutTable():
+    '''A readout time lookup table for a detector.
+
+    Attributes
+    ----------
+    times : dict
+        The readout time in seconds of the full detector as nested dicts keyed
+        by speed (the readoutmode value), amplifier configuration (e.g.
+        "single" or "dual"), and binning (e.g. "1x1").  Every speed must have
+        the same amplifier configurations and binnings.
+
+    ampmodes : dict
+        Maps each ampmode value to its amplifier configuration.
+
+    nrows : int
+        The number of (unbinned) rows of the detector, used to scale the
+        readout time of windows.
+
+    table : `np.ndarray`
+        The readout times indexed [speed, amplifier configuration, binning].
+    '''
+    def __init__(self, times, ampmodes, nrows):
+        self.speeds = sorted(times.keys())
+        first = times[self.speeds[0]]
+        self.amps = list(first.keys())
+        self.binnings = list(first[self.amps[0]].keys())
+        self.ampmodes = ampmodes
+        self.nrows = nrows
+        try:
+            self.table = np.array([[[times[s][a][b] for b in self.binnings]
+                                    for a in self.amps]
+                                   for s in self.speeds], dtype=float)
+        except KeyError as e:
+            raise ReadoutError(f'Readout time table is missing {e}')
+        # Integer lookups from readoutmode and ampmode to the table axes, with
+        # -1 for values which are not in the table
+        self.speed_index = np.full(max(self.speeds)+1, -1)
+        self.speed_index[self.speeds] = np.arange(len(self.speeds))
+        self.amp_index = np.full(max(ampmodes.keys())+1, -1)
+        for ampmode, amps in ampmodes.items():
+            self.amp_index[ampmode] = self.amps.index(amps)
+        self.binning_index = {b: i for i, b in enumerate(self.binnings)}
+        # Flat dict of the table for single lookups, which avoids the cost of
+        # converting scalars to arrays
+        self.lookup = {(s, ampmode, b): float(self.table[i, self.amp_index[ampmode], j])
+                       for i, s in enumerate(self.speeds)
+                       for ampmode in ampmodes.keys()
+                       for j, b in enumerate(self.binnings)}
+
+
+    def _index(self, lookup, values, name):
+        values = np.asarray(values)
+        if not np.issubdtype(values.dtype, np.integer)\
+           or np.any(values < 0) or np.any(values >= len(lookup)):
+            raise ReadoutError(f'Unknown {name} in {values}')
+        index = lookup[values]
+        if np.any(index < 0):
+            raise ReadoutError(f'Unknown {name} in {values}')
+        return index
+
+
+    def _binning(self, binning):
+        if np.ndim(binning) == 0:
+            if binning not in self.binning_index.keys():
+                raise ReadoutError(f'Unknown binning "{binning}"')
+            return self.binning_index[binning]
+        unique, inverse = np.unique(np.asarray(binning), return_inverse=True)
+        return np.array([self._binning(b) for b in unique])[inverse]
+
+
+    def _fraction(self, window):
+        if window is None or isinstance(window, str):
+            return row_fraction(window, self.nrows)
+        return np.array([row_fraction(w, self.nrows) for w in window])
+
+
+    def readout_time(self, readoutmode, ampmode, binning, window=None):
+        '''Return the readout time in seconds.  Each argument may be a single
+        value or an array (of matching length), in which case an array of
+        readout times is returned.
+        '''
+        if window is None or isinstance(window, str):
+            try:
+                time = self.lookup.get((readoutmode, ampmode, binning), None)
+            except TypeError:
+                # Arrays are not hashable
+                time = None
+            if time is not None:
+                return time * row_fraction(window, self.nrows)
+        s = self._index(self.speed_index, readoutmode, 'readout mode')
+        a = self._index(self.amp_index, ampmode, 'amp mode')
+        times = self.table[s, a, self._binning(binning)] * self._fraction(window)
+        return float(times) if np.ndim(times) == 0 else times
+
+
+    def clock_time(self, exptime, nexp, readoutmode, ampmode, binning,
+                   window=None, erase=0, overhead=0):
+        '''Return the clock time in seconds of nexp exposures (see
+        `VisibleDetectorConfig.estimate_clock_time`).  Each argument may be an
+        array to compute many configurations at once.
+        '''
+        readout = self.readout_time(readoutmode, ampmode, binning, window)
+        return (np.asarray(erase) + np.asarray(exptime) + readout
+                + np.asarray(overhead)) * np.asarray(nexp)
@@ -0,0 +1,78 @@
+#!python3
+
+## Import General Tools
+import time
+
+
+# A minimal stand-in for the ktl module for use when testing without access
+# to the Keck keyword services.  Enable it with:
+#
+#     import odl.simktl
+#     odl.offset.use_ktl(odl.simktl)
+
+# Number of times a keyword handle has been created by cache
+cache_calls = 0
+
+# Keyword handles by (service, keyword)
+_keywords = {}
+
+
+class Keyword():
+    '''A simulated keyword which remembers the values written to it.
+
+    Attributes
+    ----------
+    service : str
+        The name of the keyword service.
+
+    name : str
+        The name of the keyword.
+
+    history : list
+        The (time, value, kwargs) of every write.
+    '''
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+        self.value = None
+        self.history = []
+
+
+    def write(self, value, wait=True, **kwargs):
+        self.value = value
+        self.history.append((time.time(), value, kwargs))
+
+
+    def read(self):
+        return self.value
+
+
+    def monitor(self, start=True):
+        pass
+
+
+    def waitFor(self, expression, timeout=None):
+        return True
+
+
+    def __repr__(self):
+        return f'{self.service}.{self.name}'
+
+
+def cache(keyword=None, service=None):
+    '''Return the simulated keyword handle, creating it on first use.
+    '''
+    global cache_calls
+    cache_calls += 1
+    key = (service, keyword)
+    if key not in _keywords.keys():
+        _keywords[key] = Keyword(service, keyword)
+    return _keywords[key]
+
+
+def reset():
+    '''Discard all simulated keywords and reset the call counter.
+    '''
+    global cache_calls
+    cache_calls = 0
+    _keywords.clear()
@@ -10,6 +10,9 @@ from astropy import coordinates as c
 from astropy.time import Time
 from astropy.io import fits
 
+from .fileio import write_yaml, merge
+from .hashing import content_hash
+
 
 # List the valid values for the rotator mode, object types, and PA.
 rotator_modes = ['pa',
@@ -122,6 +125,10 @@ class Target():
         position angle of 0 will mean the slit has the long axis parallel to
         elevation.
     '''
+    # The observatory location is the same for every target (see
+    # `odl.hashing.state_key`)
+    _state_exclude = ('location',)
+
     def __init__(self, name=None, RA=None, Dec=None, equinox=None, frame='icrs',
                  rotmode=None, PA=None, RAOffset=None, DecOffset=None,
                  PMRA=0, PMDec=0, epoch=None, obstime=None,
@@ -370,7 +377,6 @@ class Target():
         '''Return dictionary corresponding to a Target Description Language
         (TDL) entry.
         '''
-        coord = self.coord()
         mags = dict()
         for band in self.mag.keys():
             if self.mag.get(band, None) is not None:
@@ -383,13 +389,29 @@ class Target():
         elif type(self.obstime) == Time:
             obstime = float(self.obstime.to_value('decimalyear'))
 
+        # Calibration positions such as DomeFlats have no coordinate
+        if self.RA is None or self.Dec is None:
+            RA, Dec, frame = self.RA, self.Dec, self.frame
+            epoch = self.epoch
+        else:
+            coord = self.coord()
+            RA, Dec, frame = float(coord.ra.deg), float(coord.dec.deg),\
+                             coord.frame.name
+            # Equinox and epoch are kept as the decimal years given so that
+            # the output is stable.  If proper motion was applied, the epoch
+            # is that of the propagated coordinate.
+            if abs(self.PMRA) > 0 and abs(self.PMDec) > 0:
+                epoch = float(coord.obstime.decimalyear)
+            else:
+                epoch = self.epoch
+
         TDL_dict = {
             'name': self.name,
-            'RA': float(coord.ra.deg),
-            'Dec': float(coord.dec.deg),
-            'equinox': float(coord.equinox.byear),
-            'epoch': float(coord.obstime.byear),
-            'frame': coord.frame.name,
+            'RA': RA,
+            'Dec': Dec,
+            'equinox': self.equinox,
+            'epoch': epoch,
+            'frame': frame,
             'rotmode': self.rotmode,
             'PA': self.PA,
             'RAOffset': self.RAOffset,
@@ -406,6 +428,38 @@ class Target():
         return TDL_dict
 
 
+    @classmethod
+    def from_dict(cls, input):
+        '''Return a Target built from a Target Description Language (TDL)
+        dictionary such as the output of `to_dict`.
+        '''
+        return cls(name=input.get('name', None),
+                   RA=input.get('RA', None),
+                   Dec=input.get('Dec', None),
+                   equinox=input.get('equinox', None),
+                   frame=input.get('frame', 'icrs'),
+                   rotmode=input.get('rotmode', None),
+                   PA=input.get('PA', None),
+                   RAOffset=input.get('RAOffset', None),
+                   DecOffset=input.get('DecOffset', None),
+                   PMRA=input.get('PMRA', 0),
+                   PMDec=input.get('PMDec', 0),
+                   epoch=input.get('epoch', None),
+                   obstime=input.get('obstime', None),
+                   mag=input.get('mag', {}),
+                   wrap=input.get('wrap', None),
+                   dra=input.get('dra', 0),
+                   ddec=input.get('ddec', 0),
+                   comment=input.get('comment', None))
+
+
+    def content_hash(self):
+        '''Return a hash of the `to_dict` output which is stable between
+        sessions.  Used to detect changed targets when syncing to the DB.
+        '''
+        return content_hash(self.to_dict())
+
+
     def to_yaml(self):
         '''Return yaml string corresponding to a Target Description Language
         (TDL) entry.
@@ -413,9 +467,9 @@ class Target():
         return yaml.dump(self.to_dict())
 
 
-    def write(self, file):
+    def write(self, file, mode='w'):
         tl = TargetList([self])
-        tl.write(file)
+        tl.write(file, mode=mode)
 
 
     def __str__(self):
@@ -455,33 +509,22 @@ class TargetList(UserList):
         return {'Targets': [t.to_dict() for t in self.data]}
 
 
-    def write(self, file):
-        '''Write the target list to a yaml formatted file.
+    def write(self, file, mode='w'):
+        '''Write the target list to a yaml formatted file.  See
+        `odl.fileio.write_yaml` for the write modes ('w', 'a', or 'update').
+        With 'update', only targets which are new or have changed are appended.
         '''
-        p = Path(file).expanduser().absolute()
-        if p.exists(): p.unlink()
-        with open(p, 'w') as FO:
-            FO.write(yaml.dump([self.to_dict()]))
+        write_yaml(file, [self.to_dict()], mode=mode)
 
 
     def parse_yaml(self, contents):
-        list_of_dicts = contents[0]['Targets']
-        targets = [Target(name=d.get('name', None),
-                          RA=d.get('RA', None),
-                          Dec=d.get('Dec', None),
-                          equinox=d.get('equinox', None),
-                          rotmode=d.get('rotmode', None),
-                          PA=d.get('PA', None),
-                          RAOffset=d.get('RAOffset', None),
-                          DecOffset=d.get('DecOffset', None),
-                          frame=d.get('frame', None),
-                          PMRA=d.get('PMRA', 0),
-                          PMDec=d.get('PMDec', 0),
-                          epoch=d.get('epoch', None),
-                          obstime=d.get('obstime', None),
-                          mag = d.get('mag', {}),
-                          comment=d.get('comment', None),)\
-                   for d in list_of_dicts]
+        '''Build a TargetList from the contents of a yaml file.  If the file
+        has appended segments, later entries for a target replace earlier ones.
+        '''
+        targets = []
+        for document in merge(contents):
+            for d in document.get('Targets', []):
+                targets.append(Target.from_dict(d))
         return TargetList(targets)
 
 
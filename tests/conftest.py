@@ -0,0 +1,98 @@
+#!python3
+
+## Import General Tools
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import yaml
+import pytest
+
+from astropy.utils.data import conf
+conf.allow_internet = False
+
+
+##-------------------------------------------------------------------------
+## Stand-in DB
+##-------------------------------------------------------------------------
+class StandInDB():
+    '''A local HTTP server which stands in for the Keck DB.  Each POST body
+    is recorded in posts.  The status returned for a POST is given by the
+    reject function (which gets the body and returns a status code or None for
+    200), and every request is delayed by delay seconds.  A GET returns
+    documents as yaml.
+    '''
+    def __init__(self):
+        self.posts = []
+        self.gets = []
+        self.reject = lambda body: None
+        self.delay = 0
+        self.documents = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        db = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _enter(self):
+                with db._lock:
+                    db.in_flight += 1
+                    db.max_in_flight = max(db.max_in_flight, db.in_flight)
+                time.sleep(db.delay)
+
+            def _exit(self):
+                with db._lock:
+                    db.in_flight -= 1
+
+            def do_POST(self):
+                self._enter()
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                code = db.reject(body)
+                code = 200 if code is None else code
+                if code == 200:
+                    with db._lock:
+                        db.posts.append(body)
+                self.send_response(code)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                self._exit()
+
+            def do_GET(self):
+                self._enter()
+                with db._lock:
+                    db.gets.append(self.path)
+                text = yaml.dump(db.documents).encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(text)))
+                self.end_headers()
+                self.wfile.write(text)
+                self._exit()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def db():
+    server = StandInDB()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(db):
+    from odl.db import DBClient
+    c = DBClient(upload_url=f'{db.url}/upload',
+                 download_url=f'{db.url}/query?', retries=0, timeout=5)
+    yield c
+    c.close()
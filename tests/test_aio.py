@@ -0,0 +1,52 @@
+#!python3
+
+## Import General Tools
+import asyncio
+import time
+
+from odl import aio
+
+
+def wait_idle(db, limit=10):
+    end = time.monotonic() + limit
+    while db.in_flight > 0 and time.monotonic() < end:
+        time.sleep(0.05)
+
+
+def test_download_many(client, db):
+    db.documents = {'OffsetPatterns': []}
+    names = [f'P{i}' for i in range(10)]
+    results = asyncio.run(aio.download('OffsetPatterns', names, client=client,
+                                       concurrency=3))
+    assert len(results) == 10
+    assert len(db.gets) == 10
+    assert db.max_in_flight <= 3
+
+
+def test_timeouts_keep_concurrency_bound(client, db):
+    db.documents = {'OffsetPatterns': []}
+    db.delay = 0.5
+
+    async def bounded():
+        semaphore = asyncio.Semaphore(2)
+        calls = [aio._call(semaphore, 0.05, client.download,
+                           col='OffsetPatterns', name=f'P{i}')
+                 for i in range(6)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(bounded())
+    assert all([isinstance(r, asyncio.TimeoutError) for r in results])
+    wait_idle(db)
+    # Every call ran, but never more than two at once even after timeouts
+    assert len(db.gets) == 6
+    assert db.max_in_flight <= 2
+
+
+def test_upload_tuple(client, db):
+    from astropy import units as u
+    from odl.offset import TelescopeOffset, OffsetPattern
+    ops = tuple([OffsetPattern([TelescopeOffset(dx=i*u.arcsec, dy=0*u.arcsec)],
+                               name=f'P{i}') for i in range(4)])
+    results = asyncio.run(aio.upload(ops, client=client, concurrency=2))
+    assert results == [True]*4
+    assert len(db.posts) == 4
@@ -0,0 +1,111 @@
+#!python3
+
+## Import General Tools
+import pytest
+from astropy import units as u
+from astropy import coordinates as c
+
+import odl.mosfire
+import odl.kcwi
+from odl.block import ScienceBlock, ObservingBlockList
+from odl.offset import TelescopeOffset, OffsetPattern
+from odl.alignment import GuiderAlign
+from odl.overheads import TimeEstimate, get_model, block_instrument
+from odl.target import Target
+
+
+@pytest.fixture(autouse=True)
+def keck(monkeypatch):
+    # Targets look up the observatory location, which needs the network
+    location = c.EarthLocation.from_geodetic(-155.47*u.deg, 19.83*u.deg,
+                                             4145*u.m)
+    monkeypatch.setattr(c.EarthLocation, 'of_site',
+                        classmethod(lambda cls, name, **kw: location))
+
+
+def target(name, V=None):
+    return Target(name=name, RA=150., Dec=20., mag={'V': V})
+
+
+def abba(dy=5):
+    return OffsetPattern([TelescopeOffset(dx=0*u.arcsec, dy=dy*u.arcsec),
+                          TelescopeOffset(dx=0*u.arcsec, dy=-dy*u.arcsec)],
+                         name=f'ABBA {dy}')
+
+
+def mosfire(t, filter='J', exptime=60, align=None):
+    return ScienceBlock(target=t, pattern=abba(),
+                        instconfig=odl.mosfire.MOSFIREConfig(filter=filter),
+                        detconfig=odl.mosfire.MOSFIREDetectorConfig(
+                                                            exptime=exptime),
+                        align=align)
+
+
+def from_scratch(OBs):
+    total = TimeEstimate()
+    previous = None
+    for OB in OBs:
+        total += get_model(block_instrument(OB)).estimate(OB, previous=previous)
+        previous = OB
+    return total
+
+
+def assert_same(a, b):
+    assert set(a.keys()) == set(b.keys())
+    for key in a.keys():
+        assert a[key] == pytest.approx(b[key])
+
+
+def test_incremental_totals():
+    t1, t2 = target('one'), target('two')
+    OBs = ObservingBlockList([mosfire(t1, filter=f) for f in 'YJHK']
+                             + [mosfire(t2, exptime=e) for e in [10, 20, 30]])
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs.append(mosfire(t1, align=GuiderAlign(faint=False)))
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs.insert(2, mosfire(t2, filter='K'))
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs.pop(0)
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs[3] = mosfire(t1, exptime=300)
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs.reverse()
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    OBs.sort(key=lambda OB: OB.detconfig[0].exptime)
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+    del OBs[1:3]
+    assert_same(OBs.estimate_time(), from_scratch(OBs))
+
+
+def test_in_place_changes_invalidate():
+    t1, t2 = target('one', V=12), target('one', V=None)
+    OBs = ObservingBlockList([mosfire(t1), mosfire(t2)])
+    first = OBs.estimate_time()
+    assert first['slew'] == 2*get_model('MOSFIRE').slew
+
+    # The second target becomes equal to the first by a nested change, so it
+    # needs no slew or acquisition
+    t2.mag['V'] = 12
+    changes = [lambda: None,
+               # A detector config attribute
+               lambda: setattr(OBs[1].detconfig[0], 'exptime', 120),
+               # An offset in the pattern
+               lambda: setattr(OBs[1].pattern[1], 'dy', -20*u.arcsec),
+               # An offset added to the pattern
+               lambda: OBs[1].pattern.append(TelescopeOffset(dx=3*u.arcsec,
+                                                             dy=0*u.arcsec)),
+               # The instrument config, which needs a reconfiguration
+               lambda: setattr(OBs[1].instconfig, 'filter', 'H'),
+               # An alignment added, then changed
+               lambda: setattr(OBs[1], 'align', GuiderAlign(faint=False)),
+               lambda: setattr(OBs[1].align, 'faint', True),
+               # The first target, which the second is compared with
+               lambda: setattr(t1, 'RA', 151.)]
+    last = first
+    for change in changes:
+        change()
+        estimate = OBs.estimate_time()
+        assert_same(estimate, from_scratch(OBs))
+        assert estimate != last
+        last = estimate
+    assert estimate['slew'] == 2*get_model('MOSFIRE').slew
@@ -0,0 +1,31 @@
+#!python3
+
+## Import General Tools
+import json
+
+from odl.db import DownloadCache
+
+
+def test_cache_hit_does_not_rewrite_index(tmp_path):
+    cache = DownloadCache(directory=tmp_path, max_entries=2, save_interval=60)
+    cache.put('OffsetPatterns', 'a', ['A'])
+    cache.put('OffsetPatterns', 'b', ['B'])
+    mtime = cache.index_file.stat().st_mtime_ns
+    for i in range(5):
+        entry, objects = cache.get('OffsetPatterns', 'a')
+        assert objects == ['A']
+    assert cache.index_file.stat().st_mtime_ns == mtime
+
+
+def test_cache_lru_across_processes(tmp_path):
+    cache = DownloadCache(directory=tmp_path, max_entries=2, save_interval=60)
+    cache.put('OffsetPatterns', 'a', ['A'])
+    cache.put('OffsetPatterns', 'b', ['B'])
+    cache.get('OffsetPatterns', 'a')
+    cache.flush()
+    # A new cache object reads the saved access times, so b is the least
+    # recently used entry
+    other = DownloadCache(directory=tmp_path, max_entries=2)
+    other.put('OffsetPatterns', 'c', ['C'])
+    assert sorted(json.load(open(other.index_file)).keys())\
+           == ['OffsetPatterns/a', 'OffsetPatterns/c']
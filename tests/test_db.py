@@ -0,0 +1,75 @@
+#!python3
+
+## Import General Tools
+import json
+import yaml
+import pytest
+from astropy import units as u
+
+from odl.offset import TelescopeOffset, OffsetPattern
+from odl.db import UploadFailed
+
+
+def patterns(n):
+    return [OffsetPattern([TelescopeOffset(dx=i*u.arcsec, dy=0*u.arcsec,
+                                           posname='A')],
+                          name=f'P{i:04d}')
+            for i in range(n)]
+
+
+##-------------------------------------------------------------------------
+## chunks
+##-------------------------------------------------------------------------
+def test_chunks_size_bounds(client):
+    ops = patterns(120)
+    chunks = client.chunks(ops, max_bytes=4096)
+    assert len(chunks) > 1
+    assert all([len(c) <= 4096 for c in chunks])
+    names = [d['name'] for c in chunks for d in yaml.safe_load(c)]
+    assert names == [op.name for op in ops]
+
+
+def test_chunks_oversized_entry(client):
+    # A single entry larger than the limit gets a chunk of its own
+    chunks = client.chunks(patterns(3), max_bytes=10)
+    assert len(chunks) == 3
+
+
+##-------------------------------------------------------------------------
+## bulk_upload
+##-------------------------------------------------------------------------
+def test_bulk_upload_status(client, db):
+    db.reject = lambda body: 500 if b'P0050' in body else None
+    with pytest.warns(UploadFailed):
+        results = client.bulk_upload(patterns(120), max_bytes=4096, workers=3)
+    failed = [r for r in results if r['status'] == 'failed']
+    assert len(failed) == 1
+    assert failed[0]['code'] == 500
+    assert all([r['status'] == 'uploaded' for r in results if r not in failed])
+    assert all([r['code'] == 200 for r in results if r not in failed])
+    assert len(db.posts) == len(results) - 1
+
+
+def test_bulk_upload_resume(client, db, tmp_path):
+    state_file = tmp_path / 'state.json'
+    ops = patterns(120)
+    db.reject = lambda body: 503 if b'P0080' in body else None
+    with pytest.warns(UploadFailed):
+        first = client.bulk_upload(ops, max_bytes=4096, workers=2,
+                                   state_file=state_file)
+    failed = [r['chunk'] for r in first if r['status'] == 'failed']
+    assert len(failed) == 1
+    acknowledged = json.load(open(state_file))['acknowledged']
+    assert len(acknowledged) == len(first) - 1
+
+    # Only the failed chunk is sent again
+    db.reject = lambda body: None
+    db.posts = []
+    second = client.bulk_upload(ops, max_bytes=4096, workers=2,
+                                state_file=state_file)
+    assert [r['chunk'] for r in second if r['status'] == 'uploaded'] == failed
+    assert all([r['status'] == 'skipped' for r in second
+                if r['chunk'] not in failed])
+    assert len(db.posts) == 1 and b'P0080' in db.posts[0]
+    third = client.bulk_upload(ops, max_bytes=4096, state_file=state_file)
+    assert all([r['status'] == 'skipped' for r in third])
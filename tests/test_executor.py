@@ -0,0 +1,77 @@
+#!python3
+
+## Import General Tools
+import pytest
+from astropy import units as u
+
+from odl.offset import TelescopeOffset, OffsetPattern
+from odl.executor import SimulatedBackend, PatternExecutor, ExecutorError
+
+
+def abba(pmfm=None, repeat=1):
+    return OffsetPattern([TelescopeOffset(dx=0, dy=5*u.arcsec, posname='A'),
+                          TelescopeOffset(dx=0, dy=-5*u.arcsec, posname='B',
+                                          pmfm=pmfm),
+                          TelescopeOffset(dx=0, dy=-5*u.arcsec, posname='B'),
+                          TelescopeOffset(dx=0, dy=5*u.arcsec, posname='A',
+                                          pmfm=pmfm),
+                          TelescopeOffset(dx=2*u.arcsec, dy=0, relative=True,
+                                          posname='dither')],
+                         name='ABBA', repeat=repeat)
+
+
+@pytest.mark.parametrize('pmfm', [None, 50])
+@pytest.mark.parametrize('nexp', [1, 3])
+@pytest.mark.parametrize('readout', [0.5, 10, 40])
+def test_pipelining_reduces_dead_time(pmfm, nexp, readout):
+    summaries = {}
+    for pipelined in [False, True]:
+        backend = SimulatedBackend(move_overhead=5, move_rate=0.1, pmfm_time=2,
+                                   readout_time=readout)
+        executor = PatternExecutor(abba(pmfm=pmfm, repeat=2), backend,
+                                   exptime=30, nexp=nexp, pipelined=pipelined)
+        # The backend raises ExecutorError on any ordering violation
+        steps = executor.run()
+        assert len(steps) == 10*nexp
+        assert [s['posname'] for s in steps[::nexp]] == ['A', 'B', 'B', 'A',
+                                                         'dither']*2
+        for step in steps:
+            assert step['exposure start'] >= step['move done']
+            exposure = step['shutter closed'] - step['exposure start']
+            assert exposure == pytest.approx(30)
+        for previous, step in zip(steps[:-1], steps[1:]):
+            assert step['exposure start'] >= previous['readout done']
+            if step['move issued'] is not None:
+                assert step['move issued'] >= previous['shutter closed']
+        summaries[pipelined] = executor.summary()
+    serial, pipelined = summaries[False], summaries[True]
+    assert pipelined['dead time'] < serial['dead time']
+    assert pipelined['wall clock time'] < serial['wall clock time']
+    assert pipelined['shutter open time'] == serial['shutter open time']
+    assert serial['wall clock time'] - pipelined['wall clock time']\
+           == pytest.approx(serial['dead time'] - pipelined['dead time'])
+
+
+def test_pipelined_dead_time_is_longer_of_move_and_readout():
+    # Nine moves of 5 s each (zero distance rate), overlapped with readout
+    for readout, per_move in [(2, 5), (10, 10)]:
+        backend = SimulatedBackend(move_overhead=5, move_rate=0,
+                                   pmfm_time=0, readout_time=readout)
+        executor = PatternExecutor(abba(), backend, exptime=1, nexp=1,
+                                   pipelined=True)
+        executor.run()
+        assert executor.summary()['dead time'] == 5 + 4*per_move
+
+
+def test_guards():
+    backend = SimulatedBackend(readout_time=10)
+    backend.start_exposure(30)
+    with pytest.raises(ExecutorError):
+        backend.move(TelescopeOffset(dx=1*u.arcsec, dy=0*u.arcsec))
+    backend.wait_shutter_closed()
+    with pytest.raises(ExecutorError):
+        backend.start_exposure(30)
+    backend.wait_readout()
+    backend.move(TelescopeOffset(dx=1*u.arcsec, dy=0*u.arcsec))
+    with pytest.raises(ExecutorError):
+        backend.start_exposure(30)
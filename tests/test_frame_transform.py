@@ -0,0 +1,53 @@
+#!python3
+
+## Import General Tools
+import numpy as np
+import pytest
+from astropy import units as u
+
+import odl.mosfire
+import odl.nires
+import odl.kcwi
+from odl.offset import InstrumentFrame, frames, get_frame
+from odl import frame_transform as ft
+
+
+rng = np.random.default_rng(42)
+dx = rng.uniform(-60, 60, 50)
+dy = rng.uniform(-60, 60, 50)
+
+tilted = InstrumentFrame(name='Test Tilted Frame', scale=0.25*u.arcsec/u.pixel,
+                         offsetangle=33*u.deg)
+
+
+@pytest.mark.parametrize('name', sorted(frames.keys()))
+@pytest.mark.parametrize('PA', [0, 47.5, -120*u.deg])
+def test_round_trip_registered_frames(name, PA):
+    frame = get_frame(name)
+    east, north = ft.to_sky(dx, dy, frame, PA=PA)
+    x, y = ft.from_sky(east, north, frame, PA=PA)
+    assert np.allclose(x, dx, atol=1e-10)
+    assert np.allclose(y, dy, atol=1e-10)
+    # Rotations preserve the length of the offset
+    assert np.allclose(np.hypot(east, north), np.hypot(dx, dy))
+
+
+@pytest.mark.parametrize('PA', [0, 12, 90, 237])
+def test_round_trip_pixels(PA):
+    east, north = ft.to_sky(dx, dy, tilted, PA=PA, pixels=True)
+    x, y = ft.from_sky(east, north, tilted, PA=PA, pixels=True)
+    assert np.allclose(x, dx, atol=1e-10)
+    assert np.allclose(y, dy, atol=1e-10)
+    assert np.allclose(np.hypot(east, north), 0.25*np.hypot(dx, dy))
+
+
+def test_angle_and_scale():
+    # offsetangle 33 plus PA 57 puts the frame X axis on North
+    east, north = ft.to_sky(1, 0, tilted, PA=57)
+    assert np.allclose([east[0], north[0]], [0, 1], atol=1e-12)
+    east, north = ft.to_sky(0, 4, tilted, PA=57, pixels=True)
+    assert np.allclose([east[0], north[0]], [-1, 0], atol=1e-12)
+    # Between two instrument frames only the difference in angle matters
+    x, y = ft.transform(1, 0, tilted, get_frame('MOSFIRE Detector'), PA=80)
+    assert np.allclose([x[0], y[0]], [np.cos(np.radians(33)),
+                                      np.sin(np.radians(33))])
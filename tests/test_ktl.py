@@ -0,0 +1,49 @@
+#!python3
+
+## Import General Tools
+import pytest
+from astropy import units as u
+
+import odl
+import odl.mosfire
+import odl.simktl
+from odl import offset
+from odl.offset import TelescopeOffset, OffsetPattern, get_frame
+
+
+@pytest.fixture
+def simktl():
+    previous = offset.ktl
+    offset.use_ktl(odl.simktl)
+    odl.simktl.reset()
+    yield odl.simktl
+    offset.use_ktl(previous)
+    odl.simktl.reset()
+
+
+def test_keyword_setup_once_per_process(simktl, capsys):
+    frames = [get_frame('SkyFrame'), get_frame('MOSFIRE Detector'),
+              get_frame('MOSFIRE Slit')]
+    offsets = [TelescopeOffset(dx=i*u.arcsec, dy=-i*u.arcsec,
+                               frame=frames[i % len(frames)])
+               for i in range(300)]
+    for o in offsets:
+        o.execute()
+    patterns = [OffsetPattern(offsets[i:300:len(frames)][:10], name=f'P{i}')
+                for i in range(len(frames))]
+    contents = [{'OffsetPatterns': [p.to_dict() for p in patterns]}]
+    for i in range(20):
+        tl, ops, dcs, ics = odl.parse_yaml(contents)
+        for op in ops:
+            for o in op:
+                o.execute()
+    capsys.readouterr()
+    # RAOFF, DECOFF, INSTXOFF, and INSTYOFF, each set up only once
+    assert simktl.cache_calls == 4
+    assert set(offset.keywords.keys()) == {('DCS', 'RAOFF'), ('DCS', 'DECOFF'),
+                                           ('DCS', 'INSTXOFF'),
+                                           ('DCS', 'INSTYOFF')}
+    # The parsed offsets share the frames, and so the keyword handles
+    assert ops[1][0].frame is frames[1]
+    assert ops[1][0].frame.xkw is simktl.cache(keyword='INSTXOFF',
+                                               service='DCS')
@@ -0,0 +1,55 @@
+#!python3
+
+## Import General Tools
+import itertools
+import numpy as np
+import pytest
+
+from odl.detector_config import DetectorConfigWarning
+from odl.kcwi.detector import (KCWIblueDetectorConfig, KCWIredDetectorConfig,
+                               KCWIFPCDetectorConfig, ampmodes)
+
+
+def blue_configs():
+    windows = [None, '0:4095,0:2047', '100:200,1000:1511']
+    configs = []
+    for i, (mode, amp, binning, window) in enumerate(itertools.product(
+                    [0, 1], sorted(ampmodes.keys()), ['1x1', '2x2'], windows)):
+        configs.append(KCWIblueDetectorConfig(exptime=10*(i % 7) + 1,
+                                              nexp=1 + i % 3, readoutmode=mode,
+                                              ampmode=amp, binning=binning,
+                                              window=window))
+    return configs
+
+
+def test_estimate_clock_times_matches_scalar():
+    configs = blue_configs()
+    times = KCWIblueDetectorConfig.estimate_clock_times(configs)
+    assert isinstance(times, np.ndarray)
+    assert times.shape == (len(configs),)
+    expected = [dc.estimate_clock_time() for dc in configs]
+    assert np.allclose(times, expected)
+
+
+def test_measured_blue_times():
+    dc = KCWIblueDetectorConfig(exptime=100, nexp=2, readoutmode=0, ampmode=9,
+                                binning='2x2')
+    assert dc.readout_time() == 53
+    assert dc.estimate_clock_time() == 2*(100 + 53)
+    dc.window = '0:4095,0:1023'
+    assert dc.readout_time() == pytest.approx(53/4)
+
+
+def test_estimate_clock_times_empty():
+    assert len(KCWIblueDetectorConfig.estimate_clock_times([])) == 0
+
+
+@pytest.mark.parametrize('cls', [KCWIredDetectorConfig, KCWIFPCDetectorConfig])
+def test_unmeasured_detectors_warn(cls):
+    assert cls.readout_table is None
+    dc = cls(exptime=30, nexp=2)
+    with pytest.warns(DetectorConfigWarning):
+        assert dc.readout_time() == 0
+    with pytest.warns(DetectorConfigWarning):
+        times = cls.estimate_clock_times([dc, cls(exptime=5)])
+    assert np.allclose(times, [60, 5])
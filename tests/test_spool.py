@@ -0,0 +1,53 @@
+#!python3
+
+## Import General Tools
+import pytest
+
+from odl.db import UploadSpool, UploadFailed, get_client, set_client
+
+
+def test_spool_order_after_dedup(tmp_path, client, db):
+    spool = UploadSpool(directory=tmp_path)
+    spool.add('- name: A\n')
+    spool.add('- name: B\n')
+    # A reverted edit: A is the latest payload and must be sent last
+    spool.add('- name: A\n')
+    assert len(spool.pending()) == 2
+    assert spool.flush(client) == 2
+    assert [b'name: B' in p for p in db.posts] == [True, False]
+    assert b'name: A' in db.posts[-1]
+    assert spool.pending() == []
+
+
+def test_spool_rejected_payload(tmp_path, client, db):
+    spool = UploadSpool(directory=tmp_path)
+    spool.add('- name: bad\n')
+    spool.add('- name: good\n')
+    db.reject = lambda body: 400 if b'bad' in body else None
+    with pytest.warns(UploadFailed):
+        assert spool.flush(client) == 1
+    assert spool.pending() == []
+    assert len(list(spool.rejected_directory.glob('*.yaml'))) == 1
+    assert spool.status()['rejected'] == 1
+
+
+def test_spool_server_error_keeps_order(tmp_path, client, db):
+    spool = UploadSpool(directory=tmp_path)
+    spool.add('- name: first\n')
+    spool.add('- name: second\n')
+    db.reject = lambda body: 503 if b'first' in body else None
+    assert spool.flush(client) == 0
+    assert len(spool.pending()) == 2
+    db.reject = lambda body: None
+    assert spool.flush(client) == 2
+    assert b'first' in db.posts[0] and b'second' in db.posts[1]
+
+
+def test_default_client_has_no_spool():
+    set_client(None)
+    try:
+        client = get_client()
+        assert client.spool is None
+        assert client.cache is None
+    finally:
+        set_client(None)